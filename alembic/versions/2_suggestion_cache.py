@@ -0,0 +1,41 @@
+import logging
+
+from alembic import op
+from sqlalchemy import Column, String, JSON, DateTime, func
+from sqlalchemy.engine import Connection
+
+from service.db.factories import create_db_engine
+from service.db.schema import Base
+
+logger = logging.getLogger(__name__)
+
+revision = '5c2a7d'
+down_revision = 'ec1ee9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    If missing, creates the shared tier table of the suggestion cache.
+    """
+
+    engine = create_db_engine()
+
+    with Connection(engine) as conn, conn.begin():
+        if not conn.dialect.has_table(conn, 'suggestion_cache'):
+            logger.info("Creating table suggestion_cache")
+            op.create_table(
+                'suggestion_cache',
+                Column('key', String, primary_key=True),
+                Column('models_version', String, nullable=False),
+                Column('results', JSON, nullable=False, default=[]),
+                Column('created_at', DateTime, server_default=func.now(), nullable=False),
+                schema=Base.metadata.schema
+            )
+        else:
+            logger.info("Table suggestion_cache exists, skipping creation...")
+
+
+def downgrade():
+    op.drop_table('suggestion_cache')
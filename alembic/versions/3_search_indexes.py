@@ -0,0 +1,34 @@
+import logging
+
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+revision = '9b41f3'
+down_revision = '5c2a7d'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_nlp_table_client_requested_at': ['client', 'requested_at'],
+    'ix_nlp_table_status_requested_at': ['status', 'requested_at'],
+    'ix_nlp_table_requested_at': ['requested_at'],
+}
+
+
+def upgrade():
+    """
+    If missing, creates the indexes of the search endpoint filters. They are built concurrently,
+    outside the migration transaction, so writes to nlp_table are not blocked meanwhile.
+    """
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            logger.info(f"Creating index {name}")
+            op.create_index(name, 'nlp_table', columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='nlp_table', if_exists=True, postgresql_concurrently=True)
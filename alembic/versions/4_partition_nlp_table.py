@@ -0,0 +1,43 @@
+import logging
+
+from alembic import op
+
+from service.db.config import psql_config
+from service.db.partitions import is_partitioned, partition_table, unpartition_table
+
+logger = logging.getLogger(__name__)
+
+revision = 'd7e2a0'
+down_revision = '9b41f3'
+branch_labels = None
+depends_on = None
+
+# the indexes of nlp_table at this revision, rebuilt on the swapped table
+INDEXES = [
+    "CREATE INDEX ix_nlp_table_client_requested_at ON nlp_table (client, requested_at)",
+    "CREATE INDEX ix_nlp_table_status_requested_at ON nlp_table (status, requested_at)",
+    "CREATE INDEX ix_nlp_table_requested_at ON nlp_table (requested_at)",
+]
+
+
+def upgrade():
+    """
+    If enabled with PSQL_PARTITION_NLP_TABLE, turns nlp_table into a table partitioned by requested_at month.
+    The rows are copied within the migration transaction.
+    """
+
+    config = psql_config()
+    conn = op.get_bind()
+    if not config.partition_nlp_table:
+        logger.info("Partitioning of nlp_table is not enabled, skipping...")
+    elif is_partitioned(conn):
+        logger.info("Table nlp_table is partitioned, skipping...")
+    else:
+        logger.info("Partitioning table nlp_table")
+        partition_table(conn, INDEXES, months_ahead=config.partitions_ahead)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if is_partitioned(conn):
+        unpartition_table(conn, INDEXES)
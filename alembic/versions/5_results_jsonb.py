@@ -0,0 +1,30 @@
+import logging
+
+from alembic import op
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+logger = logging.getLogger(__name__)
+
+revision = 'f3a8c1'
+down_revision = 'd7e2a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Stores the results of nlp_table as JSONB, with a GIN index for the containment queries of the suggestion filter.
+    """
+
+    logger.info("Converting nlp_table.results to JSONB")
+    op.alter_column('nlp_table', 'results', type_=JSONB, postgresql_using='results::jsonb')
+    op.create_index(
+        'ix_nlp_table_results', 'nlp_table', ['results'], if_not_exists=True,
+        postgresql_using='gin', postgresql_ops={'results': 'jsonb_path_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_nlp_table_results', table_name='nlp_table', if_exists=True)
+    op.alter_column('nlp_table', 'results', type_=JSON, postgresql_using='results::json')
@@ -0,0 +1,120 @@
+"""
+End-to-end latency and throughput of `POST /request` through `client.Client`.
+
+By default the API is served in-process on a local port, with the benchmark models (pretrained when cached, tiny
+random ones otherwise) and the Postgres database of `PSQL_CONN_URL`. With --base-url it targets a running service
+instead, e.g. the one of docker-compose.
+
+    python -m benchmarks.api --requests 500 --concurrency 8
+    python -m benchmarks.api --base-url http://0.0.0.0:8000 --jwt-secret test
+"""
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+
+import click
+import uvicorn
+
+from benchmarks.common import sentences, summarize, write_results
+from benchmarks.models import load_ml_pipeline
+from client.data_model import NLPRequest
+from client.factories import create_client
+from service.app.auth import APIConfig
+from service.app.factories import create_api
+from service.controller.async_controller import AsyncBaseController
+from service.db.factories import create_async_db_engine, create_db_engine, create_db_tables
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(ml_pipeline):
+    """
+    Serves the API with the given ML pipeline in a background thread.
+    :return: The base url of the API.
+    """
+    create_db_tables(create_db_engine())
+
+    @asynccontextmanager
+    async def lifespan(api):
+        api.state.controller = AsyncBaseController(db_engine=create_async_db_engine(), ml_pipeline=ml_pipeline)
+        yield
+        await api.state.controller.db_engine.dispose()
+
+    api = create_api()
+    api.router.lifespan_context = lifespan
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(api, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("The API failed to start")
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def run(base_url: str, jwt_secret: str, requests: int, concurrency: int, warmup: int = 5) -> dict:
+    local = threading.local()
+
+    def post(sentence: str):
+        # a client per thread, as the client keeps a requests session
+        if not hasattr(local, 'client'):
+            local.client = create_client(base_url=base_url, jwt_secret=jwt_secret)
+        started = time.perf_counter()
+        response = local.client.create_request(NLPRequest(sentence=sentence, client='benchmark'))
+        return time.perf_counter() - started, response.status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(post, sentences(warmup)))
+
+        started = time.perf_counter()
+        outcomes = list(executor.map(post, sentences(requests)))
+        elapsed = time.perf_counter() - started
+
+    summary = summarize([timing for timing, _ in outcomes])
+    # with concurrent clients the throughput is the requests over the wall time, not over the summed latencies
+    summary["throughput_per_s"] = requests / elapsed
+    return {"post_request": summary, "statuses": dict(Counter(status for _, status in outcomes))}
+
+
+@click.command()
+@click.option('--requests', default=200, help='Timed requests.')
+@click.option('--concurrency', default=4, help='Concurrent clients.')
+@click.option('--warmup', default=5, help='Untimed requests before the timed ones.')
+@click.option('--base-url', default=None, help='URL of a running service, the API is served in-process if not set.')
+@click.option('--jwt-secret', default=APIConfig.jwt_secret)
+@click.option('--tiny', is_flag=True, help='Serve tiny random models even when the pretrained ones are cached.')
+@click.option('--output', default=None, help='Results JSON file.')
+def main(requests, concurrency, warmup, base_url, jwt_secret, tiny, output):
+    parameters = {"requests": requests, "concurrency": concurrency, "warmup": warmup, "base_url": base_url}
+    if base_url:
+        results = run(base_url, jwt_secret, requests, concurrency, warmup)
+    else:
+        ml_pipeline, parameters["models"] = load_ml_pipeline(tiny=tiny)
+        with serve(ml_pipeline) as url:
+            results = run(url, jwt_secret, requests, concurrency, warmup)
+
+    path = write_results('api', parameters, results, output)
+
+    summary = results["post_request"]
+    click.echo(
+        f"POST /request: p50 {summary['p50_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, "
+        f"{summary['throughput_per_s']:.1f} requests/s, statuses {results['statuses']}"
+    )
+    click.echo(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import torch
+import transformers
+
+RESULTS_DIR = 'benchmarks/results'
+
+SENTENCES = [
+    "have a <blank> day",
+    "the application was <blank>",
+    "it is so <blank>!",
+    "what a <blank> idea",
+    "the food was <blank> and cheap",
+    "you look <blank> today",
+    "this is the <blank> movie ever",
+    "my team is <blank>",
+]
+
+
+def sentences(count: int) -> List[str]:
+    """
+    :return: `count` benchmark sentences, cycling through SENTENCES.
+    """
+    return [SENTENCES[i % len(SENTENCES)] for i in range(count)]
+
+
+def summarize(timings: List[float], items: int = 1) -> Dict[str, float]:
+    """
+    :param timings: The duration of each call, in seconds.
+    :param items: The number of items processed by each call.
+    :return: The latency percentiles of the calls in milliseconds and the items processed per second.
+    """
+    ordered = sorted(timings)
+    milliseconds = [1000 * timing for timing in ordered]
+
+    def percentile(q: float) -> float:
+        return milliseconds[min(len(milliseconds) - 1, int(q * len(milliseconds)))]
+
+    return {
+        "calls": len(timings),
+        "mean_ms": statistics.fmean(milliseconds),
+        "p50_ms": statistics.median(milliseconds),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": milliseconds[-1],
+        "throughput_per_s": items * len(timings) / sum(timings) if sum(timings) else 0.0,
+    }
+
+
+def time_calls(call: Callable[[], Any], repeats: int, warmup: int = 1) -> List[float]:
+    """
+    :return: The duration in seconds of `repeats` calls, after `warmup` untimed calls.
+    """
+    for _ in range(warmup):
+        call()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(  # nosec
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment() -> Dict[str, Any]:
+    """
+    :return: What a benchmark result depends on besides the code, so runs are only compared on equal terms.
+    """
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "transformers": transformers.__version__,
+    }
+
+
+def write_results(name: str, parameters: Dict[str, Any], results: Any, output: str = None) -> str:
+    """
+    Writes the results of a benchmark run with its parameters and environment to a JSON file.
+    :param name: The name of the benchmark.
+    :param parameters: The options of the run.
+    :param results: The measurements.
+    :param output: The JSON file, `benchmarks/results/<name>-<timestamp>.json` by default.
+    :return: The path of the JSON file.
+    """
+    started = datetime.now(tz=timezone.utc)
+    output = output or os.path.join(RESULTS_DIR, f"{name}-{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as fh:
+        json.dump({
+            "benchmark": name,
+            "created": started.isoformat(),
+            "environment": environment(),
+            "parameters": parameters,
+            "results": results,
+        }, fh, indent=2)
+    return output
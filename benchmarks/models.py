@@ -0,0 +1,122 @@
+"""
+The models of the benchmarks: the pretrained ones when they are in the local Hugging Face cache, otherwise tiny
+randomly initialized BERT models with the same architectures, so the benchmarks run offline. Timings of tiny models
+only compare code paths with each other, not with the pretrained models.
+"""
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Tuple
+
+import torch
+from transformers import (
+    AutoModelForSequenceClassification, AutoTokenizer, BertConfig, BertForMaskedLM, BertTokenizerFast,
+    DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast, pipeline
+)
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import (
+    SentimentAnalysisContextPredictor, SentimentAnalysisTokenIdsPredictor, SentimentAnalysisTorchPredictor
+)
+
+logger = logging.getLogger(__name__)
+
+FILL_IN_MODEL = "bert-large-uncased"
+SENT_ANAL_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+TINY_VOCABULARY = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "have", "a", "day", "the", "application", "was", "it", "is", "so", "what", "idea", "food", "and", "cheap",
+    "you", "look", "today", "this", "movie", "ever", "my", "team",
+    "good", "great", "nice", "amazing", "excellent", "best", "happy", "lovely", "well", "designed", "pretty",
+    "bad", "awful", "terrible", "sick", "sad", "boring", "ugly",
+    "##ing", "##ly", "##s", ",", ".", "!", "?",
+]
+# the shapes of google/bert_uncased_L-2_H-128_A-2
+TINY_SHAPES = {"hidden_size": 128, "num_layers": 2, "num_heads": 2, "intermediate_size": 512}
+
+
+def _tiny_vocab_file() -> str:
+    vocab_file = os.path.join(tempfile.mkdtemp(), "vocab.txt")
+    with open(vocab_file, "w") as fh:
+        fh.write("\n".join(TINY_VOCABULARY))
+    return vocab_file
+
+
+def tiny_fill_in_predictor(top_k: int = 3, seed: int = 0) -> FillInTorchPredictor:
+    torch.manual_seed(seed)
+    model = BertForMaskedLM(BertConfig(
+        vocab_size=len(TINY_VOCABULARY), hidden_size=TINY_SHAPES["hidden_size"],
+        num_hidden_layers=TINY_SHAPES["num_layers"], num_attention_heads=TINY_SHAPES["num_heads"],
+        intermediate_size=TINY_SHAPES["intermediate_size"],
+    )).eval()
+    return FillInTorchPredictor(model=model, tokenizer=BertTokenizerFast(_tiny_vocab_file()), top_k=top_k)
+
+
+def _sent_anal_predictor(model, tokenizer, mode: str):
+    if mode == 'token_ids':
+        return SentimentAnalysisTokenIdsPredictor(model=model, tokenizer=tokenizer)
+    if mode == 'context':
+        return SentimentAnalysisContextPredictor(model=model, tokenizer=tokenizer)
+    return SentimentAnalysisTorchPredictor(pipeline=pipeline("sentiment-analysis", model=model, tokenizer=tokenizer))
+
+
+def tiny_sent_anal_predictor(seed: int = 0, mode: str = 'pipeline'):
+    torch.manual_seed(seed)
+    model = DistilBertForSequenceClassification(DistilBertConfig(
+        vocab_size=len(TINY_VOCABULARY), dim=TINY_SHAPES["hidden_size"], n_layers=TINY_SHAPES["num_layers"],
+        n_heads=TINY_SHAPES["num_heads"], hidden_dim=TINY_SHAPES["intermediate_size"],
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1},
+    )).eval()
+    return _sent_anal_predictor(model, DistilBertTokenizerFast(_tiny_vocab_file()), mode)
+
+
+def cached_fill_in_predictor(name: str = FILL_IN_MODEL, top_k: int = 3) -> FillInTorchPredictor:
+    """
+    :raise OSError: When the model is not in the local Hugging Face cache.
+    """
+    model = BertForMaskedLM.from_pretrained(name, local_files_only=True).eval()
+    return FillInTorchPredictor(
+        model=model, tokenizer=BertTokenizerFast.from_pretrained(name, local_files_only=True), top_k=top_k
+    )
+
+
+def cached_sent_anal_predictor(name: str = SENT_ANAL_MODEL, mode: str = 'pipeline'):
+    """
+    :raise OSError: When the model is not in the local Hugging Face cache.
+    """
+    model = AutoModelForSequenceClassification.from_pretrained(name, local_files_only=True).eval()
+    tokenizer = AutoTokenizer.from_pretrained(name, local_files_only=True, use_fast=True)
+    return _sent_anal_predictor(model, tokenizer, mode)
+
+
+def load_predictors(tiny: bool = False, top_k: int = 3, sentiment_mode: str = 'pipeline') -> Tuple[
+        FillInTorchPredictor, Any, Dict[str, Any]]:
+    """
+    :param tiny: Whether to use the tiny random models even when the pretrained ones are cached.
+    :param top_k: The number of suggestions of the fill-in predictor.
+    :param sentiment_mode: 'pipeline', 'token_ids' or 'context', as ML_SENTIMENT_MODE.
+    :return: The fill-in and sentiment predictors, and a description of their models for the results.
+    """
+    if not tiny:
+        try:
+            fill_in = cached_fill_in_predictor(top_k=top_k)
+            sent_anal = cached_sent_anal_predictor(mode=sentiment_mode)
+            models = {"fill_in": FILL_IN_MODEL, "sent_anal": SENT_ANAL_MODEL, "tiny": False}
+            return fill_in, sent_anal, {**models, "sentiment_mode": sentiment_mode}
+        except OSError as e:
+            logger.warning(f"Pretrained models not cached, falling back to tiny random models: {e}")
+
+    models = {"fill_in": "tiny-bert", "sent_anal": "tiny-distilbert", "tiny": True, **TINY_SHAPES}
+    return (
+        tiny_fill_in_predictor(top_k=top_k), tiny_sent_anal_predictor(mode=sentiment_mode),
+        {**models, "sentiment_mode": sentiment_mode}
+    )
+
+
+def load_ml_pipeline(tiny: bool = False, top_k: int = 3,
+                     sentiment_mode: str = 'pipeline') -> Tuple[MLPipeline, Dict[str, Any]]:
+    fill_in, sent_anal, models = load_predictors(tiny=tiny, top_k=top_k, sentiment_mode=sentiment_mode)
+    return MLPipeline(fill_in=fill_in, sent_anal=sent_anal, preprocess=Preprocessor()), models
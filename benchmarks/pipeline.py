@@ -0,0 +1,80 @@
+"""
+ML pipeline latency and throughput by batch size.
+
+Times `MLPipeline.pipeline` on single sentences, then `MLPipeline.pipeline_batch` and the fill-in and sentiment
+predictors on their own, at each batch size, and writes the results to a JSON file. Uses the pretrained models when
+they are in the local Hugging Face cache and tiny random ones otherwise (or with --tiny).
+
+    python -m benchmarks.pipeline --batch-sizes 1,8,32,128 --repeats 20
+"""
+import click
+import torch
+
+from benchmarks.common import sentences, summarize, time_calls, write_results
+from benchmarks.models import load_ml_pipeline
+
+
+def run(ml_pipeline, batch_sizes, repeats: int, warmup: int = 1) -> dict:
+    preprocessed = [ml_pipeline.prep.transform(sentence) for sentence in sentences(max(batch_sizes))]
+    suggestions = ml_pipeline.fill_in.predict_batch(preprocessed)
+
+    results = {
+        "pipeline": summarize(time_calls(lambda: ml_pipeline.pipeline(sentences(1)[0]), repeats, warmup)),
+        "batches": {},
+    }
+    for batch_size in batch_sizes:
+        batch = sentences(batch_size)
+        results["batches"][str(batch_size)] = {
+            "pipeline_batch": summarize(
+                time_calls(lambda: ml_pipeline.pipeline_batch(batch), repeats, warmup), batch_size
+            ),
+            "fill_in": summarize(
+                time_calls(lambda: ml_pipeline.fill_in.predict_batch(preprocessed[:batch_size]), repeats, warmup),
+                batch_size
+            ),
+            "sentiment": summarize(
+                time_calls(
+                    lambda: ml_pipeline.sent_anal.predict_batch(suggestions[:batch_size], preprocessed[:batch_size]),
+                    repeats, warmup
+                ),
+                batch_size
+            ),
+        }
+    return results
+
+
+@click.command()
+@click.option('--batch-sizes', default='1,8,32,128', help='Comma separated batch sizes.')
+@click.option('--repeats', default=20, help='Timed calls per measurement.')
+@click.option('--warmup', default=2, help='Untimed calls before each measurement.')
+@click.option('--top-k', default=3, help='Suggestions of the fill-in predictor.')
+@click.option('--threads', default=None, type=int, help='Torch intra-op threads, the torch default if not set.')
+@click.option('--sentiment-mode', default='pipeline', type=click.Choice(['pipeline', 'token_ids', 'context']))
+@click.option('--tiny', is_flag=True, help='Use tiny random models even when the pretrained ones are cached.')
+@click.option('--output', default=None, help='Results JSON file.')
+def main(batch_sizes, repeats, warmup, top_k, threads, sentiment_mode, tiny, output):
+    if threads:
+        torch.set_num_threads(threads)
+    batch_sizes = [int(batch_size) for batch_size in batch_sizes.split(',')]
+    ml_pipeline, models = load_ml_pipeline(tiny=tiny, top_k=top_k, sentiment_mode=sentiment_mode)
+
+    with torch.inference_mode():
+        results = run(ml_pipeline, batch_sizes, repeats, warmup)
+
+    parameters = {"batch_sizes": batch_sizes, "repeats": repeats, "warmup": warmup, "top_k": top_k, "models": models}
+    path = write_results('pipeline', parameters, results, output)
+
+    single = results["pipeline"]
+    click.echo(f"pipeline (single sentence): p50 {single['p50_ms']:.2f} ms, p95 {single['p95_ms']:.2f} ms")
+    click.echo(f"{'batch':>6}{'stage':>16}{'p50 (ms)':>12}{'p95 (ms)':>12}{'items/s':>12}")
+    for batch_size, stages in results["batches"].items():
+        for stage, summary in stages.items():
+            click.echo(
+                f"{batch_size:>6}{stage:>16}{summary['p50_ms']:>12.2f}{summary['p95_ms']:>12.2f}"
+                f"{summary['throughput_per_s']:>12.1f}"
+            )
+    click.echo(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Search endpoint latency with and without the nlp_table indexes.
+
+Seeds a scratch schema with a large nlp_table, then times the queries of `Controller.search` (the page and its
+COUNT) for typical filters, first without indexes and then with the indexes of the schema.
+
+    python -m benchmarks.search --rows 1000000
+"""
+import statistics
+import time
+from datetime import date
+
+import click
+from sqlalchemy import create_engine, func, select, text
+
+from service.controller.controller import Controller
+from service.data_model.request import SearchQuery
+from service.data_model.status import Status
+from service.db.config import psql_config
+from service.db.schema import NLPModelDBModel
+
+SCHEMA = 'search_benchmark'
+
+SEARCHES = {
+    'client': SearchQuery(client='client-7'),
+    'status': SearchQuery(status=Status.FAILED),
+    'client+status': SearchQuery(client='client-7', status=Status.FAILED),
+    'client+dates': SearchQuery(client='client-7', date_from=date(2024, 3, 1), date_to=date(2024, 3, 7)),
+    'dates': SearchQuery(date_from=date(2024, 3, 1), date_to=date(2024, 3, 2)),
+}
+
+
+def seed(conn, rows: int, clients: int):
+    table = NLPModelDBModel.__table__
+    table.drop(conn, checkfirst=True)
+    table.create(conn)
+    for index in table.indexes:
+        index.drop(conn)
+
+    # one request every 10 seconds from 2024-01-01, 1 in 20 failed
+    conn.execute(text(f"""
+        INSERT INTO nlp_table (id, sentence, requested_at, updated, status, client, results)
+        SELECT md5(i::text), 'have a <blank> day', ts, ts,
+               CASE WHEN i % 20 = 0 THEN 'FAILED' ELSE 'COMPLETED' END,
+               'client-' || (i % {clients}), '["good"]'
+        FROM generate_series(1, {rows}) AS i,
+             LATERAL (SELECT timestamp '2024-01-01' + i * interval '10 seconds' AS ts) AS t
+    """))
+    conn.execute(text("ANALYZE nlp_table"))
+
+
+def time_searches(conn, page_size: int, repeats: int) -> dict:
+    latencies = {}
+    for name, search in SEARCHES.items():
+        stmt = Controller._build_query_search(search)
+        page = stmt.order_by(NLPModelDBModel.requested_at).limit(page_size)
+        count = select(func.count()).select_from(stmt.subquery())
+
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            conn.execute(page).all()
+            conn.execute(count).scalar()
+            timings.append(1000 * (time.perf_counter() - started))
+        latencies[name] = statistics.median(timings)
+    return latencies
+
+
+@click.command()
+@click.option('--rows', default=1000000, help='Number of seeded requests.')
+@click.option('--clients', default=100, help='Number of distinct clients.')
+@click.option('--page-size', default=50)
+@click.option('--repeats', default=5)
+def main(rows, clients, page_size, repeats):
+    engine = create_engine(psql_config().psql_conn_url, connect_args={'options': f'-csearch_path={SCHEMA}'})
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+        seed(conn, rows, clients)
+
+    with engine.connect() as conn:
+        before = time_searches(conn, page_size, repeats)
+
+    with engine.begin() as conn:
+        for index in NLPModelDBModel.__table__.indexes:
+            index.create(conn)
+        conn.execute(text("ANALYZE nlp_table"))
+
+    with engine.connect() as conn:
+        after = time_searches(conn, page_size, repeats)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    click.echo(f"{'search':<16}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+    for name in SEARCHES:
+        click.echo(f"{name:<16}{before[name]:>16.2f}{after[name]:>16.2f}{before[name] / after[name]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
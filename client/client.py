@@ -1,10 +1,11 @@
 import logging
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Iterator
 
 import requests
 from requests import codes, Response
 
-from client.data_model import NLPRequest, NLPModel
+from client.data_model import NLPRequest, NLPModel, SearchQuery
 from client.jwt_factory import JWTFactory
 
 DEFAULT_TIMEOUT = 60
@@ -107,3 +108,25 @@ class Client:
             accepted_codes=[codes.ok],
         )
         return NLPModel(**response.json())
+
+    def export_requests(self, search: SearchQuery = None) -> Iterator[NLPModel]:
+        """
+        Streams all the requests matching a search, without paging through the search endpoint.
+
+        :param search: The search filters, all the requests if None.
+        :return: A generator of instances containing request metadata (id, status, etc.).
+        """
+        search = search or SearchQuery()
+
+        self._refresh_token()
+        response = self._request(
+            url=f"{self.endpoint}/export/",
+            method="GET",
+            params={**search.dict(exclude_none=True), "format": "ndjson"},
+            stream=True,
+            accepted_codes=[codes.ok],
+        )
+        with response:
+            for line in response.iter_lines():
+                if line:
+                    yield NLPModel(**json.loads(line))
@@ -98,17 +98,20 @@ class SearchQuery(BaseModel, use_enum_values=True):
     date_from: Optional[date] = None
     date_to: Optional[date] = None
     client: Optional[str] = None
+    suggestion: Optional[str] = None
 
 
 def search_params_to_data_model(
         status: Status,
         client: str,
         date_from: str,
-        date_to: str) -> SearchQuery:
+        date_to: str,
+        suggestion: str = None) -> SearchQuery:
     return SearchQuery(**
                        {
                            'status': status,
                            'client': client,
                            'date_to': date_to,
-                           'date_from': date_from
+                           'date_from': date_from,
+                           'suggestion': suggestion
                        })
@@ -0,0 +1,12 @@
+from fastapi import Request
+
+from service.controller.async_controller import AsyncController
+
+
+def get_controller(request: Request) -> AsyncController:
+    """
+    Dependency returning the controller created by the API lifespan.
+    :param request: The incoming request.
+    :return: The controller of the API.
+    """
+    return request.app.state.controller
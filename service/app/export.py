@@ -0,0 +1,35 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from service.data_model.request import NLPModel
+
+EXPORT_FIELDS = ['id', 'sentence', 'client', 'status', 'requested_at', 'updated', 'results']
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+async def ndjson_lines(requests: AsyncIterator[NLPModel]) -> AsyncIterator[str]:
+    """
+    Formats the exported requests as newline delimited JSON, one object per line.
+    """
+    async for request in requests:
+        yield request.model_dump_json(include=set(EXPORT_FIELDS)) + '\n'
+
+
+async def csv_lines(requests: AsyncIterator[NLPModel]) -> AsyncIterator[str]:
+    """
+    Formats the exported requests as CSV with a header line. The results are a JSON list.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_FIELDS)
+    async for request in requests:
+        row = request.model_dump(mode='json', include=set(EXPORT_FIELDS))
+        row['results'] = json.dumps(row['results'])
+        writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import FastAPI
@@ -5,16 +6,30 @@ from fastapi_pagination import add_pagination
 
 from service.app import deployment_time
 from service.app.routers.health import health_router
+from service.app.routers.metrics import metrics_router
 from service.app.routers.requests import request_router
+from service.controller.factory import create_async_controller
+from service.db.factories import create_db_engine
 from service.utils.logs import initialize_logging
 
 
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    # the controller starts loading the ML models in the background, so the API serves /health while they load
+    db_engine = create_db_engine()
+    api.state.controller = create_async_controller(db_engine=db_engine)
+    yield
+    await api.state.controller.db_engine.dispose()
+    db_engine.dispose()
+
+
 def create_api() -> FastAPI:
 
     initialize_logging("config/logging.yaml")
 
-    api = FastAPI()
+    api = FastAPI(lifespan=lifespan)
     api.include_router(health_router)
+    api.include_router(metrics_router)
     api.include_router(request_router)
 
     deployment_time.set(datetime.now(tz=timezone.utc).isoformat())
@@ -1,9 +1,12 @@
 from typing_extensions import TypedDict
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response
 
 from service import __version__
 from service.app import deployment_time
+from service.app.dependencies import get_controller
+from service.controller.async_controller import AsyncController
+from service.ml.pipelines.state import PipelineState
 
 health_router = APIRouter(prefix="/health", tags=['health'])
 
@@ -15,9 +18,14 @@ class HealthInfo(TypedDict):
 
 
 @health_router.get(path="/", response_model=HealthInfo, status_code=200)
-def health():
+async def health(response: Response, controller: AsyncController = Depends(get_controller)):
+    # "loading" while the ML models are loaded and warmed up, "ready" once requests can be served
+    state = controller.state
+    if state != PipelineState.READY:
+        response.status_code = 503
+
     return {
-        "status": "OK",
+        "status": state.value,
         "version": __version__,
         "deployed": deployment_time.get()
     }
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+metrics_router = APIRouter(tags=['metrics'])
+
+
+@metrics_router.get(path="/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus text format: pipeline stage and db write histograms, request counts by status,
+    # model load time, queue depths, connection pools and the process collector (RSS, CPU, fds).
+    # A plain function, run in the threadpool, as the queue depth collector queries the database synchronously
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,29 +1,86 @@
 import logging
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
 from pydantic import ValidationError
 
 from service.app.auth import create_jwt_bearer
-from service.controller.controller import BaseController
+from service.app.dependencies import get_controller
+from service.app.export import MEDIA_TYPES, csv_lines, ndjson_lines
+from service.controller.async_controller import AsyncController
 from service.controller.errors import RequestDoesNotExist
-from service.controller.factory import create_base_controller
-from service.data_model.request import NLPModel, search_params_to_data_model, NLPRequest
+from service.data_model.request import (
+    NLPModel, search_params_to_data_model, NLPRequest, NLPBatchRequest, NLPBatchItem, NLPBatchResponse, CursorPage
+)
 from service.data_model.status import Status
 
 logger = logging.getLogger(__name__)
 request_router = APIRouter(prefix="/request", dependencies=[Depends(create_jwt_bearer())],
                            tags=['request'])
 
-controller: BaseController = create_base_controller()
+
+# registered before /{request_id}/ so that "export" and "cursor" are not taken for request ids
+@request_router.get(path="/export/", response_class=StreamingResponse, status_code=200)
+@request_router.get(path="/export", response_class=StreamingResponse, status_code=200, include_in_schema=False)
+async def export_jobs(
+        status: Optional[Status] = None,
+        client: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        suggestion: Optional[str] = None,
+        format: Literal['ndjson', 'csv'] = 'ndjson',
+        controller: AsyncController = Depends(get_controller)):
+    try:
+        search_query = search_params_to_data_model(
+            status=status, client=client, date_from=date_from, date_to=date_to, suggestion=suggestion
+        )
+    except ValidationError:
+        raise HTTPException(422, "Invalid query params")
+
+    logger.info(f"Exporting requests as {format} with params: {search_query}")
+    lines = ndjson_lines if format == 'ndjson' else csv_lines
+    return StreamingResponse(
+        lines(controller.export(search=search_query)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=requests.{format}"}
+    )
+
+
+@request_router.get(path="/cursor/", response_model=CursorPage, status_code=200)
+@request_router.get(path="/cursor", response_model=CursorPage, status_code=200, include_in_schema=False)
+async def search_jobs_cursor(
+        status: Optional[Status] = None,
+        client: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        suggestion: Optional[str] = None,
+        cursor: Optional[str] = None,
+        size: int = Query(50, ge=1, le=1000),
+        include_total: bool = False,
+        controller: AsyncController = Depends(get_controller)):
+    try:
+        search_query = search_params_to_data_model(
+            status=status, client=client, date_from=date_from, date_to=date_to, suggestion=suggestion
+        )
+        logger.info(f"Running cursor search for request with params: {search_query}")
+        return await controller.search_cursor(
+            search=search_query, cursor=cursor, size=size, include_total=include_total
+        )
+    except ValueError:
+        # also covers the pydantic ValidationError of the search params
+        raise HTTPException(422, "Invalid query params")
+    except Exception as e:
+        logger.exception(e)
+        raise HTTPException(500, "Unexpected error")
 
 
 @request_router.get(path="/{request_id}/", response_model=NLPModel, status_code=200)
-def retrieve_job(request_id: str):
+async def retrieve_job(request_id: str, controller: AsyncController = Depends(get_controller)):
     try:
         logger.info(f"Get request for job: {request_id}")
-        return controller.retrieve(request_id)
+        return await controller.retrieve(request_id)
     except RequestDoesNotExist:
         raise HTTPException(404, f"NLP request {request_id} not found")
     except Exception as e:
@@ -32,17 +89,19 @@ def retrieve_job(request_id: str):
 
 
 @request_router.get(path="/", response_model=Page[NLPModel], status_code=200)
-def search_jobs(
+async def search_jobs(
         status: Optional[Status] = None,
         client: Optional[str] = None,
         date_from: Optional[str] = None,
-        date_to: Optional[str] = None):
+        date_to: Optional[str] = None,
+        suggestion: Optional[str] = None,
+        controller: AsyncController = Depends(get_controller)):
     try:
         search_query = search_params_to_data_model(
-            status=status, client=client, date_from=date_from, date_to=date_to
+            status=status, client=client, date_from=date_from, date_to=date_to, suggestion=suggestion
         )
         logger.info(f"Running search for request with params: {search_query}")
-        return controller.search(search=search_query)
+        return await controller.search(search=search_query)
     except ValidationError:
         raise HTTPException(422, "Invalid query params")
     except Exception as e:
@@ -52,9 +111,33 @@ def search_jobs(
 
 @request_router.post(path="/", response_model=NLPModel, status_code=202)
 @request_router.post(path="", response_model=NLPModel, status_code=202, include_in_schema=False)
-def create_job(request: NLPRequest):
+async def create_job(request: NLPRequest, controller: AsyncController = Depends(get_controller)):
     try:
-        return controller.predict(request)
+        return await controller.predict(request)
     except Exception as e:
         logger.exception(e)
         raise HTTPException(500, "Unexpected error")
+
+
+@request_router.post(path="/batch", response_model=NLPBatchResponse, status_code=202)
+async def create_batch_job(batch: NLPBatchRequest, controller: AsyncController = Depends(get_controller)):
+    items, indexed_requests = [], []
+    for index, sentence in enumerate(batch.sentences):
+        try:
+            indexed_requests.append((index, NLPRequest(sentence=sentence, client=batch.client)))
+        except ValidationError as e:
+            items.append(NLPBatchItem(index=index, error="; ".join(error["msg"] for error in e.errors())))
+
+    responses = []
+    try:
+        if indexed_requests:
+            responses = await controller.predict_batch([request for _, request in indexed_requests])
+    except Exception as e:
+        logger.exception(e)
+        raise HTTPException(500, "Unexpected error")
+
+    items.extend(
+        NLPBatchItem(index=index, id=response.id, status=response.status, results=response.results)
+        for (index, _), response in zip(indexed_requests, responses)
+    )
+    return NLPBatchResponse(items=sorted(items, key=lambda item: item.index))
@@ -0,0 +1,312 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from service.controller.controller import Controller
+from service.controller.errors import RequestDoesNotExist, CriticalDBError
+from service.data_model.request import (
+    SearchQuery, NLPModel, NLPRequest, CursorPage, model_from_orm, model_to_orm, encode_cursor, decode_cursor
+)
+from service.data_model.status import Status
+from service.db.errors import UnexpectedDBError
+from service.db.schema import NLPModelDBModel
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.pipelines.state import PipelineState
+from service.queue.job_queue import JobQueue
+from service.worker.worker import Worker
+from service.utils.metrics import DB_WRITE_SECONDS, REQUESTS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncController(ABC):
+    """
+    Counterpart of `Controller` on an async SQLAlchemy engine, so the API routes await the database
+    instead of blocking a threadpool thread on it.
+    """
+
+    def __init__(self, db_engine: AsyncEngine):
+        self.db_engine = db_engine
+
+    @abstractmethod
+    async def predict(self, request: NLPRequest) -> NLPModel:
+        pass
+
+    @abstractmethod
+    async def predict_batch(self, requests: List[NLPRequest]) -> List[NLPModel]:
+        pass
+
+    @property
+    def state(self) -> PipelineState:
+        """
+        :return: Whether the ML pipeline the controller depends on is loaded.
+        """
+        return PipelineState.READY
+
+    @property
+    def db_session(self) -> AsyncSession:
+        return AsyncSession(self.db_engine)
+
+    async def create(self, request: NLPRequest) -> NLPModel:
+        """
+        :param request: A NLPRequest instance with the essential request parameters.
+        :return: A NLPModel instance with the request execution info.
+        """
+        request = NLPModel(
+            status=Status.SUBMITTED.value,
+            results=[],
+            **request.dict()
+        )
+        request_ = model_to_orm(request)
+
+        with DB_WRITE_SECONDS.labels('create').time():
+            async with self.db_session as session:
+                try:
+                    session.add(request_)
+                    await session.flush()
+                    request = model_from_orm(request_)
+                    await session.commit()
+                except SQLAlchemyError as e:
+                    logger.error(e)
+                    await session.rollback()
+                    raise UnexpectedDBError(e)
+
+        REQUESTS_TOTAL.labels(Status.SUBMITTED.value).inc()
+
+        return request
+
+    async def create_batch(self, requests: List[NLPRequest]) -> List[NLPModel]:
+        """
+        Stores many requests with a multi-row INSERT ... RETURNING.
+        :param requests: The NLPRequest instances to store.
+        :return: The SUBMITTED NLPModel instances, in the order of the requests.
+        """
+        rows = [
+            {**request.dict(), "status": Status.SUBMITTED.value, "results": []}
+            for request in requests
+        ]
+        stmt = insert(NLPModelDBModel).returning(NLPModelDBModel, sort_by_parameter_order=True)
+
+        with DB_WRITE_SECONDS.labels('create_batch').time():
+            async with self.db_session as session:
+                try:
+                    created = [model_from_orm(request) for request in await session.scalars(stmt, rows)]
+                    await session.commit()
+                except SQLAlchemyError as e:
+                    logger.error(e)
+                    await session.rollback()
+                    raise UnexpectedDBError(e)
+
+        REQUESTS_TOTAL.labels(Status.SUBMITTED.value).inc(len(created))
+
+        return created
+
+    async def retrieve(self, request_id: str) -> NLPModel:
+        """
+       Retrieves the info given a request id.
+       :param request_id: Request id to get.
+       :return: The NLPModel
+       """
+        async with self.db_session as session:
+            request = await session.get(NLPModelDBModel, request_id)
+            if not request:
+                raise RequestDoesNotExist(f"NLP request with id {request_id} does not exist")
+            return model_from_orm(request)
+
+    async def search(self, search: SearchQuery):
+        """
+       Fetches a page of results for a given search.
+       :param search: The search we want to execute.
+       :return: The results of the search query.
+       """
+        stmt = Controller._build_query_search(search)
+
+        async with self.db_session as session:
+            return await paginate(session, stmt.order_by(NLPModelDBModel.requested_at))
+
+    async def search_cursor(self, search: SearchQuery, cursor: Optional[str] = None, size: int = 50,
+                            include_total: bool = False) -> CursorPage:
+        """
+       Fetches a page of results for a given search, after the position of a cursor in the (requested_at, id)
+       order. Unlike offset pagination, the cost of a page does not grow with its depth.
+       :param search: The search we want to execute.
+       :param cursor: The `next_cursor` of the previous page, None for the first page.
+       :param size: The number of results of the page.
+       :param include_total: Whether to count the results of the whole search, which scans all of them.
+       :return: The page of results.
+       """
+        stmt = Controller._build_query_search(search)
+        page_stmt = stmt
+        if cursor:
+            page_stmt = page_stmt.where(
+                tuple_(NLPModelDBModel.requested_at, NLPModelDBModel.id) > tuple_(*decode_cursor(cursor))
+            )
+        # one extra row tells whether there is a next page
+        page_stmt = page_stmt.order_by(NLPModelDBModel.requested_at, NLPModelDBModel.id).limit(size + 1)
+
+        async with self.db_session as session:
+            items = [model_from_orm(request) for request in await session.scalars(page_stmt)]
+            total = await session.scalar(select(func.count()).select_from(stmt.subquery())) if include_total else None
+
+        next_cursor = encode_cursor(items[size - 1]) if len(items) > size else None
+        return CursorPage(items=items[:size], size=size, next_cursor=next_cursor, total=total)
+
+    async def export(self, search: SearchQuery, chunk_size: int = 1000) -> AsyncIterator[NLPModel]:
+        """
+       Streams all the results of a search from a server-side cursor, `chunk_size` rows at a time,
+       so memory stays flat whatever the number of results.
+       :param search: The search we want to export.
+       :param chunk_size: The number of rows fetched from the cursor at a time.
+       :return: The results of the search, in the (requested_at, id) order.
+       """
+        stmt = (
+            Controller._build_query_search(search)
+            .order_by(NLPModelDBModel.requested_at, NLPModelDBModel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async with self.db_session as session:
+            async for request in await session.stream_scalars(stmt):
+                yield model_from_orm(request)
+
+    async def complete_request(self, request_id: str, status: str, results: Optional[List[str]] = None) -> NLPModel:
+        """
+        Stores the final status, and the results if given, of a request with a single UPDATE ... RETURNING.
+        :param request_id: The id of the request.
+        :param status: The final status.
+        :param results: The results of the ML pipeline.
+        :return: The updated request.
+        """
+        values = {"status": status} if results is None else {"status": status, "results": results}
+        stmt = (
+            update(NLPModelDBModel)
+            .where(NLPModelDBModel.id == request_id)
+            .values(**values)
+            .returning(NLPModelDBModel)
+            .execution_options(synchronize_session=False)
+        )
+        with DB_WRITE_SECONDS.labels('complete').time():
+            async with self.db_session as session:
+                try:
+                    request = (await session.scalars(stmt)).one_or_none()
+                    if not request:
+                        raise RequestDoesNotExist(f"No request with id {request_id} found.")
+                    request = model_from_orm(request)
+                    await session.commit()
+                    REQUESTS_TOTAL.labels(status).inc()
+                    return request
+                except SQLAlchemyError as exc:
+                    logger.exception(exc)
+                    await session.rollback()
+                    raise CriticalDBError(f"Failed to complete {request_id} with status {status}")
+
+    async def complete_requests(self, requests: List[NLPModel]):
+        """
+        Stores the final status and results of many requests with a single executemany UPDATE.
+        :param requests: The requests with their final status and results.
+        """
+        rows = [{"id": request.id, "status": request.status, "results": request.results} for request in requests]
+        with DB_WRITE_SECONDS.labels('complete_batch').time():
+            async with self.db_session as session:
+                try:
+                    await session.execute(update(NLPModelDBModel), rows)
+                    await session.commit()
+                except SQLAlchemyError as exc:
+                    logger.exception(exc)
+                    await session.rollback()
+                    raise CriticalDBError(f"Failed to complete {len(requests)} requests")
+        for request in requests:
+            REQUESTS_TOTAL.labels(request.status).inc()
+
+
+class AsyncBaseController(AsyncController):
+    def __init__(self, db_engine: AsyncEngine, ml_pipeline: MLPipeline, batch_size: int = 32):
+        super().__init__(db_engine)
+        self.ml_pipeline = ml_pipeline
+        self.batch_size = batch_size
+
+    @property
+    def state(self) -> PipelineState:
+        return self.ml_pipeline.state
+
+    async def predict(self, request: NLPRequest) -> NLPModel:
+        req = await self.create(request)
+        logger.info(f"Store request {req} to the db")
+        try:
+            logger.info(f"Start ML Pipeline for id {req.id}")
+
+            # inference is CPU bound, it runs in the threadpool to keep the event loop free
+            pred = await run_in_threadpool(self.ml_pipeline.pipeline, req.sentence)
+
+            request = await self.complete_request(req.id, Status.COMPLETED.value, results=pred)
+        except Exception as e:
+            logger.error(e)
+            request = await self.complete_request(req.id, Status.FAILED.value)
+
+        logger.info(f"Finish ML Pipeline for id {request.id} with status {request.status}")
+        return request
+
+    async def predict_batch(self, requests: List[NLPRequest]) -> List[NLPModel]:
+        """
+        Stores many requests at once and runs them through the ML pipeline in batches of `batch_size`.
+        :param requests: The NLPRequest instances to run.
+        :return: The COMPLETED or FAILED NLPModel instances, in the order of the requests.
+        """
+        reqs = await self.create_batch(requests)
+        logger.info(f"Store {len(reqs)} requests to the db")
+
+        for start in range(0, len(reqs), self.batch_size):
+            chunk = reqs[start:start + self.batch_size]
+            try:
+                preds = await run_in_threadpool(self.ml_pipeline.pipeline_batch, [req.sentence for req in chunk])
+                for req, pred in zip(chunk, preds):
+                    req.status, req.results = Status.COMPLETED.value, pred
+            except Exception as e:
+                logger.error(e)
+                for req in chunk:
+                    req.status = Status.FAILED.value
+            await self.complete_requests(chunk)
+
+        return reqs
+
+
+class AsyncQueueController(AsyncController):
+    def __init__(self, db_engine: AsyncEngine, queue: JobQueue, worker: Optional[Worker] = None):
+        super().__init__(db_engine)
+        self.queue = queue
+        self.worker = worker
+
+    @property
+    def state(self) -> PipelineState:
+        # the in-process worker of the API loads the ML pipeline, separate worker processes report their own state
+        if self.worker is None:
+            return PipelineState.READY
+        return self.worker.controller.state
+
+    async def predict(self, request: NLPRequest) -> NLPModel:
+        """
+        Stores the request and enqueues it for the workers, without waiting for the ML pipeline.
+        :param request: A NLPRequest instance with the essential request parameters.
+        :return: The SUBMITTED NLPModel instance.
+        """
+        req = await self.create(request)
+        self.queue.put(req.id)
+        logger.info(f"Enqueued request {req.id}")
+        return req
+
+    async def predict_batch(self, requests: List[NLPRequest]) -> List[NLPModel]:
+        """
+        Stores many requests at once and enqueues them for the workers.
+        :param requests: The NLPRequest instances to run.
+        :return: The SUBMITTED NLPModel instances, in the order of the requests.
+        """
+        reqs = await self.create_batch(requests)
+        for req in reqs:
+            self.queue.put(req.id)
+        logger.info(f"Enqueued {len(reqs)} requests")
+        return reqs
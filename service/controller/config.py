@@ -0,0 +1,19 @@
+import os
+
+
+class ControllerConfig:
+    """
+    Configuration for the API controller.
+    """
+    # 'sync' runs the ML pipeline in the request thread, 'queue' only stores and enqueues the request
+    mode = os.getenv('CONTROLLER_MODE', 'sync')
+    # number of sentences of a batch request run through the ML pipeline at once
+    batch_size = int(os.getenv('CONTROLLER_BATCH_SIZE', '32'))
+
+
+def controller_config() -> ControllerConfig:
+    """
+    Factory that creates the ControllerConfig instance.
+    :return: A controller configuration object.
+    """
+    return ControllerConfig()
@@ -1,10 +1,10 @@
 import logging
 from abc import ABC, abstractmethod
 from datetime import timedelta
-from typing import List
+from typing import List, Optional
 
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -16,6 +16,8 @@ from service.data_model.status import Status
 from service.db.errors import UnexpectedDBError
 from service.db.schema import NLPModelDBModel
 from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.pipelines.state import PipelineState
+from service.utils.metrics import DB_WRITE_SECONDS, REQUESTS_TOTAL
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +28,47 @@ class Controller(ABC):
         self.db_engine = db_engine
 
     @abstractmethod
-    def create(self, request: NLPRequest) -> NLPModel:
+    def predict(self, request: NLPRequest) -> NLPModel:
         pass
 
+    @property
+    def state(self) -> PipelineState:
+        """
+        :return: Whether the ML pipeline the controller depends on is loaded.
+        """
+        return PipelineState.READY
+
+    @DB_WRITE_SECONDS.labels('create').time()
+    def create(self, request: NLPRequest) -> NLPModel:
+        """
+        :param request: A NLPRequest instance with the essential request parameters.
+        :return: A NLPModel instance with the request execution info.
+        """
+
+        # build request execution info
+        request = NLPModel(
+            status=Status.SUBMITTED.value,
+            results=[],
+            **request.dict()
+        )
+        request_ = model_to_orm(request)
+
+        # store request in db
+        with self.db_session as session:
+            try:
+                session.add(request_)
+                # the INSERT returns the server defaults, so the response is built before the commit expires the row
+                session.flush()
+                request = model_from_orm(request_)
+                session.commit()
+            except SQLAlchemyError as e:
+                logger.error(e)
+                session.rollback()
+                raise UnexpectedDBError(e)
+
+        REQUESTS_TOTAL.labels(Status.SUBMITTED.value).inc()
+        return request
+
     def retrieve(self, request_id: str) -> NLPModel:
         """
        Retrieves the info given a request id.
@@ -64,6 +104,9 @@ class Controller(ABC):
             stmt = stmt.where(NLPModelDBModel.requested_at > search.date_from)
         if search.date_to:
             stmt = stmt.where(NLPModelDBModel.requested_at <= search.date_to + timedelta(hours=24))
+        if search.suggestion:
+            # results @> '["suggestion"]', served by the GIN index of results
+            stmt = stmt.where(NLPModelDBModel.results.contains([search.suggestion]))
         return stmt
 
     def _get_request_from_db(self, request_id: str) -> NLPModelDBModel:
@@ -106,12 +149,84 @@ class Controller(ABC):
                 session.rollback()
                 raise CriticalDBError(f"Failed to update {request_id} with results {len(results)}")
 
+    @DB_WRITE_SECONDS.labels('complete').time()
+    def complete_request(self, request_id: str, status: str, results: Optional[List[str]] = None) -> NLPModel:
+        """
+        Stores the final status, and the results if given, of a request with a single UPDATE ... RETURNING.
+        :param request_id: The id of the request.
+        :param status: The final status.
+        :param results: The results of the ML pipeline.
+        :return: The updated request.
+        """
+        values = {"status": status} if results is None else {"status": status, "results": results}
+        stmt = (
+            update(NLPModelDBModel)
+            .where(NLPModelDBModel.id == request_id)
+            .values(**values)
+            .returning(NLPModelDBModel)
+            .execution_options(synchronize_session=False)
+        )
+        with self.db_session as session:
+            try:
+                request = session.scalars(stmt).one_or_none()
+                if not request:
+                    raise RequestDoesNotExist(f"No request with id {request_id} found.")
+                request = model_from_orm(request)
+                session.commit()
+                REQUESTS_TOTAL.labels(status).inc()
+                return request
+            except SQLAlchemyError as exc:
+                logger.exception(exc)
+                session.rollback()
+                raise CriticalDBError(f"Failed to complete {request_id} with status {status}")
+
+    @DB_WRITE_SECONDS.labels('start').time()
+    def start_requests(self, request_ids: List[str]) -> List[NLPModel]:
+        """
+        Moves SUBMITTED requests to RUNNING in a single UPDATE. Requests that are not SUBMITTED anymore
+        (e.g. claimed by another worker) are skipped.
+        :param request_ids: The ids of the requests to start.
+        :return: The started requests.
+        """
+        stmt = (
+            update(NLPModelDBModel)
+            .where(NLPModelDBModel.id.in_(request_ids), NLPModelDBModel.status == Status.SUBMITTED.value)
+            .values(status=Status.RUNNING.value)
+            .returning(NLPModelDBModel)
+        )
+        with self.db_session as session:
+            try:
+                requests = [model_from_orm(request) for request in session.scalars(stmt)]
+                session.commit()
+                REQUESTS_TOTAL.labels(Status.RUNNING.value).inc(len(requests))
+                return requests
+            except SQLAlchemyError as exc:
+                logger.exception(exc)
+                session.rollback()
+                raise CriticalDBError(f"Failed to start requests {request_ids}")
+
+    def running_requests(self, request_ids: List[str]) -> List[NLPModel]:
+        """
+        Loads the requests claimed by a job queue that moves them to RUNNING itself.
+        :param request_ids: The ids of the claimed requests.
+        :return: The requests that are still RUNNING.
+        """
+        stmt = select(NLPModelDBModel).where(
+            NLPModelDBModel.id.in_(request_ids), NLPModelDBModel.status == Status.RUNNING.value
+        )
+        with self.db_session as session:
+            return [model_from_orm(request) for request in session.scalars(stmt)]
+
 
 class BaseController(Controller):
     def __init__(self, db_engine: Engine, ml_pipeline: MLPipeline):
         super().__init__(db_engine)
         self.ml_pipeline = ml_pipeline
 
+    @property
+    def state(self) -> PipelineState:
+        return self.ml_pipeline.state
+
     def predict(self, request: NLPRequest):
         req = self.create(request)
         logger.info(f"Store request {req} to the db")
@@ -120,39 +235,28 @@ class BaseController(Controller):
 
             pred = self.ml_pipeline.pipeline(req.sentence)
 
-            self.update_request_results(req.id, pred)
-            self.update_request_status(req.id, "COMPLETED")
+            request = self.complete_request(req.id, Status.COMPLETED.value, results=pred)
         except Exception as e:
-            self.update_request_status(req.id, "FAILED")
             logger.error(e)
-        finally:
-            request = model_from_orm(self._get_request_from_db(req.id))
-            logger.info(f"Finish ML Pipeline for id {request.id} with status {request.status}")
-            return request
+            request = self.complete_request(req.id, Status.FAILED.value)
 
-    def create(self, request: NLPRequest) -> NLPModel:
+        logger.info(f"Finish ML Pipeline for id {request.id} with status {request.status}")
+        return request
+
+    def run_requests(self, requests: List[NLPModel]) -> List[NLPModel]:
         """
-        :param request: A NLPRequest instance with the essential request parameters.
-        :return: A NLPModel instance with the request execution info.
+        Runs the ML pipeline for a batch of RUNNING requests and stores their results.
+        :param requests: The requests to run.
+        :return: The COMPLETED or FAILED requests.
         """
+        logger.info(f"Start ML Pipeline for ids {[req.id for req in requests]}")
+        try:
+            preds = self.ml_pipeline.pipeline_batch([req.sentence for req in requests])
+        except Exception as e:
+            logger.error(e)
+            return [self.complete_request(req.id, Status.FAILED.value) for req in requests]
 
-        # build request execution info
-        request = NLPModel(
-            status=Status.SUBMITTED.value,
-            results=[],
-            **request.dict()
-        )
-        request_ = model_to_orm(request)
-
-        # store request in db
-        with self.db_session as session:
-            try:
-                session.add(request_)
-                session.commit()
-                request = model_from_orm(request_)
-            except SQLAlchemyError as e:
-                logger.error(e)
-                session.rollback()
-                raise UnexpectedDBError(e)
-
-        return request
+        return [
+            self.complete_request(req.id, Status.COMPLETED.value, results=pred)
+            for req, pred in zip(requests, preds)
+        ]
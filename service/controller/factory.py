@@ -1,13 +1,84 @@
+from functools import partial
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from service.controller.async_controller import AsyncBaseController, AsyncController, AsyncQueueController
+from service.controller.config import ControllerConfig, controller_config
 from service.controller.controller import BaseController
-from service.db.factories import create_db_engine
-from service.ml.pipelines.factory import create_ml_pipeline
+from service.db.cache_store import PostgresCacheStore
+from service.db.factories import create_async_db_engine, create_db_engine, pool_stats
+from service.ml import __models_version__
+from service.ml.config import ml_config
+from service.ml.pipelines.factory import create_lazy_ml_pipeline, create_micro_batcher, create_cached_pipeline
+from service.queue.factories import create_job_queue
+from service.queue.job_queue import InMemoryJobQueue, JobQueue
+from service.utils.metrics import track_pool, track_queue_depth
+from service.worker.factories import create_worker
+from service.worker.worker import Worker
+
+
+def create_inference_pipeline(db_engine: Engine):
+    """
+    Builds the ML pipeline with the configured micro-batcher and suggestion cache in front of it.
+    The models are loaded and warmed up in a background thread, requests wait for them on first use.
+    """
+    config = ml_config()
+    ml_pipeline = create_lazy_ml_pipeline(config)
+    ml_pipeline.start()
+    if config.batcher_enabled:
+        ml_pipeline = create_micro_batcher(ml_pipeline, config)
+        track_queue_depth('batcher', ml_pipeline.qsize)
+    if config.cache_enabled:
+        store = None
+        if config.cache_store == 'postgres':
+            store = PostgresCacheStore(
+                db_engine=db_engine, models_version=__models_version__, ttl_seconds=config.cache_ttl_seconds
+            )
+        ml_pipeline = create_cached_pipeline(ml_pipeline, store=store, config=config)
+    return ml_pipeline
+
+
+def _start_in_process_worker(db_engine: Engine, queue: JobQueue) -> Optional[Worker]:
+    # an in-process queue can only be consumed by a worker thread of the API process itself
+    if not isinstance(queue, InMemoryJobQueue):
+        return None
+    worker_controller = BaseController(db_engine=db_engine, ml_pipeline=create_inference_pipeline(db_engine))
+    worker = create_worker(controller=worker_controller, queue=queue)
+    worker.start()
+    return worker
 
 
 def create_base_controller() -> BaseController:
 
     db_engine = create_db_engine()
-    ml_pipeline = create_ml_pipeline()
+    ml_pipeline = create_inference_pipeline(db_engine)
     return BaseController(
         db_engine=db_engine,
         ml_pipeline=ml_pipeline
     )
+
+
+def create_async_controller(db_engine: Engine, config: ControllerConfig = None) -> AsyncController:
+    """
+    Creates the controller of the API routes, on an async engine. The ML pipeline, the Postgres cache store
+    and the job queue keep using a sync engine, as they run outside the event loop.
+    :param db_engine: The sync engine, disposed by the caller.
+    :param config: The controller configuration.
+    :return: The generated controller.
+    """
+    config = config or controller_config()
+    async_db_engine = create_async_db_engine()
+    track_pool('async', partial(pool_stats, async_db_engine))
+    track_pool('sync', partial(pool_stats, db_engine))
+    if config.mode == 'queue':
+        queue = create_job_queue(db_engine=db_engine)
+        worker = _start_in_process_worker(db_engine, queue)
+        track_queue_depth('jobs', queue.qsize)
+        return AsyncQueueController(db_engine=async_db_engine, queue=queue, worker=worker)
+
+    return AsyncBaseController(
+        db_engine=async_db_engine,
+        ml_pipeline=create_inference_pipeline(db_engine),
+        batch_size=config.batch_size
+    )
@@ -1,8 +1,10 @@
+import base64
+import json
 import re
 from datetime import datetime, date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 
 from service.data_model.status import Status
 from service.db.schema import NLPModelDBModel
@@ -71,6 +73,42 @@ class NLPModel(NLPRequest):
         from_attributes = True
 
 
+MAX_BATCH_SENTENCES = 10000
+
+
+class NLPBatchRequest(BaseModel):
+    """
+    Pydantic dataclass representing the batch request payload. Its sentences are validated one by one,
+    so an invalid sentence only fails its own item.
+    """
+
+    sentences: List[str] = Field(min_length=1, max_length=MAX_BATCH_SENTENCES)
+    client: str
+
+
+class NLPBatchItem(BaseModel):
+    """
+    Pydantic dataclass representing the outcome of one sentence of a batch request.
+    """
+
+    index: int
+    id: Optional[str] = None
+    status: Optional[Status] = None
+    results: List[str] = []
+    error: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class NLPBatchResponse(BaseModel):
+    """
+    Pydantic dataclass representing the batch response payload, with one item per sentence in request order.
+    """
+
+    items: List[NLPBatchItem]
+
+
 def model_to_orm(model: NLPModel) -> NLPModelDBModel:
     data = {k: v for k, v in model.dict().items() if k in model.__writeable_fields__}
     return NLPModelDBModel(**data)
@@ -91,17 +129,51 @@ class SearchQuery(BaseModel, use_enum_values=True):
     date_from: Optional[date] = None
     date_to: Optional[date] = None
     client: Optional[str] = None
+    suggestion: Optional[str] = None
+
+
+class CursorPage(BaseModel):
+    """
+    Pydantic dataclass representing a page of a keyset paginated search.
+    """
+
+    items: List[NLPModel]
+    size: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(model: NLPModel) -> str:
+    """
+    Encodes the position of a request in the (requested_at, id) order as an opaque token.
+    """
+    position = json.dumps([model.requested_at.isoformat(), model.id])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decodes a token of `encode_cursor`.
+    :raise ValueError: if the token is not a valid cursor.
+    """
+    try:
+        requested_at, request_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(requested_at), str(request_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
 
 
 def search_params_to_data_model(
         status: Status,
         client: str,
         date_from: str,
-        date_to: str) -> SearchQuery:
+        date_to: str,
+        suggestion: str = None) -> SearchQuery:
     return SearchQuery(**
                        {
                            'status': status,
                            'client': client,
                            'date_to': date_to,
-                           'date_from': date_from
+                           'date_from': date_from,
+                           'suggestion': suggestion
                        })
@@ -1,6 +1,10 @@
+from datetime import date
+
 import click
 
+from service.db.config import psql_config
 from service.db.factories import create_db_tables, create_db_engine
+from service.db.partitions import add_months, archive_partitions, create_partitions
 
 
 @click.group()
@@ -13,5 +17,24 @@ def create_tables():
     create_db_tables(engine=create_db_engine())
 
 
+@db.command(name='create-partitions')
+@click.option('--months-ahead', default=psql_config().partitions_ahead, help='Months to create after the current one.')
+def create_future_partitions(months_ahead):
+    with create_db_engine().begin() as conn:
+        for name in create_partitions(conn, date.today(), months=months_ahead + 1):
+            click.echo(f"created {name}")
+
+
+@db.command(name='archive-partitions')
+@click.option('--retention-months', default=psql_config().retention_months,
+              help='Months kept in the database, including the current one.')
+@click.option('--archive-dir', default=psql_config().archive_dir, help='Directory of the .csv.gz archives.')
+def archive_old_partitions(retention_months, archive_dir):
+    before = add_months(date.today().replace(day=1), 1 - retention_months)
+    with create_db_engine().begin() as conn:
+        for path in archive_partitions(conn, before=before, archive_dir=archive_dir):
+            click.echo(f"archived {path}")
+
+
 if __name__ == '__main__':
     db()
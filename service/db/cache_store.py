@@ -0,0 +1,53 @@
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from service.db.schema import SuggestionCacheDBModel
+from service.ml.pipelines.cache import CacheStore
+
+
+class PostgresCacheStore(CacheStore):
+    """
+    Shared tier of the suggestion cache in the suggestion_cache table, visible to every API and worker process.
+    Pruning deletes the rows past `ttl_seconds` and the rows of other models versions.
+    """
+
+    def __init__(self, db_engine: Engine, models_version: str, ttl_seconds: float):
+        self.db_engine = db_engine
+        self.models_version = models_version
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[List[str]]:
+        stmt = select(SuggestionCacheDBModel.results).where(
+            SuggestionCacheDBModel.key == key,
+            SuggestionCacheDBModel.models_version == self.models_version,
+            SuggestionCacheDBModel.created_at > func.now() - timedelta(seconds=self.ttl_seconds),
+        )
+        with Session(self.db_engine) as session:
+            return session.scalar(stmt)
+
+    def set(self, key: str, results: List[str]):
+        stmt = insert(SuggestionCacheDBModel).values(
+            key=key, models_version=self.models_version, results=results, created_at=func.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SuggestionCacheDBModel.key],
+            set_={"results": stmt.excluded.results, "created_at": stmt.excluded.created_at},
+        )
+        with Session(self.db_engine) as session:
+            session.execute(stmt)
+            session.commit()
+
+    def prune(self) -> int:
+        stmt = delete(SuggestionCacheDBModel).where(or_(
+            SuggestionCacheDBModel.created_at <= func.now() - timedelta(seconds=self.ttl_seconds),
+            SuggestionCacheDBModel.models_version != self.models_version,
+        ))
+        with Session(self.db_engine) as session:
+            deleted = session.execute(stmt).rowcount
+            session.commit()
+        return deleted
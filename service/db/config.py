@@ -6,6 +6,20 @@ class PSQLConfig:
     Configuration for the PostgreSQL DB connection.
     """
     psql_conn_url = os.getenv('PSQL_CONN_URL', 'postgresql://postgres:postgres@db:5432/postgres')
+    # URL of the async engine, defaults to psql_conn_url with the asyncpg driver
+    psql_async_conn_url = os.getenv('PSQL_ASYNC_CONN_URL')
+    pool_size = int(os.getenv('PSQL_POOL_SIZE', '5'))
+    pool_max_overflow = int(os.getenv('PSQL_POOL_MAX_OVERFLOW', '10'))
+    # seconds after which a connection is replaced, -1 to keep connections forever
+    pool_recycle = int(os.getenv('PSQL_POOL_RECYCLE', '-1'))
+    pool_timeout = float(os.getenv('PSQL_POOL_TIMEOUT', '30'))
+    # pinging costs a round trip per checkout but detects connections dropped by the server
+    pool_pre_ping = os.getenv('PSQL_POOL_PRE_PING', 'true').lower() == 'true'
+    # opt-in monthly range partitioning of nlp_table, applied by the migration 'd7e2a0'
+    partition_nlp_table = os.getenv('PSQL_PARTITION_NLP_TABLE', 'false').lower() == 'true'
+    partitions_ahead = int(os.getenv('PSQL_PARTITIONS_AHEAD', '3'))
+    retention_months = int(os.getenv('PSQL_RETENTION_MONTHS', '12'))
+    archive_dir = os.getenv('PSQL_ARCHIVE_DIR', 'archive')
 
 
 def psql_config() -> PSQLConfig:
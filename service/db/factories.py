@@ -1,6 +1,10 @@
-from sqlalchemy.engine import create_engine, Engine
+from typing import Any, Dict, Union
+
+from sqlalchemy.engine import create_engine, make_url, Engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
 from service.db.config import PSQLConfig, psql_config
+from service.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from service.db.schema import Base
 
 
@@ -17,12 +21,40 @@ def drop_db_tables(engine: Engine):
     Base.metadata.drop_all(engine)
 
 
+def _pool_options(config: PSQLConfig) -> Dict[str, Any]:
+    return {
+        "pool_size": config.pool_size,
+        "max_overflow": config.pool_max_overflow,
+        "pool_recycle": config.pool_recycle,
+        "pool_timeout": config.pool_timeout,
+        "pool_pre_ping": config.pool_pre_ping,
+    }
+
+
 def create_db_engine(config: PSQLConfig = None) -> Engine:
     """
     Factory method for the database engine. Creates an SQLAlchemy Engine from the database configuration.
     :return: The generated engine.
     """
     config = config or psql_config()
-    engine = create_engine(config.psql_conn_url, pool_pre_ping=True)
+    engine = create_engine(config.psql_conn_url, poolclass=InstrumentedQueuePool, **_pool_options(config))
     # create_db_tables(engine=engine)
     return engine
+
+
+def create_async_db_engine(config: PSQLConfig = None) -> AsyncEngine:
+    """
+    Factory method for the async database engine, used by the API routes.
+    :return: The generated engine.
+    """
+    config = config or psql_config()
+    url = config.psql_async_conn_url or make_url(config.psql_conn_url).set(drivername='postgresql+asyncpg')
+    return create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, **_pool_options(config))
+
+
+def pool_stats(engine: Union[Engine, AsyncEngine]) -> Dict[str, Any]:
+    """
+    :return: The checkout time, timeout and connection counters of the engine pool.
+    """
+    engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    return engine.pool.stats()
@@ -0,0 +1,202 @@
+import csv
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# literal, as the module is run by the migrations
+TABLE = "nlp_table"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_PATTERN = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    :param month: The first day of the month.
+    :return: The name of the partition of nlp_table holding the requests of the month.
+    """
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"), {"table": TABLE}
+    ).scalar())
+
+
+def list_partitions(conn: Connection) -> List[date]:
+    """
+    :return: The months of the monthly partitions attached to nlp_table, in order.
+    """
+    names = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:table)"
+    ), {"table": TABLE}).scalars()
+
+    matches = [PARTITION_PATTERN.match(name) for name in names]
+    return sorted(date(int(match.group(1)), int(match.group(2)), 1) for match in matches if match)
+
+
+def has_default_partition(conn: Connection) -> bool:
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:default) AND inhparent = to_regclass(:table)"),
+        {"default": DEFAULT_PARTITION, "table": TABLE}
+    ).scalar())
+
+
+def create_partitions(conn: Connection, start: date, months: int) -> List[str]:
+    """
+    Creates the missing monthly partitions of nlp_table from the month of `start` on. A partition can't be
+    attached while the default partition holds rows of its month, so the default partition is detached
+    meanwhile and its rows of the created months are moved to their partitions.
+    :param conn: Connection to the database.
+    :param start: A day of the first month.
+    :param months: The number of months.
+    :return: The names of the created partitions.
+    """
+    existing = set(list_partitions(conn))
+    missing = [
+        month for month in (add_months(month_start(start), offset) for offset in range(months))
+        if month not in existing
+    ]
+    if not missing:
+        return []
+
+    default = has_default_partition(conn)
+    if default:
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+
+    created = []
+    for month in missing:
+        name = partition_name(month)
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        if default:
+            moved = conn.execute(text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE requested_at >= :start AND requested_at < :end RETURNING *) "
+                f"INSERT INTO {TABLE} SELECT * FROM moved"
+            ), {"start": month, "end": add_months(month, 1)}).rowcount
+            if moved:
+                logger.info(f"Moved {moved} rows from {DEFAULT_PARTITION} to {name}")
+        logger.info(f"Created partition {name}")
+        created.append(name)
+
+    if default:
+        conn.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    return created
+
+
+def _count_archived_rows(path: str) -> int:
+    with gzip.open(path, 'rt', newline='') as archive:
+        # the first record is the CSV header
+        return sum(1 for _ in csv.reader(archive)) - 1
+
+
+def archive_partitions(conn: Connection, before: date, archive_dir: str) -> List[str]:
+    """
+    Detaches the monthly partitions of nlp_table older than a month, archives their rows to
+    gzip-compressed CSV files and drops them. A partition is dropped only once its archive file is
+    written, flushed to disk and read back with all the rows of the partition.
+    :param conn: Connection to the database.
+    :param before: A day of the first month to keep.
+    :param archive_dir: The directory of the archive files.
+    :return: The paths of the archive files.
+    """
+    Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    archived = []
+    for month in list_partitions(conn):
+        if month >= month_start(before):
+            break
+        name = partition_name(month)
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        partial_path = f"{path}.partial"
+
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        with open(partial_path, 'wb') as file:
+            with gzip.open(file, 'wt', newline='') as archive:
+                conn.connection.cursor().copy_expert(f"COPY {name} TO STDOUT WITH CSV HEADER", archive)
+            file.flush()
+            os.fsync(file.fileno())
+
+        rows = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        archived_rows = _count_archived_rows(partial_path)
+        if archived_rows != rows:
+            # raising rolls the detach back, the partition stays attached
+            raise RuntimeError(f"Archive {partial_path} of partition {name} has {archived_rows} of its {rows} rows")
+        os.replace(partial_path, path)
+        conn.execute(text(f"DROP TABLE {name}"))
+
+        logger.info(f"Archived partition {name} to {path}")
+        archived.append(path)
+    return archived
+
+
+def _swap_table(conn: Connection, indexes: List[str], partition_by: str = ""):
+    """
+    Replaces nlp_table with a copy of itself, partitioned if `partition_by` is given, keeping its rows.
+    The indexes of the old table are dropped with it and the given `CREATE INDEX` statements are run on the new one.
+    """
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old"))
+    conn.execute(text(f"ALTER TABLE {TABLE}_old RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_old_pkey"))
+
+    conn.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE {TABLE}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) {partition_by}"
+    ))
+    # the primary key of a partitioned table must contain the partition key
+    primary_key = "id, requested_at" if partition_by else "id"
+    conn.execute(text(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({primary_key})"))
+    if partition_by:
+        conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+        first = conn.execute(text(f"SELECT min(requested_at) FROM {TABLE}_old")).scalar() or date.today()
+        create_partitions(conn, first, months=_months_between(first, date.today()) + 1)
+
+    conn.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_old"))
+    conn.execute(text(f"DROP TABLE {TABLE}_old CASCADE"))
+    for index in indexes:
+        conn.execute(text(index))
+
+
+def _months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def partition_table(conn: Connection, indexes: List[str], months_ahead: int = 3):
+    """
+    Turns nlp_table into a table partitioned by requested_at month, with a partition for every month since
+    its oldest request and `months_ahead` months after the current one, plus a default partition.
+    :param conn: Connection to the database.
+    :param indexes: The `CREATE INDEX` statements of the indexes of nlp_table.
+    :param months_ahead: The number of months after the current one.
+    """
+    _swap_table(conn, indexes, partition_by="PARTITION BY RANGE (requested_at)")
+    create_partitions(conn, date.today(), months=months_ahead + 1)
+
+
+def unpartition_table(conn: Connection, indexes: List[str]):
+    """
+    Turns the partitioned nlp_table back into a plain table.
+    :param conn: Connection to the database.
+    :param indexes: The `CREATE INDEX` statements of the indexes of nlp_table.
+    """
+    _swap_table(conn, indexes)
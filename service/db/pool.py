@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict, Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Counters of a connection pool: checkout times, checkout timeouts and connection churn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timed_checkouts = 0
+        self.checkout_total = 0.0
+        self.checkout_max = 0.0
+
+    def record_checkout(self, duration: float):
+        with self._lock:
+            self.timed_checkouts += 1
+            self.checkout_total += duration
+            self.checkout_max = max(self.checkout_max, duration)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def listen(self, pool):
+        """
+        Counts the connections opened, checked out, checked in and invalidated by a pool.
+        """
+        def increment(counter):
+            def listener(*args):
+                with self._lock:
+                    setattr(self, counter, getattr(self, counter) + 1)
+            return listener
+
+        event.listen(pool, 'connect', increment('connects'))
+        event.listen(pool, 'checkout', increment('checkouts'))
+        event.listen(pool, 'checkin', increment('checkins'))
+        event.listen(pool, 'invalidate', increment('invalidations'))
+
+
+class _InstrumentedPool:
+    """
+    Times each checkout of a connection through the public `Pool.connect`, and counts the checkouts that time out.
+    The checkout time includes the wait for a free connection, the opening of a new connection when the pool
+    can grow and the pre-ping, so a high checkout time with no free connection points to pool starvation and
+    a high one with many connects to a slow database.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.metrics.listen(self)
+
+    def connect(self):
+        started = time.monotonic()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.record_checkout(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: The pool counters and its current active and idle connections.
+        """
+        metrics = self.metrics
+        with metrics._lock:
+            return {
+                "size": self.size(),
+                "active": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": metrics.checkouts,
+                "checkins": metrics.checkins,
+                "timeouts": metrics.timeouts,
+                "connects": metrics.connects,
+                "invalidations": metrics.invalidations,
+                "avg_checkout_ms": (
+                    1000 * metrics.checkout_total / metrics.timed_checkouts if metrics.timed_checkouts else 0.0
+                ),
+                "max_checkout_ms": 1000 * metrics.checkout_max,
+            }
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
@@ -1,7 +1,8 @@
 from uuid import uuid4
 
-from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy import Column, String, DateTime, JSON, Index
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
 from service.data_model.status import Status
@@ -23,4 +24,23 @@ class NLPModelDBModel(Base):
     updated = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     status = Column(String, nullable=False, default=Status.SUBMITTED.value)
     client = Column(String, nullable=False)
+    results = Column(JSONB, nullable=False, default=[])
+
+    # the search endpoint filters on client and/or status and always orders by requested_at,
+    # and on a suggestion with a containment query on results
+    __table_args__ = (
+        Index('ix_nlp_table_client_requested_at', 'client', 'requested_at'),
+        Index('ix_nlp_table_status_requested_at', 'status', 'requested_at'),
+        Index('ix_nlp_table_requested_at', 'requested_at'),
+        Index('ix_nlp_table_results', 'results', postgresql_using='gin', postgresql_ops={'results': 'jsonb_path_ops'}),
+    )
+
+
+class SuggestionCacheDBModel(Base):
+    __tablename__ = 'suggestion_cache'
+    __fields__ = ['key', 'models_version', 'results', 'created_at']
+
+    key = Column(String, primary_key=True)
+    models_version = Column(String, nullable=False)
     results = Column(JSON, nullable=False, default=[])
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
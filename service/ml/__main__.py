@@ -0,0 +1,62 @@
+import os
+from itertools import chain
+
+import click
+
+from service.ml.fill_in_onnx.export import export_fill_in_model
+from service.ml.fill_in_pytorch.loader import load_bert_tokenizer, load_bert_model
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.quantization import CHECK_SENTENCES, fill_in_agreement, quantize_model, sentiment_agreement
+from service.ml.sentiment_analysis_onnx.export import export_sentiment_model
+from service.ml.sentiment_analysis_pytorch.loader import load_bert_pipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.sentiment_lexicon.builder import build_sentiment_lexicon, save_sentiment_lexicon
+
+
+@click.group()
+def ml():
+    pass
+
+
+@ml.command(name='build-sentiment-lexicon')
+@click.option('--output', default='models/sentiment_lexicon.npy', help='Destination .npy file.')
+@click.option('--fill-in-model', default='bert-large-uncased', help='Model whose vocabulary is classified.')
+@click.option('--sent-anal-model', default='distilbert-base-uncased-finetuned-sst-2-english')
+@click.option('--batch-size', default=256)
+def build_lexicon(output, fill_in_model, sent_anal_model, batch_size):
+    tokenizer = load_bert_tokenizer(fill_in_model)
+    pipeline = load_bert_pipeline(model=sent_anal_model, task='sentiment-analysis')
+    save_sentiment_lexicon(build_sentiment_lexicon(pipeline, tokenizer, batch_size=batch_size), output)
+
+
+@ml.command(name='export-onnx')
+@click.option('--output-dir', default='models/onnx', help='Destination directory of the exported models.')
+@click.option('--fill-in-model', default='bert-large-uncased')
+@click.option('--sent-anal-model', default='distilbert-base-uncased-finetuned-sst-2-english')
+def export_onnx(output_dir, fill_in_model, sent_anal_model):
+    export_fill_in_model(
+        load_bert_model(fill_in_model), load_bert_tokenizer(fill_in_model), os.path.join(output_dir, 'fill_in')
+    )
+    pipeline = load_bert_pipeline(model=sent_anal_model, task='sentiment-analysis')
+    export_sentiment_model(pipeline.model, pipeline.tokenizer, os.path.join(output_dir, 'sent_anal'))
+
+
+@ml.command(name='check-quantization')
+@click.option('--fill-in-model', default='bert-large-uncased')
+@click.option('--sent-anal-model', default='distilbert-base-uncased-finetuned-sst-2-english')
+def check_quantization(fill_in_model, sent_anal_model):
+    model, tokenizer = load_bert_model(fill_in_model), load_bert_tokenizer(fill_in_model)
+    fill_in = FillInTorchPredictor(model=model, tokenizer=tokenizer)
+    quantized_fill_in = FillInTorchPredictor(model=quantize_model(model), tokenizer=tokenizer)
+    click.echo(f"fill-in: {fill_in_agreement(fill_in, quantized_fill_in)}")
+
+    suggestions = sorted(set(chain.from_iterable(fill_in.predict_batch(CHECK_SENTENCES))))
+    sent_anal = SentimentAnalysisTorchPredictor(load_bert_pipeline(model=sent_anal_model, task='sentiment-analysis'))
+    quantized_sent_anal = SentimentAnalysisTorchPredictor(
+        load_bert_pipeline(model=sent_anal_model, task='sentiment-analysis', quantize=True)
+    )
+    click.echo(f"sentiment: {sentiment_agreement(sent_anal, quantized_sent_anal, suggestions)}")
+
+
+if __name__ == '__main__':
+    ml()
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+
+class MLConfig:
+    """
+    Configuration for the ML inference pipeline.
+    """
+    # 'pytorch' or 'onnx', the latter runs the models exported by `python -m service.ml export-onnx`
+    backend = os.getenv('ML_BACKEND', 'pytorch')
+    onnx_fill_in_path = os.getenv('ML_ONNX_FILL_IN_PATH', 'models/onnx/fill_in')
+    onnx_sent_anal_path = os.getenv('ML_ONNX_SENT_ANAL_PATH', 'models/onnx/sent_anal')
+    # dynamic int8 quantization of the Linear layers of the PyTorch models
+    quantize = os.getenv('ML_QUANTIZE', 'false').lower() == 'true'
+    # 'pipeline', 'lexicon', 'token_ids' or 'context'. 'token_ids' classifies the suggestions from the word piece
+    # ids of the vocabulary shared by the fill-in and sentiment models, 'context' classifies the sentences filled
+    # with each suggestion, both without the transformers pipeline
+    sentiment_mode = os.getenv('ML_SENTIMENT_MODE', 'pipeline')
+    # minimum positive probability of a filled sentence in the 'context' mode, after dividing the logits by the
+    # temperature, a fixed setting that is not fitted to any data
+    sentiment_threshold = float(os.getenv('ML_SENTIMENT_THRESHOLD', '0.5'))
+    sentiment_temperature = float(os.getenv('ML_SENTIMENT_TEMPERATURE', '1.0'))
+    sentiment_lexicon_path = os.getenv('ML_SENTIMENT_LEXICON_PATH', 'models/sentiment_lexicon.npy')
+    fill_in_decoding = os.getenv('ML_FILL_IN_DECODING', 'topk')
+    fill_in_top_k = int(os.getenv('ML_FILL_IN_TOP_K', '3'))
+    # sentences with many blanks: 'parallel' combines the independent predictions of every blank of one forward
+    # pass, 'beam' fills the blanks left to right with a beam search of ML_FILL_IN_BEAM_WIDTH hypotheses
+    fill_in_multi_blank = os.getenv('ML_FILL_IN_MULTI_BLANK', 'parallel')
+    fill_in_beam_width = int(os.getenv('ML_FILL_IN_BEAM_WIDTH', '8'))
+    # sentences with a single blank get phrases of up to this many tokens, also decoded with the beam search
+    fill_in_max_span = int(os.getenv('ML_FILL_IN_MAX_SPAN', '1'))
+    batcher_enabled = os.getenv('ML_BATCHER_ENABLED', 'false').lower() == 'true'
+    batcher_max_batch_size = int(os.getenv('ML_BATCHER_MAX_BATCH_SIZE', '16'))
+    batcher_max_wait_ms = float(os.getenv('ML_BATCHER_MAX_WAIT_MS', '10'))
+    cache_enabled = os.getenv('ML_CACHE_ENABLED', 'false').lower() == 'true'
+    cache_max_size = int(os.getenv('ML_CACHE_MAX_SIZE', '10000'))
+    cache_ttl_seconds = float(os.getenv('ML_CACHE_TTL_SECONDS', '86400'))
+    # shared tier of the cache: 'none', 'disk' or 'postgres'
+    cache_store = os.getenv('ML_CACHE_STORE', 'none')
+    cache_disk_path = os.getenv('ML_CACHE_DISK_PATH', 'cache/suggestions')
+    # the disk store keeps at most this many entries, the oldest are deleted first
+    cache_disk_max_entries = int(os.getenv('ML_CACHE_DISK_MAX_ENTRIES', '100000'))
+    # seconds between two prunes of the expired entries of the shared store
+    cache_prune_interval_seconds = float(os.getenv('ML_CACHE_PRUNE_INTERVAL_SECONDS', '3600'))
+
+
+# the settings that change the results of the ML pipeline, so a cached result only serves the same settings
+RESULT_SETTINGS = (
+    'backend', 'quantize', 'sentiment_mode', 'sentiment_threshold', 'sentiment_temperature', 'sentiment_lexicon_path',
+    'fill_in_decoding', 'fill_in_top_k', 'fill_in_multi_blank', 'fill_in_beam_width', 'fill_in_max_span',
+)
+
+
+def config_fingerprint(config: MLConfig) -> str:
+    """
+    :param config: The ML pipeline configuration.
+    :return: A short hash of the settings that change the results of the ML pipeline.
+    """
+    settings = {name: getattr(config, name) for name in RESULT_SETTINGS}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def ml_config() -> MLConfig:
+    """
+    Factory that creates the MLConfig instance.
+    :return: An ML pipeline configuration object.
+    """
+    return MLConfig()
@@ -0,0 +1,57 @@
+import inspect
+import os
+from pathlib import Path
+
+import torch
+
+from service.ml.fill_in_onnx.loader import MODEL_FILE
+
+
+def export_onnx_model(model: torch.nn.Module, tokenizer, model_dir: str, input_names, logits_axes,
+                      opset_version: int = 14):
+    """
+    Exports a transformers model to ONNX with dynamic batch and sequence axes, and saves its tokenizer
+    and config next to it so the exported directory is self-contained
+    @param model: the `~torch.nn.Module` model
+    @param tokenizer: the model tokenizer
+    @param model_dir: destination directory
+    @param input_names: the model inputs, in the order of its forward signature
+    @param logits_axes: the dynamic axes of the logits output
+    @param opset_version: the ONNX opset
+    """
+    Path(model_dir).mkdir(parents=True, exist_ok=True)
+    encoded = tokenizer(["have a [MASK] day", "the application was [MASK]"], padding=True, return_tensors="pt")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = logits_axes
+
+    # newer torch releases default to the dynamo exporter, the TorchScript one handles dynamic_axes directly
+    kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(encoded[name] for name in input_names),
+            os.path.join(model_dir, MODEL_FILE),
+            input_names=list(input_names),
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            **kwargs
+        )
+    tokenizer.save_pretrained(model_dir)
+    model.config.save_pretrained(model_dir)
+
+
+def export_fill_in_model(model: torch.nn.Module, tokenizer, model_dir: str):
+    """
+    Exports the `BertForMaskedLM` fill-in model to ONNX
+    @param model: the fill-in model
+    @param tokenizer: the fill-in tokenizer
+    @param model_dir: destination directory
+    """
+    export_onnx_model(
+        model, tokenizer, model_dir,
+        input_names=("input_ids", "attention_mask", "token_type_ids"),
+        logits_axes={0: "batch", 1: "sequence"}
+    )
@@ -0,0 +1,32 @@
+import os
+
+from transformers import AutoTokenizer
+
+MODEL_FILE = "model.onnx"
+
+
+def load_onnx_session(model_dir: str):
+    """
+    Loads an exported model in a CPU ONNX Runtime session with all graph optimizations enabled
+    @param model_dir: directory of the exported model
+    @return: The `~onnxruntime.InferenceSession`
+    """
+    try:
+        import onnxruntime
+    except ImportError:
+        raise ImportError("The ONNX backend requires onnxruntime, install it with `poetry install -E onnx`")
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(
+        os.path.join(model_dir, MODEL_FILE), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+
+
+def load_onnx_tokenizer(model_dir: str):
+    """
+    Loads the tokenizer saved next to an exported model
+    @param model_dir: directory of the exported model
+    @return: tokenizer
+    """
+    return AutoTokenizer.from_pretrained(model_dir)
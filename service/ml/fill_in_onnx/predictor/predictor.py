@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+class FillInOnnxPredictor:
+    def __init__(self, session, tokenizer, top_k: int = 3, allowed_token_mask: Optional[np.ndarray] = None):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.top_k = top_k
+        self.allowed_token_mask = allowed_token_mask
+        self._input_names = [model_input.name for model_input in session.get_inputs()]
+
+    def _run(self, sentences: List[str]):
+        encoded = self.tokenizer(sentences, padding=True, return_tensors="np")
+        inputs = {name: encoded[name].astype(np.int64) for name in self._input_names}
+        return encoded["input_ids"], self.session.run(["logits"], inputs)[0]
+
+    def _decode_top_tokens(self, mask_logits: np.ndarray) -> List:
+        """
+        Decodes the top k predicted tokens from the logits of a single [MASK] position,
+        restricted to the allowed tokens when an allowed token mask is set
+        @param mask_logits: array with the vocabulary logits of the [MASK] position
+        @return: List
+        """
+        if self.allowed_token_mask is not None:
+            mask_logits = np.where(self.allowed_token_mask, mask_logits, -np.inf)
+        top_k = np.argpartition(-mask_logits, self.top_k)[:self.top_k]
+        predicted_token_ids = top_k[np.argsort(-mask_logits[top_k], kind="stable")]
+        return self.tokenizer.convert_ids_to_tokens(predicted_token_ids.tolist())
+
+    def predict(self, sentence: str) -> List:
+        """
+        Predicts the words
+        @param sentence: str sentence
+        @return: List
+        """
+        return self.predict_batch([sentence])[0]
+
+    def predict_batch(self, sentences: List[str]) -> List[List]:
+        """
+        Predicts the words for many sentences with a single session run
+        @param sentences: list with str sentences
+        @return: List with the predicted words of each sentence
+        """
+        input_ids, logits = self._run(sentences)
+
+        predictions = []
+        for row, row_input_ids in enumerate(input_ids):
+            mask_token_index = np.where(row_input_ids == self.tokenizer.mask_token_id)[0]
+            if not len(mask_token_index):
+                predictions.append([])
+                continue
+            predictions.append(self._decode_top_tokens(logits[row, mask_token_index[0]]))
+
+        return predictions
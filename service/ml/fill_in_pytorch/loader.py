@@ -1,20 +1,24 @@
 import torch
-from transformers import BertTokenizer, BertForMaskedLM
+from transformers import BertTokenizerFast, BertForMaskedLM
+
+from service.ml.quantization import quantize_model
 
 
 def load_bert_tokenizer(name: str):
     """
-    Load pre-trained tokenizer
+    Load the pre-trained fast (Rust) tokenizer
     @param name: tokenizer name
     @return: tokenizer
     """
-    return BertTokenizer.from_pretrained(name)
+    return BertTokenizerFast.from_pretrained(name)
 
 
-def load_bert_model(model: str) -> torch.nn.Module:
+def load_bert_model(model: str, quantize: bool = False) -> torch.nn.Module:
     """
     Loads the `~torch.nn.Module` model based on the predefined model.
     @param model: model name
+    @param quantize: whether to apply dynamic int8 quantization to the Linear layers
     @return: The `~torch.nn.Module` model on the appropriate device.
     """
-    return BertForMaskedLM.from_pretrained(model)
+    bert_model = BertForMaskedLM.from_pretrained(model)
+    return quantize_model(bert_model) if quantize else bert_model
@@ -1,30 +1,253 @@
-from typing import List
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 
 import torch
+from torch.nn.utils.rnn import pad_sequence
+from transformers import BertForMaskedLM
+
+from service.ml.fill_in_pytorch.vocabulary import build_phrase_token_masks
+from service.ml.suggestions import Suggestion
+
+MULTI_BLANK_MODES = ('parallel', 'beam')
 
 
 class FillInTorchPredictor:
-    def __init__(self, model, tokenizer):
+    def __init__(self, model, tokenizer, top_k: int = 3, allowed_token_mask: Optional[torch.Tensor] = None,
+                 multi_blank: str = 'parallel', beam_width: int = 8, max_span: int = 1):
+        if multi_blank not in MULTI_BLANK_MODES:
+            raise ValueError(f"multi_blank must be one of {MULTI_BLANK_MODES}, got {multi_blank}")
         self.model = model
         self.tokenizer = tokenizer
+        self.top_k = top_k
+        self.allowed_token_mask = allowed_token_mask
+        self.multi_blank = multi_blank
+        self.beam_width = beam_width
+        self.max_span = max_span
+        self._phrase_token_masks = None
 
     def _tokenize(self, sentence: str):
         return self.tokenizer.encode(sentence, return_tensors="pt")
 
-    def predict(self, sentence: str) -> List:
+    def _tokenize_batch(self, sentences: List[str]):
+        return self.tokenizer(sentences, padding=True, return_tensors="pt")
+
+    def _mask_logits(self, rows: torch.Tensor, positions: torch.Tensor, **inputs) -> torch.Tensor:
+        """
+        Runs the model and returns the vocabulary logits of the given positions only. For a BERT masked LM, the LM
+        head, which projects a position onto the whole vocabulary, only runs on the hidden states of these positions
+        instead of every position of the batch
+        @param rows: tensor with the batch row of each position
+        @param positions: tensor with the positions in their rows
+        @param inputs: the model inputs
+        @return: tensor with the vocabulary logits of each position
+        """
+        with torch.no_grad():
+            if isinstance(self.model, BertForMaskedLM):
+                hidden_states = self.model.bert(**inputs)[0]
+                return self.model.cls(hidden_states[rows, positions])
+            return self.model(**inputs)[0][rows, positions]
+
+    def _restrict(self, mask_logits: torch.Tensor) -> torch.Tensor:
+        if self.allowed_token_mask is not None:
+            mask_logits = mask_logits.masked_fill(~self.allowed_token_mask, float("-inf"))
+        return mask_logits
+
+    def _decode_top_tokens(self, mask_logits: torch.Tensor) -> List:
+        """
+        Decodes the top k predicted tokens from the logits of a single [MASK] position,
+        restricted to the allowed tokens when an allowed token mask is set
+        @param mask_logits: tensor with the vocabulary logits of the [MASK] position
+        @return: List
+        """
+        predicted_token_ids = self._restrict(mask_logits).topk(self.top_k).indices.tolist()
+        return self.tokenizer.convert_ids_to_tokens(predicted_token_ids)
+
+    def _extend(self, hypotheses: List[Tuple[Tuple[int, ...], float]], log_probs: torch.Tensor,
+                width: int) -> List[Tuple[Tuple[int, ...], float]]:
+        """
+        Extends every hypothesis with its `width` most likely tokens for the next blank and keeps the `width` best
+        @param hypotheses: list with the token ids of the previous blanks and their summed log-probability
+        @param log_probs: tensor with the vocabulary log-probabilities of the next blank for each hypothesis
+        @param width: the number of hypotheses kept
+        @return: List
+        """
+        top = log_probs.topk(min(width, log_probs.shape[-1]))
+        candidates = [
+            (token_ids + (token_id,), score + log_prob)
+            for (token_ids, score), log_probs_, token_ids_ in zip(hypotheses, top.values.tolist(), top.indices.tolist())
+            for log_prob, token_id in zip(log_probs_, token_ids_)
+        ]
+        return sorted(candidates, key=itemgetter(1), reverse=True)[:width]
+
+    def _decode_parallel(self, mask_logits: torch.Tensor) -> List[Tuple[str, ...]]:
+        """
+        Combines the independent predictions of every [MASK] position of a single forward pass into the
+        top k suggestion tuples, ranked by their summed log-probability
+        @param mask_logits: tensor with the vocabulary logits of every [MASK] position of the sentence
+        @return: List
+        """
+        log_probs = self._restrict(mask_logits).log_softmax(-1)
+
+        hypotheses = [((), 0.0)]
+        for position_log_probs in log_probs:
+            # the blanks are independent, so keeping the top k at each blank gives the exact top k tuples
+            hypotheses = self._extend(hypotheses, position_log_probs.expand(len(hypotheses), -1), self.top_k)
+        return [tuple(self.tokenizer.convert_ids_to_tokens(list(token_ids))) for token_ids, _ in hypotheses]
+
+    def _decode_beam(self, input_ids: torch.Tensor, mask_logits: torch.Tensor,
+                     mask_positions: torch.Tensor) -> List[Tuple[str, ...]]:
+        """
+        Fills the [MASK] positions from left to right with a beam search, every blank conditioned on the tokens
+        chosen for the previous ones. The hypotheses of the beam are run as one batch per blank
+        @param input_ids: tensor with the token ids of the sentence, without padding
+        @param mask_logits: tensor with the vocabulary logits of the [MASK] positions, from the first pass
+        @param mask_positions: tensor with the [MASK] positions
+        @return: List
+        """
+        beams = [((), 0.0)]
+        for step, position in enumerate(mask_positions.tolist()):
+            if step:
+                beam_input_ids = input_ids.repeat(len(beams), 1)
+                beam_input_ids[:, mask_positions[:step]] = torch.tensor([token_ids for token_ids, _ in beams])
+                step_logits = self._mask_logits(
+                    torch.arange(len(beams)), torch.full((len(beams),), position), input_ids=beam_input_ids
+                )
+            else:
+                step_logits = mask_logits[:1]
+            beams = self._extend(beams, self._restrict(step_logits).log_softmax(-1), self.beam_width)
+
+        return [tuple(self.tokenizer.convert_ids_to_tokens(list(token_ids))) for token_ids, _ in beams[:self.top_k]]
+
+    def _decode(self, input_ids: torch.Tensor, mask_logits: torch.Tensor) -> List[Suggestion]:
+        """
+        Decodes the suggestions of a sentence: tokens for a single [MASK], tuples of a token per [MASK] otherwise
+        @param input_ids: tensor with the token ids of the sentence, without padding
+        @param mask_logits: tensor with the vocabulary logits of every [MASK] position of the sentence
+        @return: List
+        """
+        mask_positions = self._mask_positions(input_ids)
+        if not len(mask_positions):
+            return []
+        if len(mask_positions) == 1:
+            return self._decode_top_tokens(mask_logits[0])
+        if self.multi_blank == 'beam':
+            return self._decode_beam(input_ids, mask_logits, mask_positions)
+        return self._decode_parallel(mask_logits)
+
+    def _mask_positions(self, input_ids: torch.Tensor) -> torch.Tensor:
+        return torch.where(input_ids == self.tokenizer.mask_token_id)[0]
+
+    def _is_phrase(self, input_ids: torch.Tensor) -> bool:
+        # phrases are suggested for a single blank only, many blanks are filled with a token each
+        return self.max_span > 1 and len(self._mask_positions(input_ids)) == 1
+
+    def _decode_phrases(self, sequences: List[Tuple[torch.Tensor, int]]) -> List[List[str]]:
+        """
+        Suggests phrases of 1 to `max_span` tokens for the [MASK] of each sentence. The [MASK] is replaced by a span
+        of every length, each span is filled from left to right with a beam search of `beam_width` hypotheses, and
+        the phrases, with their `##` word pieces merged, are ranked by their log-probability per token. Every token
+        is restricted to the allowed tokens when an allowed token mask is set. The hypotheses of all the sentences
+        and span lengths run as one padded batch per span position
+        @param sequences: list with the token ids of each sentence, without padding, and the position of its [MASK]
+        @return: List with the top k phrases of each sentence
+        """
+        mask_token_id = self.tokenizer.mask_token_id
+        beams: Dict[Tuple[int, int], List[Tuple[Tuple[int, ...], float]]] = {
+            (index, span): [((), 0.0)] for index in range(len(sequences)) for span in range(1, self.max_span + 1)
+        }
+
+        for step in range(self.max_span):
+            keys = [key for key in beams if key[1] > step]
+            rows, positions = [], []
+            for index, span in keys:
+                input_ids, position = sequences[index]
+                for token_ids, _ in beams[(index, span)]:
+                    rows.append(torch.cat([
+                        input_ids[:position],
+                        torch.tensor(token_ids, dtype=input_ids.dtype),
+                        torch.full((span - step,), mask_token_id, dtype=input_ids.dtype),
+                        input_ids[position + 1:],
+                    ]))
+                    positions.append(position + step)
+
+            input_ids = pad_sequence(rows, batch_first=True, padding_value=self.tokenizer.pad_token_id)
+            attention_mask = pad_sequence([torch.ones_like(row) for row in rows], batch_first=True)
+            logits = self._mask_logits(
+                torch.arange(len(rows)), torch.tensor(positions), input_ids=input_ids, attention_mask=attention_mask
+            )
+
+            if self._phrase_token_masks is None:
+                self._phrase_token_masks = build_phrase_token_masks(self.tokenizer, logits.shape[-1])
+            allowed = self._phrase_token_masks[0 if step == 0 else 1]
+            # the positive-constrained decoding restricts every token of a phrase to the allowed tokens
+            log_probs = self._restrict(logits.masked_fill(~allowed, float("-inf"))).log_softmax(-1)
+
+            offset = 0
+            for key in keys:
+                count = len(beams[key])
+                beams[key] = self._extend(beams[key], log_probs[offset:offset + count], self.beam_width)
+                offset += count
+
+        predictions = []
+        for index in range(len(sequences)):
+            scores = {}
+            for span in range(1, self.max_span + 1):
+                for token_ids, score in beams[(index, span)]:
+                    tokens = self.tokenizer.convert_ids_to_tokens(list(token_ids))
+                    phrase = self.tokenizer.convert_tokens_to_string(tokens)
+                    scores[phrase] = max(scores.get(phrase, float("-inf")), score / span)
+            predictions.append(sorted(scores, key=scores.get, reverse=True)[:self.top_k])
+        return predictions
+
+    def predict(self, sentence: str) -> List[Suggestion]:
         """
         Predicts the words
         @param sentence: str sentence
         @return: List
         """
         input_ids = self._tokenize(sentence)
+        if self._is_phrase(input_ids[0]):
+            return self._decode_phrases([(input_ids[0], self._mask_positions(input_ids[0]).item())])[0]
 
-        with torch.no_grad():
-            output = self.model(input_ids)
+        mask_positions = self._mask_positions(input_ids[0])
+        if not len(mask_positions):
+            return []
+        mask_logits = self._mask_logits(torch.zeros_like(mask_positions), mask_positions, input_ids=input_ids)
+
+        return self._decode(input_ids[0], mask_logits)
+
+    def predict_batch(self, sentences: List[str]) -> List[List[Suggestion]]:
+        """
+        Predicts the words for many sentences with a single forward pass, or a forward pass per
+        span position for the sentences decoded as phrases
+        @param sentences: list with str sentences
+        @return: List with the predicted words of each sentence
+        """
+        encoded = self._tokenize_batch(sentences)
+        sequences = [
+            input_ids[attention_mask.bool()]
+            for input_ids, attention_mask in zip(encoded["input_ids"], encoded["attention_mask"])
+        ]
+        predictions = [[] for _ in sentences]
+
+        phrase_rows = [row for row, input_ids in enumerate(sequences) if self._is_phrase(input_ids)]
+        if phrase_rows:
+            phrases = self._decode_phrases(
+                [(sequences[row], self._mask_positions(sequences[row]).item()) for row in phrase_rows]
+            )
+            for row, row_phrases in zip(phrase_rows, phrases):
+                predictions[row] = row_phrases
 
-        # Decode the top 3 predicted tokens for [MASK]
-        mask_token_index = torch.where(input_ids == self.tokenizer.mask_token_id)[1]
-        predicted_token_ids = output[0][0, mask_token_index].topk(3).indices.tolist()[0]
-        predicted_tokens = self.tokenizer.convert_ids_to_tokens(predicted_token_ids)
+        # sentences without a [MASK] have no suggestions and are left out of the forward pass
+        rows = [
+            row for row, input_ids in enumerate(sequences)
+            if row not in phrase_rows and len(self._mask_positions(input_ids))
+        ]
+        if rows:
+            inputs = {name: tensor[rows] for name, tensor in encoded.items()}
+            mask_rows, mask_positions = torch.where(inputs["input_ids"] == self.tokenizer.mask_token_id)
+            mask_logits = self._mask_logits(mask_rows, mask_positions, **inputs)
+            for index, row in enumerate(rows):
+                predictions[row] = self._decode(sequences[row], mask_logits[mask_rows == index])
 
-        return predicted_tokens
+        return predictions
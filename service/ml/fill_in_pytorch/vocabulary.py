@@ -0,0 +1,49 @@
+from typing import Tuple
+
+import numpy as np
+import torch
+
+
+def build_allowed_token_mask(tokenizer, lexicon: np.ndarray, threshold: float = 0.5) -> torch.Tensor:
+    """
+    Builds the mask of the vocabulary tokens the fill-in predictor may suggest: whole words
+    without punctuation or special tokens, whose precomputed sentiment is positive
+    @param tokenizer: the fill-in tokenizer
+    @param lexicon: array with the positive probability of each token id
+    @param threshold: minimum positive probability of an allowed token
+    @return: boolean tensor with one entry per token id
+    """
+    tokens = tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))
+    is_word = torch.tensor([token.isalpha() for token in tokens], dtype=torch.bool)
+    is_positive = torch.from_numpy(np.asarray(lexicon[:len(tokens)]) > threshold)
+
+    return is_word & is_positive
+
+
+def build_phrase_token_masks(tokenizer, vocab_size: int) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Builds the masks of the vocabulary tokens of a suggested phrase: alphanumeric word pieces, without
+    punctuation or special tokens, and no `##` continuation piece as the first token of the phrase
+    @param tokenizer: the fill-in tokenizer
+    @param vocab_size: the number of logits of the fill-in model
+    @return: boolean tensors with one entry per token id, for the first and for the next tokens of a phrase
+    """
+    tokens = [token or "" for token in tokenizer.convert_ids_to_tokens(list(range(vocab_size)))]
+    is_piece = torch.tensor([token.removeprefix("##").isalnum() for token in tokens], dtype=torch.bool)
+    is_continuation = torch.tensor([token.startswith("##") for token in tokens], dtype=torch.bool)
+
+    return is_piece & ~is_continuation, is_piece
+
+
+def shares_vocabulary(tokenizer, other_tokenizer) -> bool:
+    """
+    Whether two tokenizers map the same tokens to the same ids, with the same lower casing, so the token ids of
+    one are valid inputs of the model of the other
+    @param tokenizer: a tokenizer
+    @param other_tokenizer: another tokenizer
+    @return: bool
+    """
+    def lower_case(tokenizer_):
+        return tokenizer_.init_kwargs.get("do_lower_case", True)
+
+    return lower_case(tokenizer) == lower_case(other_tokenizer) and tokenizer.get_vocab() == other_tokenizer.get_vocab()
@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import List, Dict, Any
+
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.pipelines.state import PipelineState
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesces sentences submitted concurrently into a single `MLPipeline.pipeline_batch` call.
+    A batch is run as soon as it holds `max_batch_size` sentences, or `max_wait_ms` after its first sentence arrived.
+    """
+
+    def __init__(self, ml_pipeline: MLPipeline, max_batch_size: int = 16, max_wait_ms: float = 10):
+        self.ml_pipeline = ml_pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def state(self) -> PipelineState:
+        return self.ml_pipeline.state
+
+    def submit(self, sentence: str) -> Future:
+        """
+        Schedules a sentence for the next batch.
+        :param sentence: The sentence to run through the pipeline.
+        :return: A future resolved with the results of the sentence.
+        """
+        future = Future()
+        self._queue.put((sentence, future, time.monotonic()))
+        return future
+
+    def pipeline(self, sentence: str) -> List:
+        return self.submit(sentence).result()
+
+    def pipeline_batch(self, sentences: List[str]) -> List[List]:
+        futures = [self.submit(sentence) for sentence in sentences]
+        return [future.result() for future in futures]
+
+    def qsize(self) -> int:
+        """
+        :return: The number of sentences waiting for a batch.
+        """
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        :return: Counters on the batches run so far and the time their sentences waited in the queue.
+        """
+        with self._lock:
+            batches = sum(self._batch_sizes.values())
+            items = sum(size * count for size, count in self._batch_sizes.items())
+            return {
+                "batches": batches,
+                "items": items,
+                "batch_sizes": dict(self._batch_sizes),
+                "avg_batch_size": items / batches if batches else 0.0,
+                "avg_queue_wait_ms": 1000 * self._queue_wait_total / items if items else 0.0,
+                "max_queue_wait_ms": 1000 * self._queue_wait_max,
+                "queue_size": self.qsize(),
+            }
+
+    def stop(self):
+        """
+        Stops the batching thread once the already submitted sentences are processed.
+        """
+        self._stop_event.set()
+        self._thread.join()
+
+    def _collect(self) -> List:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _record(self, batch: List, started: float):
+        waits = [started - enqueued for _, _, enqueued in batch]
+        with self._lock:
+            self._batch_sizes[len(batch)] += 1
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, *waits)
+
+    def _run(self):
+        while not (self._stop_event.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if not batch:
+                continue
+
+            self._record(batch, time.monotonic())
+            sentences = [sentence for sentence, _, _ in batch]
+            try:
+                results = self.ml_pipeline.pipeline_batch(sentences)
+            except Exception as e:
+                logger.error(e)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
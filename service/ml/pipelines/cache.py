@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Dict
+
+from service.ml import __models_version__
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.state import PipelineState
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStore(ABC):
+    """
+    Shared tier of the suggestion cache, consulted on in-memory misses.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[str]]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, results: List[str]):
+        pass
+
+    @abstractmethod
+    def prune(self) -> int:
+        """
+        Deletes the expired entries, and the oldest ones beyond the size bound of the store if it has one.
+        @return: The number of deleted entries
+        """
+        pass
+
+
+class DiskCacheStore(CacheStore):
+    """
+    Stores every cached entry as a JSON file in a local directory, bounded by `ttl_seconds` and `max_entries`
+    when pruned.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[List[str]]:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, results: List[str]):
+        # write then rename, so concurrent readers never see a partial file
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(results))
+        tmp_path.replace(path)
+
+    def prune(self) -> int:
+        expired_before = time.time() - self.ttl_seconds
+        entries, deleted = [], 0
+        for path in self.directory.iterdir():
+            try:
+                modified = path.stat().st_mtime
+                # temporary files left by a crash during a write expire too
+                if modified < expired_before:
+                    path.unlink()
+                    deleted += 1
+                elif path.suffix == ".json":
+                    entries.append((modified, path))
+            except FileNotFoundError:
+                continue
+
+        if self.max_entries is not None and len(entries) > self.max_entries:
+            for _, path in sorted(entries)[:len(entries) - self.max_entries]:
+                try:
+                    path.unlink()
+                    deleted += 1
+                except FileNotFoundError:
+                    continue
+        return deleted
+
+
+class SuggestionCache:
+    """
+    In-memory LRU cache of pipeline results with size and TTL bounds, backed by an optional shared store.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 86400, store: Optional[CacheStore] = None,
+                 prune_interval_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self.prune_interval_seconds = prune_interval_seconds
+        # the first write prunes what expired before the process started
+        self._next_prune = 0.0
+        self._prune_thread: Optional[threading.Thread] = None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        results = self._store_get(key)
+        if results is not None:
+            self._put(key, results)
+            with self._lock:
+                self.store_hits += 1
+            return results
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, results: List[str]):
+        self._put(key, results)
+        if self.store:
+            try:
+                self.store.set(key, results)
+            except Exception as e:
+                logger.error(f"Failed to store cache entry: {e}")
+            self._schedule_prune()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+            }
+
+    def _put(self, key: str, results: List[str]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _schedule_prune(self):
+        # the store is pruned in the background, at most once per interval, so no request waits for it
+        with self._lock:
+            if time.monotonic() < self._next_prune:
+                return
+            self._next_prune = time.monotonic() + self.prune_interval_seconds
+            self._prune_thread = threading.Thread(target=self._prune, name="cache-prune", daemon=True)
+        self._prune_thread.start()
+
+    def _prune(self):
+        try:
+            deleted = self.store.prune()
+            logger.info(f"Pruned {deleted} cache entries from the store")
+        except Exception as e:
+            logger.error(f"Failed to prune cache store: {e}")
+
+    def _store_get(self, key: str) -> Optional[List[str]]:
+        if not self.store:
+            return None
+        try:
+            return self.store.get(key)
+        except Exception as e:
+            logger.error(f"Failed to read cache entry: {e}")
+            return None
+
+
+class CachedMLPipeline:
+    """
+    Serves pipeline results from the suggestion cache, keyed on the preprocessed sentence, the models version and
+    the fingerprint of the settings the results depend on, so bumping `__models_version__` or changing the decoding
+    or sentiment settings invalidates every entry.
+    """
+
+    def __init__(self, ml_pipeline, cache: SuggestionCache, preprocess: Preprocessor,
+                 models_version: str = __models_version__, config_fingerprint: str = ""):
+        self.ml_pipeline = ml_pipeline
+        self.cache = cache
+        self.prep = preprocess
+        self.models_version = models_version
+        self.config_fingerprint = config_fingerprint
+
+    @property
+    def state(self) -> PipelineState:
+        return self.ml_pipeline.state
+
+    def _key(self, sentence: str) -> str:
+        return f"{self.models_version}:{self.config_fingerprint}:{self.prep.transform(sentence)}"
+
+    def pipeline(self, sentence: str) -> List:
+        key = self._key(sentence)
+        results = self.cache.get(key)
+        if results is None:
+            results = self.ml_pipeline.pipeline(sentence)
+            self.cache.set(key, results)
+        return results
+
+    def pipeline_batch(self, sentences: List[str]) -> List[List]:
+        keys = [self._key(sentence) for sentence in sentences]
+        results = {key: self.cache.get(key) for key in set(keys)}
+
+        # run each missing sentence once, even if it is repeated in the batch
+        missing = {}
+        for key, sentence in zip(keys, sentences):
+            if results[key] is None:
+                missing.setdefault(key, sentence)
+        if missing:
+            for key, result in zip(missing, self.ml_pipeline.pipeline_batch(list(missing.values()))):
+                results[key] = result
+                self.cache.set(key, result)
+
+        return [results[key] for key in keys]
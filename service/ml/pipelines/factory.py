@@ -1,32 +1,171 @@
+from service.ml.config import MLConfig, config_fingerprint, ml_config
+from service.ml.fill_in_onnx.loader import load_onnx_session, load_onnx_tokenizer
+from service.ml.fill_in_onnx.predictor.predictor import FillInOnnxPredictor
 from service.ml.fill_in_pytorch.loader import load_bert_tokenizer, load_bert_model
 from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
 from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.fill_in_pytorch.vocabulary import build_allowed_token_mask, shares_vocabulary
+from service.ml.pipelines.batcher import MicroBatcher
+from service.ml.pipelines.cache import CachedMLPipeline, CacheStore, DiskCacheStore, SuggestionCache
+from service.ml.pipelines.lazy import LazyMLPipeline
 from service.ml.pipelines.pipeline import MLPipeline
-from service.ml.sentiment_analysis_pytorch.loader import load_bert_pipeline
-from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.sentiment_analysis_onnx.loader import load_onnx_labels
+from service.ml.sentiment_analysis_onnx.predictor.predictor import SentimentAnalysisOnnxPredictor
+from service.ml.sentiment_analysis_pytorch.loader import load_bert_classifier, load_bert_pipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import (
+    SentimentAnalysisContextPredictor, SentimentAnalysisTokenIdsPredictor, SentimentAnalysisTorchPredictor
+)
+from service.ml.sentiment_lexicon.loader import load_sentiment_lexicon
+from service.ml.sentiment_lexicon.predictor.predictor import SentimentLexiconPredictor
+
+SENTIMENT_MODES = ('pipeline', 'lexicon', 'token_ids', 'context')
+# the ONNX backend exports the sentiment classifier only, the other modes call the PyTorch model directly
+ONNX_SENTIMENT_MODES = ('pipeline', 'lexicon')
+# the ONNX fill-in predictor fills the first blank from its single session run, it has no beam search
+ONNX_MULTI_BLANK_MODES = ('parallel',)
 
 
 def create_preprocess() -> Preprocessor:
     return Preprocessor()
 
 
-def create_fill_in_pipeline(model_name="bert-large-uncased") -> FillInTorchPredictor:
-    model = load_bert_model(model_name)
+def create_fill_in_pipeline(model_name="bert-large-uncased", top_k=3, lexicon=None, quantize=False,
+                            multi_blank='parallel', beam_width=8, max_span=1) -> FillInTorchPredictor:
+    model = load_bert_model(model_name, quantize=quantize)
     tokenizer = load_bert_tokenizer(model_name)
+    allowed_token_mask = build_allowed_token_mask(tokenizer, lexicon) if lexicon is not None else None
+
+    return FillInTorchPredictor(
+        model=model, tokenizer=tokenizer, top_k=top_k, allowed_token_mask=allowed_token_mask,
+        multi_blank=multi_blank, beam_width=beam_width, max_span=max_span
+    )
+
 
-    return FillInTorchPredictor(model=model, tokenizer=tokenizer)
+def create_fill_in_onnx_pipeline(model_dir: str, top_k=3, lexicon=None) -> FillInOnnxPredictor:
+    session = load_onnx_session(model_dir)
+    tokenizer = load_onnx_tokenizer(model_dir)
+    allowed_token_mask = build_allowed_token_mask(tokenizer, lexicon).numpy() if lexicon is not None else None
+
+    return FillInOnnxPredictor(session=session, tokenizer=tokenizer, top_k=top_k, allowed_token_mask=allowed_token_mask)
 
 
 def create_sent_anal_pipeline(model_name="distilbert-base-uncased-finetuned-sst-2-english",
-                              task="sentiment-analysis") -> SentimentAnalysisTorchPredictor:
-    pipeline = load_bert_pipeline(model=model_name, task=task)
+                              task="sentiment-analysis", quantize=False) -> SentimentAnalysisTorchPredictor:
+    pipeline = load_bert_pipeline(model=model_name, task=task, quantize=quantize)
 
     return SentimentAnalysisTorchPredictor(pipeline=pipeline)
 
 
-def create_ml_pipeline() -> MLPipeline:
+def create_sent_anal_token_ids_pipeline(fill_in_tokenizer,
+                                        model_name="distilbert-base-uncased-finetuned-sst-2-english",
+                                        quantize=False) -> SentimentAnalysisTokenIdsPredictor:
+    model, tokenizer = load_bert_classifier(model_name, quantize=quantize)
+    if not shares_vocabulary(fill_in_tokenizer, tokenizer):
+        raise ValueError(f"{model_name} does not share the vocabulary of the fill-in model, "
+                         f"use ML_SENTIMENT_MODE=pipeline")
+
+    return SentimentAnalysisTokenIdsPredictor(model=model, tokenizer=tokenizer)
+
+
+def create_sent_anal_context_pipeline(model_name="distilbert-base-uncased-finetuned-sst-2-english", threshold=0.5,
+                                      temperature=1.0, quantize=False) -> SentimentAnalysisContextPredictor:
+    model, tokenizer = load_bert_classifier(model_name, quantize=quantize)
+
+    return SentimentAnalysisContextPredictor(
+        model=model, tokenizer=tokenizer, threshold=threshold, temperature=temperature
+    )
+
+
+def create_sent_anal_onnx_pipeline(model_dir: str) -> SentimentAnalysisOnnxPredictor:
+    session = load_onnx_session(model_dir)
+    tokenizer = load_onnx_tokenizer(model_dir)
+
+    return SentimentAnalysisOnnxPredictor(session=session, tokenizer=tokenizer, labels=load_onnx_labels(model_dir))
+
+
+def create_sent_anal_lexicon(lexicon, tokenizer) -> SentimentLexiconPredictor:
+    return SentimentLexiconPredictor(lexicon=lexicon, tokenizer=tokenizer)
+
+
+def create_ml_pipeline(config: MLConfig = None) -> MLPipeline:
+    config = config or ml_config()
+    if config.sentiment_mode not in SENTIMENT_MODES:
+        raise ValueError(f"ML_SENTIMENT_MODE must be one of {SENTIMENT_MODES}, got {config.sentiment_mode}")
+    onnx = config.backend == 'onnx'
+    if onnx and config.sentiment_mode not in ONNX_SENTIMENT_MODES:
+        raise ValueError(f"ML_SENTIMENT_MODE={config.sentiment_mode} is not supported by ML_BACKEND=onnx, "
+                         f"use one of {ONNX_SENTIMENT_MODES}")
+    if onnx and config.fill_in_multi_blank not in ONNX_MULTI_BLANK_MODES:
+        raise ValueError(f"ML_FILL_IN_MULTI_BLANK={config.fill_in_multi_blank} is not supported by ML_BACKEND=onnx, "
+                         f"use one of {ONNX_MULTI_BLANK_MODES}")
+    if onnx and config.fill_in_max_span > 1:
+        raise ValueError(f"ML_FILL_IN_MAX_SPAN={config.fill_in_max_span} is not supported by ML_BACKEND=onnx, "
+                         f"its fill-in suggests single tokens only")
+    constrained = config.fill_in_decoding == 'positive'
+
+    lexicon = None
+    if config.sentiment_mode == 'lexicon' or constrained:
+        lexicon = load_sentiment_lexicon(config.sentiment_lexicon_path)
+
+    if onnx:
+        fill_in = create_fill_in_onnx_pipeline(
+            config.onnx_fill_in_path, top_k=config.fill_in_top_k, lexicon=lexicon if constrained else None
+        )
+    else:
+        fill_in = create_fill_in_pipeline(
+            top_k=config.fill_in_top_k, lexicon=lexicon if constrained else None, quantize=config.quantize,
+            multi_blank=config.fill_in_multi_blank, beam_width=config.fill_in_beam_width,
+            max_span=config.fill_in_max_span
+        )
+
+    # with positive-constrained decoding, the lexicon filter is a cheap check of the suggested tokens
+    if config.sentiment_mode == 'lexicon':
+        sent_anal = create_sent_anal_lexicon(lexicon, tokenizer=fill_in.tokenizer)
+    elif onnx:
+        sent_anal = create_sent_anal_onnx_pipeline(config.onnx_sent_anal_path)
+    elif config.sentiment_mode == 'token_ids':
+        sent_anal = create_sent_anal_token_ids_pipeline(fill_in.tokenizer, quantize=config.quantize)
+    elif config.sentiment_mode == 'context':
+        sent_anal = create_sent_anal_context_pipeline(
+            threshold=config.sentiment_threshold, temperature=config.sentiment_temperature, quantize=config.quantize
+        )
+    else:
+        sent_anal = create_sent_anal_pipeline(quantize=config.quantize)
+
     return MLPipeline(
-        fill_in=create_fill_in_pipeline(),
-        sent_anal=create_sent_anal_pipeline(),
+        fill_in=fill_in,
+        sent_anal=sent_anal,
         preprocess=create_preprocess()
     )
+
+
+def create_lazy_ml_pipeline(config: MLConfig = None) -> LazyMLPipeline:
+    config = config or ml_config()
+    return LazyMLPipeline(loader=lambda: create_ml_pipeline(config))
+
+
+def create_micro_batcher(ml_pipeline: MLPipeline, config: MLConfig = None) -> MicroBatcher:
+    config = config or ml_config()
+    return MicroBatcher(
+        ml_pipeline=ml_pipeline,
+        max_batch_size=config.batcher_max_batch_size,
+        max_wait_ms=config.batcher_max_wait_ms
+    )
+
+
+def create_cached_pipeline(ml_pipeline, store: CacheStore = None, config: MLConfig = None) -> CachedMLPipeline:
+    config = config or ml_config()
+    if store is None and config.cache_store == 'disk':
+        store = DiskCacheStore(
+            directory=config.cache_disk_path, ttl_seconds=config.cache_ttl_seconds,
+            max_entries=config.cache_disk_max_entries
+        )
+
+    cache = SuggestionCache(
+        max_size=config.cache_max_size, ttl_seconds=config.cache_ttl_seconds, store=store,
+        prune_interval_seconds=config.cache_prune_interval_seconds
+    )
+    return CachedMLPipeline(
+        ml_pipeline=ml_pipeline, cache=cache, preprocess=create_preprocess(),
+        config_fingerprint=config_fingerprint(config)
+    )
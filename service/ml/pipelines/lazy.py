@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.pipelines.state import PipelineState
+from service.utils.metrics import MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SENTENCE = "have a <blank> day"
+
+
+class LazyMLPipeline:
+    """
+    Defers loading the models of an `MLPipeline` until its first use, or to a background thread with `start`,
+    and reports whether they are still loading. A dummy inference warms the models up before they are ready.
+    """
+
+    def __init__(self, loader: Callable[[], MLPipeline], warmup_sentence: str = WARMUP_SENTENCE):
+        self.loader = loader
+        self.warmup_sentence = warmup_sentence
+        self.state = PipelineState.LOADING
+
+        self._ml_pipeline = None
+        self._lock = threading.Lock()
+
+    def load(self) -> MLPipeline:
+        """
+        Loads and warms up the pipeline, once. Concurrent callers wait for the loading caller.
+        :return: The loaded pipeline.
+        """
+        with self._lock:
+            if self._ml_pipeline is None:
+                self.state = PipelineState.LOADING
+                started = time.monotonic()
+                try:
+                    logger.info("Loading the ML pipeline")
+                    ml_pipeline = self.loader()
+                    ml_pipeline.pipeline_batch([self.warmup_sentence])
+                except Exception:
+                    self.state = PipelineState.FAILED
+                    raise
+                self._ml_pipeline = ml_pipeline
+                self.state = PipelineState.READY
+                MODEL_LOAD_SECONDS.set(time.monotonic() - started)
+                logger.info("The ML pipeline is ready")
+        return self._ml_pipeline
+
+    def start(self) -> threading.Thread:
+        """
+        Loads the pipeline in a background thread.
+        :return: The loading thread.
+        """
+        thread = threading.Thread(target=self._load_in_background, name="ml-pipeline-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def pipeline(self, sentence: str) -> List:
+        return self.load().pipeline(sentence)
+
+    def pipeline_batch(self, sentences: List[str]) -> List[List]:
+        return self.load().pipeline_batch(sentences)
+
+    def _load_in_background(self):
+        try:
+            self.load()
+        except Exception as e:
+            logger.exception(e)
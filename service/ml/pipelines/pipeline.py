@@ -3,7 +3,10 @@ from typing import List
 
 from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
 from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.state import PipelineState
 from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.suggestions import suggestion_text
+from service.utils.metrics import PIPELINE_STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +20,37 @@ class MLPipeline:
         self.sent_anal = sent_anal
         self.prep = preprocess
 
+    @property
+    def state(self) -> PipelineState:
+        return PipelineState.READY
+
     def pipeline(self, sentence: str) -> List:
-        pre_sent = self.prep.transform(sentence)
+        with PIPELINE_STAGE_SECONDS.labels('preprocess').time():
+            pre_sent = self.prep.transform(sentence)
         logger.debug(f"Preprocess step from {sentence} to {pre_sent}")
 
-        print("pre_sent", pre_sent)
-        suggestions = self.fill_in.predict(pre_sent)
+        with PIPELINE_STAGE_SECONDS.labels('fill_in').time():
+            suggestions = self.fill_in.predict(pre_sent)
         logger.debug(f"Fill in step from {pre_sent} to {suggestions}")
 
-        return self.sent_anal.predict(suggestions) if suggestions else []
+        if not suggestions:
+            return []
+        with PIPELINE_STAGE_SECONDS.labels('sentiment').time():
+            positive = self.sent_anal.predict(suggestions, pre_sent)
+        return [suggestion_text(suggestion) for suggestion in positive]
+
+    def pipeline_batch(self, sentences: List[str]) -> List[List]:
+        if not sentences:
+            return []
+
+        with PIPELINE_STAGE_SECONDS.labels('preprocess').time():
+            pre_sents = [self.prep.transform(sentence) for sentence in sentences]
+        logger.debug(f"Preprocess step from {sentences} to {pre_sents}")
+
+        with PIPELINE_STAGE_SECONDS.labels('fill_in').time():
+            suggestions = self.fill_in.predict_batch(pre_sents)
+        logger.debug(f"Fill in step from {pre_sents} to {suggestions}")
+
+        with PIPELINE_STAGE_SECONDS.labels('sentiment').time():
+            positive = self.sent_anal.predict_batch(suggestions, pre_sents)
+        return [[suggestion_text(suggestion) for suggestion in group] for group in positive]
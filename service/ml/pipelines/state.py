@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PipelineState(Enum):
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
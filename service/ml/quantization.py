@@ -0,0 +1,62 @@
+from typing import List, Dict
+
+import torch
+
+# fixed evaluation set of the quantization accuracy check
+CHECK_SENTENCES = [
+    "have a [MASK] day",
+    "the application was [MASK]",
+    "it is so [MASK] to see you",
+    "thank you for the [MASK] service",
+    "the movie was really [MASK]",
+    "what a [MASK] idea",
+    "i feel [MASK] today",
+    "the food at this place is [MASK]",
+    "she gave a [MASK] speech",
+    "we had a [MASK] time at the party",
+]
+
+
+def quantize_model(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Applies dynamic int8 quantization to the Linear layers of a model: their weights are stored as int8
+    and the activations are quantized on the fly, which cuts the memory and the CPU time of inference
+    @param model: the fp32 model
+    @return: a quantized copy of the model
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def fill_in_agreement(reference, candidate, sentences: List[str] = None) -> Dict[str, float]:
+    """
+    Compares the suggestions of two fill-in predictors on a fixed sentence set
+    @param reference: the fp32 predictor
+    @param candidate: the quantized predictor
+    @param sentences: the sentences to compare on, CHECK_SENTENCES by default
+    @return: the mean overlap of the top-k suggestions and the rate of identical top-1 suggestions
+    """
+    sentences = sentences or CHECK_SENTENCES
+    reference_suggestions = reference.predict_batch(sentences)
+    candidate_suggestions = candidate.predict_batch(sentences)
+
+    overlap, top_1 = 0.0, 0
+    for expected, actual in zip(reference_suggestions, candidate_suggestions):
+        overlap += len(set(expected) & set(actual)) / max(len(expected), 1)
+        top_1 += expected[:1] == actual[:1]
+
+    return {"top_k_agreement": overlap / len(sentences), "top_1_agreement": top_1 / len(sentences)}
+
+
+def sentiment_agreement(reference, candidate, suggestions: List[str]) -> Dict[str, float]:
+    """
+    Compares the positive suggestions kept by two sentiment predictors
+    @param reference: the fp32 predictor
+    @param candidate: the quantized predictor
+    @param suggestions: the suggestions to classify
+    @return: the rate of suggestions both predictors classify the same way
+    """
+    expected = set(reference.predict_batch([suggestions])[0])
+    actual = set(candidate.predict_batch([suggestions])[0])
+    same = sum((suggestion in expected) == (suggestion in actual) for suggestion in suggestions)
+
+    return {"label_agreement": same / max(len(suggestions), 1)}
@@ -0,0 +1,17 @@
+import torch
+
+from service.ml.fill_in_onnx.export import export_onnx_model
+
+
+def export_sentiment_model(model: torch.nn.Module, tokenizer, model_dir: str):
+    """
+    Exports the DistilBERT sentiment classifier to ONNX
+    @param model: the sequence classification model
+    @param tokenizer: the sentiment tokenizer
+    @param model_dir: destination directory
+    """
+    export_onnx_model(
+        model, tokenizer, model_dir,
+        input_names=("input_ids", "attention_mask"),
+        logits_axes={0: "batch"}
+    )
@@ -0,0 +1,12 @@
+from typing import Dict
+
+from transformers import AutoConfig
+
+
+def load_onnx_labels(model_dir: str) -> Dict[int, str]:
+    """
+    Loads the labels of an exported classifier from the config saved next to it
+    @param model_dir: directory of the exported model
+    @return: mapping from logit index to label
+    """
+    return AutoConfig.from_pretrained(model_dir).id2label
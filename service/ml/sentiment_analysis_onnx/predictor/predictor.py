@@ -0,0 +1,43 @@
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from service.ml.suggestions import Suggestion, suggestion_text
+
+
+class SentimentAnalysisOnnxPredictor:
+    def __init__(self, session, tokenizer, labels: Dict[int, str]):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.labels = labels
+        self._input_names = [model_input.name for model_input in session.get_inputs()]
+
+    def _labels(self, suggestions: List[str]) -> List[str]:
+        encoded = self.tokenizer(suggestions, padding=True, return_tensors="np")
+        inputs = {name: encoded[name].astype(np.int64) for name in self._input_names}
+        logits = self.session.run(["logits"], inputs)[0]
+        return [self.labels[label_id] for label_id in logits.argmax(axis=-1).tolist()]
+
+    def predict(self, suggestions: List[Suggestion], sentence: Optional[str] = None) -> List:
+        """
+        filter suggestions based on sentiment
+        @param suggestions: list with suggestions to be filtered
+        @param sentence: the preprocessed sentence, unused as the suggestions are classified on their own
+        @return: List
+        """
+        return self.predict_batch([suggestions])[0]
+
+    def predict_batch(self, suggestions: List[List[Suggestion]], sentences: Optional[List[str]] = None) -> List[List]:
+        """
+        filter the suggestions of many sentences with a single session run
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: the preprocessed sentences, unused as the suggestions are classified on their own
+        @return: List with the positive suggestions of each sentence
+        """
+        flat_suggestions = [suggestion_text(suggestion) for group in suggestions for suggestion in group]
+        if not flat_suggestions:
+            return [[] for _ in suggestions]
+
+        is_positive = iter([label == 'POSITIVE' for label in self._labels(flat_suggestions)])
+
+        return [[suggestion for suggestion in group if next(is_positive)] for group in suggestions]
@@ -1,11 +1,32 @@
-from transformers import pipeline
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
 
+from service.ml.quantization import quantize_model
 
-def load_bert_pipeline(model: str, task: str):
+
+def load_bert_pipeline(model: str, task: str, quantize: bool = False):
     """
     Load the sentiment analysis pipelin
     :param model: model name
     :param task: task name
+    :param quantize: whether to apply dynamic int8 quantization to the Linear layers of the model
     :return:
     """
-    return pipeline(task, model=model)
+    bert_pipeline = pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model, use_fast=True))
+    if quantize:
+        bert_pipeline.model = quantize_model(bert_pipeline.model)
+
+    return bert_pipeline
+
+
+def load_bert_classifier(model: str, quantize: bool = False):
+    """
+    Load the sentiment analysis model and its fast tokenizer, without the pipeline wrapper
+    :param model: model name
+    :param quantize: whether to apply dynamic int8 quantization to the Linear layers of the model
+    :return: the model and the tokenizer
+    """
+    classifier = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    if quantize:
+        classifier = quantize_model(classifier)
+
+    return classifier, AutoTokenizer.from_pretrained(model, use_fast=True)
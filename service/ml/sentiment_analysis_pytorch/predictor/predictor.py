@@ -1,20 +1,170 @@
-from typing import List
+from itertools import chain
+from typing import List, Optional
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+from service.ml.suggestions import Suggestion, fill_in_sentence, suggestion_text
 
 
 class SentimentAnalysisTorchPredictor:
     def __init__(self, pipeline):
         self.pipeline = pipeline
 
-    def predict(self, suggestions: List[str]) -> List:
+    def predict(self, suggestions: List[Suggestion], sentence: Optional[str] = None) -> List:
         """
         filter suggestions based on sentiment
         @param suggestions: list with suggestions to be filtered
+        @param sentence: the preprocessed sentence, unused as the suggestions are classified on their own
         @return: List
         """
         positive_suggestions = []
         for suggestion in suggestions:
-            sentiment = self.pipeline(suggestion)[0]
+            sentiment = self.pipeline(suggestion_text(suggestion))[0]
             if sentiment['label'] == 'POSITIVE':
                 positive_suggestions.append(suggestion)
 
         return positive_suggestions
+
+    def predict_batch(self, suggestions: List[List[Suggestion]], sentences: Optional[List[str]] = None) -> List[List]:
+        """
+        filter the suggestions of many sentences with a single sentiment model call
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: the preprocessed sentences, unused as the suggestions are classified on their own
+        @return: List with the positive suggestions of each sentence
+        """
+        flat_suggestions = [suggestion_text(suggestion) for group in suggestions for suggestion in group]
+        if not flat_suggestions:
+            return [[] for _ in suggestions]
+
+        sentiments = self.pipeline(flat_suggestions, batch_size=len(flat_suggestions))
+        is_positive = iter([sentiment['label'] == 'POSITIVE' for sentiment in sentiments])
+
+        return [[suggestion for suggestion in group if next(is_positive)] for group in suggestions]
+
+
+class SentimentAnalysisTokenIdsPredictor:
+    """
+    Classifies the suggestions from the ids of their word pieces, looked up in the vocabulary that the fill-in and
+    the sentiment models share, instead of tokenizing their strings again in the sentiment pipeline
+    """
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.positive_label_id = model.config.label2id['POSITIVE']
+        self.separator_ids = tokenizer.encode(suggestion_text(("", "")), add_special_tokens=False)
+
+    def _token_ids(self, suggestion: Suggestion) -> List[int]:
+        """
+        builds the classifier input ids of a suggestion. A whole word gets the same ids as tokenizing its text, but a
+        `##` continuation piece keeps its own id, where tokenizing its text would split off the `#` characters
+        @param suggestion: the suggestion of the fill-in predictor
+        @return: List
+        """
+        token_ids = [self.tokenizer.cls_token_id]
+        for index, part in enumerate([suggestion] if isinstance(suggestion, str) else suggestion):
+            if index:
+                token_ids.extend(self.separator_ids)
+            # a single word piece is a vocabulary lookup, only phrases of many word pieces are tokenized
+            token_id = self.tokenizer.convert_tokens_to_ids(part)
+            if token_id == self.tokenizer.unk_token_id:
+                token_ids.extend(self.tokenizer.encode(part, add_special_tokens=False))
+            else:
+                token_ids.append(token_id)
+        token_ids.append(self.tokenizer.sep_token_id)
+        return token_ids
+
+    def _is_positive(self, suggestions: List[Suggestion]) -> List[bool]:
+        rows = [torch.tensor(self._token_ids(suggestion)) for suggestion in suggestions]
+        input_ids = pad_sequence(rows, batch_first=True, padding_value=self.tokenizer.pad_token_id)
+        attention_mask = pad_sequence([torch.ones_like(row) for row in rows], batch_first=True)
+
+        with torch.no_grad():
+            logits = self.model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+        return (logits.argmax(-1) == self.positive_label_id).tolist()
+
+    def predict(self, suggestions: List[Suggestion], sentence: Optional[str] = None) -> List:
+        """
+        filter suggestions based on sentiment
+        @param suggestions: list with suggestions to be filtered
+        @param sentence: the preprocessed sentence, unused as the suggestions are classified on their own
+        @return: List
+        """
+        return self.predict_batch([suggestions])[0]
+
+    def predict_batch(self, suggestions: List[List[Suggestion]], sentences: Optional[List[str]] = None) -> List[List]:
+        """
+        filter the suggestions of many sentences with a single forward pass
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: the preprocessed sentences, unused as the suggestions are classified on their own
+        @return: List with the positive suggestions of each sentence
+        """
+        flat_suggestions = list(chain.from_iterable(suggestions))
+        if not flat_suggestions:
+            return [[] for _ in suggestions]
+
+        is_positive = iter(self._is_positive(flat_suggestions))
+
+        return [[suggestion for suggestion in group if next(is_positive)] for group in suggestions]
+
+
+class SentimentAnalysisContextPredictor:
+    """
+    Scores each suggestion within its sentence rather than on its own, so the classifier sees "a sick day"
+    instead of "sick". The filled sentences of a call run as one padded batch through the classifier
+    """
+
+    def __init__(self, model, tokenizer, threshold: float = 0.5, temperature: float = 1.0):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.threshold = threshold
+        self.temperature = temperature
+        self.positive_label_id = model.config.label2id['POSITIVE']
+
+    def _scores(self, sentences: List[str]) -> List[float]:
+        encoded = self.tokenizer(sentences, padding=True, return_tensors="pt")
+        with torch.no_grad():
+            logits = self.model(**encoded)[0]
+
+        # the temperature, not fitted here, softens or sharpens the positive probability compared with the threshold
+        return (logits / self.temperature).softmax(-1)[:, self.positive_label_id].tolist()
+
+    def score_batch(self, suggestions: List[List[Suggestion]], sentences: List[str]) -> List[List[float]]:
+        """
+        scores the suggestions of many sentences with a single forward pass
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: list with the preprocessed sentences, with a [MASK] per blank
+        @return: List with the positive probability of each suggestion in its sentence
+        """
+        filled = [
+            fill_in_sentence(sentence, suggestion)
+            for group, sentence in zip(suggestions, sentences) for suggestion in group
+        ]
+        scores = iter(self._scores(filled) if filled else [])
+
+        return [[next(scores) for _ in group] for group in suggestions]
+
+    def predict(self, suggestions: List[Suggestion], sentence: Optional[str] = None) -> List:
+        """
+        filter suggestions based on the sentiment of the sentence they fill
+        @param suggestions: list with suggestions to be filtered
+        @param sentence: the preprocessed sentence, with a [MASK] per blank, required
+        @return: List
+        """
+        return self.predict_batch([suggestions], None if sentence is None else [sentence])[0]
+
+    def predict_batch(self, suggestions: List[List[Suggestion]], sentences: Optional[List[str]] = None) -> List[List]:
+        """
+        filter the suggestions of many sentences based on the sentiment of the sentences they fill
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: list with the preprocessed sentences, with a [MASK] per blank, required
+        @return: List with the positive suggestions of each sentence
+        """
+        if sentences is None:
+            raise ValueError("The context sentiment predictor needs the sentences of the suggestions")
+        return [
+            [suggestion for suggestion, score in zip(group, scores) if score > self.threshold]
+            for group, scores in zip(suggestions, self.score_batch(suggestions, sentences))
+        ]
@@ -0,0 +1,39 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def build_sentiment_lexicon(pipeline, tokenizer, batch_size: int = 256) -> np.ndarray:
+    """
+    Classifies every token of the fill-in tokenizer vocabulary with the sentiment pipeline
+    @param pipeline: the sentiment analysis pipeline
+    @param tokenizer: the fill-in tokenizer whose vocabulary is classified
+    @param batch_size: number of tokens per sentiment model call
+    @return: array with the positive probability of each token id
+    """
+    tokens = tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))
+    lexicon = np.zeros(len(tokens), dtype=np.float32)
+
+    for start in range(0, len(tokens), batch_size):
+        batch = tokens[start:start + batch_size]
+        sentiments = pipeline(batch, batch_size=len(batch))
+        lexicon[start:start + len(batch)] = [
+            sentiment['score'] if sentiment['label'] == 'POSITIVE' else 1 - sentiment['score']
+            for sentiment in sentiments
+        ]
+        logger.info(f"Classified {start + len(batch)}/{len(tokens)} vocabulary tokens")
+
+    return lexicon
+
+
+def save_sentiment_lexicon(lexicon: np.ndarray, path: str):
+    """
+    Persists the lexicon as a .npy file
+    @param lexicon: array with the positive probability of each token id
+    @param path: destination file
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, lexicon)
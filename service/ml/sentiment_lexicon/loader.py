@@ -0,0 +1,10 @@
+import numpy as np
+
+
+def load_sentiment_lexicon(path: str) -> np.ndarray:
+    """
+    Loads the precomputed sentiment lexicon as a read-only memory-mapped array
+    @param path: the .npy lexicon file
+    @return: array with the positive probability of each token id
+    """
+    return np.load(path, mmap_mode='r')
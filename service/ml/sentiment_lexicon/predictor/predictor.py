@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+import numpy as np
+
+from service.ml.suggestions import Suggestion
+
+
+class SentimentLexiconPredictor:
+    def __init__(self, lexicon: np.ndarray, tokenizer, threshold: float = 0.5):
+        self.lexicon = lexicon
+        self.tokenizer = tokenizer
+        self.threshold = threshold
+
+    def _score(self, phrase: str) -> float:
+        # a phrase of many tokens scores the mean positive probability of its tokens
+        token_id = self.tokenizer.convert_tokens_to_ids(phrase)
+        if token_id != self.tokenizer.unk_token_id:
+            return self.lexicon[token_id]
+        return float(np.mean(self.lexicon[self.tokenizer.convert_tokens_to_ids(self.tokenizer.tokenize(phrase))]))
+
+    def _is_positive(self, suggestion: Suggestion) -> bool:
+        # a suggestion for many blanks is positive when the suggestion of every blank is
+        phrases = [suggestion] if isinstance(suggestion, str) else list(suggestion)
+        return all(self._score(phrase) > self.threshold for phrase in phrases)
+
+    def predict(self, suggestions: List[Suggestion], sentence: Optional[str] = None) -> List:
+        """
+        filter suggestions based on the precomputed vocabulary sentiment
+        @param suggestions: list with suggestions to be filtered
+        @param sentence: the preprocessed sentence, unused as the suggestions are looked up on their own
+        @return: List
+        """
+        return [suggestion for suggestion in suggestions if self._is_positive(suggestion)]
+
+    def predict_batch(self, suggestions: List[List[Suggestion]], sentences: Optional[List[str]] = None) -> List[List]:
+        """
+        filter the suggestions of many sentences based on the precomputed vocabulary sentiment
+        @param suggestions: list with the suggestions of each sentence
+        @param sentences: the preprocessed sentences, unused as the suggestions are looked up on their own
+        @return: List with the positive suggestions of each sentence
+        """
+        return [self.predict(group) for group in suggestions]
@@ -0,0 +1,29 @@
+from typing import Tuple, Union
+
+# a suggestion of a sentence with a single blank is a token, with many blanks a tuple of a token per blank
+Suggestion = Union[str, Tuple[str, ...]]
+
+
+def suggestion_text(suggestion: Suggestion) -> str:
+    """
+    @param suggestion: A suggestion of the fill-in predictor
+    @return: The suggestion as a single string, its tokens separated by commas for many blanks
+    """
+    return suggestion if isinstance(suggestion, str) else ", ".join(suggestion)
+
+
+def fill_in_sentence(sentence: str, suggestion: Suggestion, mask_token: str = "[MASK]") -> str:
+    """
+    Substitutes a suggestion into the blanks of a sentence, a `##` word piece continuing the word before its blank
+    @param sentence: The preprocessed sentence, with a mask token per blank
+    @param suggestion: A suggestion of the fill-in predictor for the sentence
+    @param mask_token: The mask token of the blanks
+    @return: The filled sentence
+    """
+    for part in [suggestion] if isinstance(suggestion, str) else suggestion:
+        if part.startswith("##"):
+            before, _, after = sentence.partition(mask_token)
+            sentence = before.rstrip() + part[2:] + after
+        else:
+            sentence = sentence.replace(mask_token, part, 1)
+    return sentence
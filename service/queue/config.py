@@ -0,0 +1,19 @@
+import os
+
+
+class QueueConfig:
+    """
+    Configuration for the job queue between the API and the workers.
+    """
+    backend = os.getenv('QUEUE_BACKEND', 'postgres')
+    poll_interval = float(os.getenv('QUEUE_POLL_INTERVAL', '0.5'))
+    # seconds after which a RUNNING request of the postgres backend is claimed again, its worker presumed dead
+    lease_seconds = float(os.getenv('QUEUE_LEASE_SECONDS', '600'))
+
+
+def queue_config() -> QueueConfig:
+    """
+    Factory that creates the QueueConfig instance.
+    :return: A job queue configuration object.
+    """
+    return QueueConfig()
@@ -0,0 +1,19 @@
+from sqlalchemy.engine import Engine
+
+from service.queue.config import QueueConfig, queue_config
+from service.queue.job_queue import JobQueue, InMemoryJobQueue, PostgresJobQueue
+
+
+def create_job_queue(db_engine: Engine, config: QueueConfig = None) -> JobQueue:
+    """
+    Factory method for the job queue.
+    :param db_engine: The SQLAlchemy engine, used by the Postgres backend.
+    :param config: The queue configuration.
+    :return: The generated job queue.
+    """
+    config = config or queue_config()
+    if config.backend == 'memory':
+        return InMemoryJobQueue()
+    return PostgresJobQueue(
+        db_engine=db_engine, poll_interval=config.poll_interval, lease_seconds=config.lease_seconds
+    )
@@ -0,0 +1,135 @@
+import logging
+import queue
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from service.data_model.status import Status
+from service.db.schema import NLPModelDBModel
+from service.utils.metrics import REQUESTS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue(ABC):
+    # whether `get` claims the requests, moving them to RUNNING, or leaves the claim to the worker
+    claims_requests = False
+
+    @abstractmethod
+    def put(self, request_id: str):
+        """
+        Enqueues a stored request for the workers.
+        :param request_id: The id of the SUBMITTED request.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, max_items: int = 1, timeout: Optional[float] = None) -> List[str]:
+        """
+        Waits for pending requests.
+        :param max_items: Maximum number of request ids to return.
+        :param timeout: Seconds to wait for the first request, None waits forever.
+        :return: The pending request ids, empty if the timeout expired.
+        """
+        pass
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """
+        :return: The number of pending requests.
+        """
+        pass
+
+
+class InMemoryJobQueue(JobQueue):
+    """
+    Job queue living in the API process, consumed by a worker thread of the same process.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, request_id: str):
+        self._queue.put(request_id)
+
+    def get(self, max_items: int = 1, timeout: Optional[float] = None) -> List[str]:
+        try:
+            request_ids = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(request_ids) < max_items:
+            try:
+                request_ids.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return request_ids
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class PostgresJobQueue(JobQueue):
+    """
+    Job queue backed by the nlp_table itself: every SUBMITTED row is a pending job, so no broker is needed.
+    Workers poll for the oldest SUBMITTED rows and claim them (SUBMITTED -> RUNNING) in the same UPDATE, skipping
+    the rows locked by the claims of concurrent workers, so no two workers get the same request. A RUNNING request
+    not updated for `lease_seconds`, e.g. because its worker crashed, is pending again.
+    """
+    claims_requests = True
+
+    def __init__(self, db_engine: Engine, poll_interval: float = 0.5, lease_seconds: float = 600):
+        self.db_engine = db_engine
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+
+    def put(self, request_id: str):
+        # storing the SUBMITTED request already enqueued it
+        pass
+
+    def get(self, max_items: int = 1, timeout: Optional[float] = None) -> List[str]:
+        pending = (
+            select(NLPModelDBModel.id)
+            .where(or_(
+                NLPModelDBModel.status == Status.SUBMITTED.value,
+                # the claim of a crashed worker expires, `updated` being set by the claim
+                and_(
+                    NLPModelDBModel.status == Status.RUNNING.value,
+                    NLPModelDBModel.updated < func.now() - timedelta(seconds=self.lease_seconds)
+                )
+            ))
+            .order_by(NLPModelDBModel.requested_at)
+            .limit(max_items)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(NLPModelDBModel)
+            .where(NLPModelDBModel.id.in_(pending))
+            .values(status=Status.RUNNING.value, updated=func.now())
+            .returning(NLPModelDBModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with Session(self.db_engine) as session:
+                request_ids = list(session.scalars(stmt))
+                session.commit()
+            if request_ids:
+                REQUESTS_TOTAL.labels(Status.RUNNING.value).inc(len(request_ids))
+                return request_ids
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+            time.sleep(self.poll_interval)
+
+    def qsize(self) -> int:
+        with Session(self.db_engine) as session:
+            return session.scalar(
+                select(func.count()).select_from(NLPModelDBModel)
+                .where(NLPModelDBModel.status == Status.SUBMITTED.value)
+            )
@@ -0,0 +1,78 @@
+from typing import Callable, Dict, Any
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    'nlp_pipeline_stage_seconds',
+    'Time spent in each stage of the ML pipeline, per call (a call may hold a batch of sentences).',
+    ['stage'],
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+)
+DB_WRITE_SECONDS = Histogram(
+    'nlp_db_write_seconds',
+    'Time spent writing requests to the database.',
+    ['operation'],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+)
+REQUESTS_TOTAL = Counter(
+    'nlp_requests',
+    'Requests that reached each status in this process.',
+    ['status']
+)
+MODEL_LOAD_SECONDS = Gauge(
+    'nlp_model_load_seconds',
+    'Time it took to load and warm up the ML models.'
+)
+QUEUE_DEPTH = Gauge(
+    'nlp_queue_depth',
+    'Items waiting in a queue of this process.',
+    ['queue']
+)
+
+
+def track_queue_depth(queue: str, qsize: Callable[[], int]):
+    """
+    Reports the size of a queue on every scrape.
+    :param queue: The name of the queue in the metric labels.
+    :param qsize: Returns the current size of the queue.
+    """
+    QUEUE_DEPTH.labels(queue).set_function(qsize)
+
+
+class PoolCollector:
+    """
+    Reports the stats of a database connection pool on every scrape.
+    """
+
+    def __init__(self, name: str, stats: Callable[[], Dict[str, Any]]):
+        self.name = name
+        self.stats = stats
+
+    def collect(self):
+        stats = self.stats()
+        for key in ('size', 'active', 'idle', 'overflow', 'avg_checkout_ms', 'max_checkout_ms'):
+            gauge = GaugeMetricFamily(f'nlp_db_pool_{key}', f'Connection pool {key}.', labels=['pool'])
+            gauge.add_metric([self.name], stats[key])
+            yield gauge
+        for key in ('checkouts', 'checkins', 'timeouts', 'connects', 'invalidations'):
+            counter = CounterMetricFamily(f'nlp_db_pool_{key}', f'Connection pool {key}.', labels=['pool'])
+            counter.add_metric([self.name], stats[key])
+            yield counter
+
+
+_pool_collectors: Dict[str, PoolCollector] = {}
+
+
+def track_pool(name: str, stats: Callable[[], Dict[str, Any]]):
+    """
+    Reports the stats of a database connection pool on every scrape, in place of the pool previously
+    tracked under the same name.
+    :param name: The name of the pool in the metric labels.
+    :param stats: Returns the current pool stats.
+    """
+    previous = _pool_collectors.pop(name, None)
+    if previous:
+        REGISTRY.unregister(previous)
+    _pool_collectors[name] = PoolCollector(name, stats)
+    REGISTRY.register(_pool_collectors[name])
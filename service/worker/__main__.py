@@ -0,0 +1,29 @@
+import signal
+import threading
+from functools import partial
+
+from prometheus_client import start_http_server
+
+from service.controller.factory import create_base_controller
+from service.db.factories import pool_stats
+from service.queue.factories import create_job_queue
+from service.utils.logs import initialize_logging
+from service.utils.metrics import track_pool
+from service.worker.config import worker_config
+from service.worker.factories import create_worker
+
+initialize_logging("config/logging.yaml")
+
+stop_event = threading.Event()
+signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+config = worker_config()
+controller = create_base_controller()
+# the pipeline stages, job statuses and model load time of the worker are only recorded in this process
+if config.metrics_port:
+    track_pool('sync', partial(pool_stats, controller.db_engine))
+    start_http_server(config.metrics_port)
+
+worker = create_worker(controller=controller, queue=create_job_queue(db_engine=controller.db_engine), config=config)
+worker.run(stop_event)
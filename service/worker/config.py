@@ -0,0 +1,19 @@
+import os
+
+
+class WorkerConfig:
+    """
+    Configuration for the job queue workers.
+    """
+    batch_size = int(os.getenv('WORKER_BATCH_SIZE', '8'))
+    poll_timeout = float(os.getenv('WORKER_POLL_TIMEOUT', '1.0'))
+    # port of the Prometheus metrics of the worker process, 0 to not serve them
+    metrics_port = int(os.getenv('WORKER_METRICS_PORT', '9100'))
+
+
+def worker_config() -> WorkerConfig:
+    """
+    Factory that creates the WorkerConfig instance.
+    :return: A worker configuration object.
+    """
+    return WorkerConfig()
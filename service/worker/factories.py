@@ -0,0 +1,21 @@
+from service.controller.controller import BaseController
+from service.queue.job_queue import JobQueue
+from service.worker.config import WorkerConfig, worker_config
+from service.worker.worker import Worker
+
+
+def create_worker(controller: BaseController, queue: JobQueue, config: WorkerConfig = None) -> Worker:
+    """
+    Factory method for the job queue worker.
+    :param controller: The controller running the ML pipeline.
+    :param queue: The job queue to consume.
+    :param config: The worker configuration.
+    :return: The generated worker.
+    """
+    config = config or worker_config()
+    return Worker(
+        controller=controller,
+        queue=queue,
+        batch_size=config.batch_size,
+        poll_timeout=config.poll_timeout
+    )
@@ -0,0 +1,65 @@
+import logging
+import threading
+from typing import List, Optional
+
+from service.controller.controller import BaseController
+from service.data_model.request import NLPModel
+from service.queue.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Consumer of the job queue: claims pending requests, runs them through the ML pipeline and stores the results.
+    """
+
+    def __init__(self, controller: BaseController, queue: JobQueue, batch_size: int = 1, poll_timeout: float = 1.0):
+        self.controller = controller
+        self.queue = queue
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+
+    def run_once(self, timeout: Optional[float] = None) -> List[NLPModel]:
+        """
+        Processes at most one batch of pending requests.
+        :param timeout: Seconds to wait for pending requests.
+        :return: The processed requests.
+        """
+        request_ids = self.queue.get(max_items=self.batch_size, timeout=timeout)
+        if not request_ids:
+            return []
+
+        if self.queue.claims_requests:
+            requests = self.controller.running_requests(request_ids)
+        else:
+            requests = self.controller.start_requests(request_ids)
+        if not requests:
+            logger.info(f"Requests {request_ids} already claimed, skipping")
+            return []
+
+        processed = self.controller.run_requests(requests)
+        logger.info(f"Processed requests {[(req.id, req.status) for req in processed]}")
+        return processed
+
+    def run(self, stop_event: threading.Event):
+        """
+        Processes pending requests until the stop event is set.
+        :param stop_event: Event signalling the worker to stop.
+        """
+        logger.info("Worker started")
+        while not stop_event.is_set():
+            try:
+                self.run_once(timeout=self.poll_timeout)
+            except Exception as e:
+                logger.exception(e)
+        logger.info("Worker stopped")
+
+    def start(self) -> threading.Event:
+        """
+        Runs the worker in a background daemon thread.
+        :return: The event that stops the worker when set.
+        """
+        stop_event = threading.Event()
+        threading.Thread(target=self.run, args=(stop_event,), name="worker", daemon=True).start()
+        return stop_event
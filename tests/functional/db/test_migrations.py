@@ -6,7 +6,7 @@ import pytest
 from sqlalchemy.orm import declarative_base, Session
 from alembic import command
 from alembic.config import Config
-from sqlalchemy import inspect, create_engine, Column, String, select
+from sqlalchemy import inspect, create_engine, Column, String, select, text
 
 Base = declarative_base()
 
@@ -61,3 +61,129 @@ class RunMigrationsUpgradeTestCase(unittest.TestCase):
             sorted(table_columns),
             sorted(table_columns_on_first_migration)
         )
+
+    @pytest.mark.order(2)
+    @mock.patch('service.db.factories.create_db_engine')
+    def test_alembic_run_suggestion_cache_migration_creates_table_ok(self, mock_engine):
+        # arrange
+        mock_engine.return_value = self.engine
+        # act
+        command.upgrade(config=self.alembic_cfg, revision='5c2a7d')
+
+        # assert migrations exist
+        with self.db_session as session:
+            revision = session.execute(select(AlembicMigrationsDBModel)).first()
+        tables = self.inspector.get_table_names()
+
+        table_columns = [
+            column.get('name') for column in self.inspector.get_columns('suggestion_cache')
+        ]
+        self.assertEqual(revision[0].version_num, '5c2a7d')
+        self.assertListEqual(sorted(tables), sorted(['alembic_version', 'nlp_table', 'suggestion_cache']))
+        self.assertListEqual(
+            sorted(table_columns),
+            sorted(['key', 'models_version', 'results', 'created_at'])
+        )
+
+    @pytest.mark.order(3)
+    @mock.patch('service.db.factories.create_db_engine')
+    def test_alembic_run_search_indexes_migration_creates_indexes_ok(self, mock_engine):
+        # arrange
+        mock_engine.return_value = self.engine
+        # act
+        command.upgrade(config=self.alembic_cfg, revision='9b41f3')
+
+        # assert migrations exist
+        with self.db_session as session:
+            revision = session.execute(select(AlembicMigrationsDBModel)).first()
+        indexes = {
+            index.get('name'): index.get('column_names') for index in self.inspector.get_indexes('nlp_table')
+        }
+        self.assertEqual(revision[0].version_num, '9b41f3')
+        self.assertDictEqual(indexes, {
+            'ix_nlp_table_client_requested_at': ['client', 'requested_at'],
+            'ix_nlp_table_status_requested_at': ['status', 'requested_at'],
+            'ix_nlp_table_requested_at': ['requested_at'],
+        })
+
+    @pytest.mark.order(4)
+    @mock.patch('service.db.factories.create_db_engine')
+    def test_alembic_run_partition_migration_without_opt_in_ok(self, mock_engine):
+        # arrange
+        mock_engine.return_value = self.engine
+        # act
+        command.upgrade(config=self.alembic_cfg, revision='d7e2a0')
+
+        # assert migrations exist
+        with self.db_session as session:
+            revision = session.execute(select(AlembicMigrationsDBModel)).first()
+            partitioned = session.execute(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('nlp_table')")
+            ).first()
+        self.assertEqual(revision[0].version_num, 'd7e2a0')
+        self.assertIsNone(partitioned)
+
+    @pytest.mark.order(5)
+    @mock.patch('service.db.factories.create_db_engine')
+    def test_alembic_run_results_jsonb_migration_ok(self, mock_engine):
+        # arrange
+        mock_engine.return_value = self.engine
+        # act
+        command.upgrade(config=self.alembic_cfg, revision='f3a8c1')
+
+        # assert migrations exist
+        with self.db_session as session:
+            revision = session.execute(select(AlembicMigrationsDBModel)).first()
+        columns = {column.get('name'): column.get('type') for column in self.inspector.get_columns('nlp_table')}
+        indexes = [index.get('name') for index in self.inspector.get_indexes('nlp_table')]
+
+        self.assertEqual(revision[0].version_num, 'f3a8c1')
+        self.assertEqual(str(columns['results']), 'JSONB')
+        self.assertIn('ix_nlp_table_results', indexes)
+
+    @pytest.mark.order(6)
+    @mock.patch('service.db.config.PSQLConfig.partition_nlp_table', True)
+    @mock.patch('service.db.factories.create_db_engine')
+    def test_alembic_run_migrations_with_partitioning_up_and_down_ok(self, mock_engine):
+        # arrange
+        mock_engine.return_value = self.engine
+        command.downgrade(config=self.alembic_cfg, revision='9b41f3')
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO nlp_table (id, sentence, client, status, results, requested_at, updated) "
+                "VALUES ('1', 'have a [MASK] day', 'client', 'COMPLETED', '[\"good\"]', now(), now())"
+            ))
+
+        # act
+        command.upgrade(config=self.alembic_cfg, revision='head')
+
+        # assert the table is partitioned with the indexes of the head revision
+        with self.db_session as session:
+            partitioned = session.execute(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('nlp_table')")
+            ).first()
+            rows = session.execute(text("SELECT id FROM nlp_table")).scalars().all()
+        indexes = [index.get('name') for index in inspect(self.engine).get_indexes('nlp_table')]
+        self.assertIsNotNone(partitioned)
+        self.assertListEqual(rows, ['1'])
+        self.assertIn('ix_nlp_table_results', indexes)
+
+        # act
+        command.downgrade(config=self.alembic_cfg, revision='9b41f3')
+
+        # assert the table is back to a plain table with the indexes of the revision
+        with self.db_session as session:
+            partitioned = session.execute(
+                text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('nlp_table')")
+            ).first()
+            rows = session.execute(text("SELECT id FROM nlp_table")).scalars().all()
+        indexes = {
+            index.get('name'): index.get('column_names') for index in inspect(self.engine).get_indexes('nlp_table')
+        }
+        self.assertIsNone(partitioned)
+        self.assertListEqual(rows, ['1'])
+        self.assertDictEqual(indexes, {
+            'ix_nlp_table_client_requested_at': ['client', 'requested_at'],
+            'ix_nlp_table_status_requested_at': ['status', 'requested_at'],
+            'ix_nlp_table_requested_at': ['requested_at'],
+        })
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import torch
+from transformers import (
+    BertConfig, BertForMaskedLM, BertTokenizer, DistilBertConfig,
+    DistilBertForSequenceClassification, DistilBertTokenizer, pipeline
+)
+
+VOCABULARY = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "have", "a", "day", "the", "application", "was", "it", "is", "so", "very",
+    "good", "great", "nice", "amazing", "excellent", "best", "happy", "lovely",
+    "bad", "awful", "terrible", "sick", "sad", "boring", "ugly",
+    "well", "designed", "pretty", "ever", "seen", "i", "ve",
+    "##ing", "##ly", "##s", ",", ".", "!", "?",
+]
+
+
+def create_tiny_vocab_file() -> str:
+    vocab_dir = tempfile.mkdtemp()
+    vocab_file = os.path.join(vocab_dir, "vocab.txt")
+    with open(vocab_file, "w") as fh:
+        fh.write("\n".join(VOCABULARY))
+    return vocab_file
+
+
+def create_tiny_tokenizer() -> BertTokenizer:
+    return BertTokenizer(create_tiny_vocab_file())
+
+
+def create_tiny_fill_in_model(seed: int = 0) -> BertForMaskedLM:
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=len(VOCABULARY), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=37,
+    )
+    return BertForMaskedLM(config).eval()
+
+
+def create_tiny_sent_anal_model(seed: int = 0) -> DistilBertForSequenceClassification:
+    torch.manual_seed(seed)
+    config = DistilBertConfig(
+        vocab_size=len(VOCABULARY), dim=32, n_layers=1, n_heads=2, hidden_dim=37,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1},
+    )
+    return DistilBertForSequenceClassification(config).eval()
+
+
+def create_tiny_sent_anal_pipeline(seed: int = 0):
+    return pipeline(
+        "sentiment-analysis",
+        model=create_tiny_sent_anal_model(seed),
+        tokenizer=DistilBertTokenizer(create_tiny_vocab_file()),
+    )
+
+
+class SentimentPipelineMock:
+    positive = {"good", "great", "nice", "amazing", "excellent", "best", "happy", "lovely"}
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, inputs, **kwargs):
+        self.calls += 1
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        return [{"label": "POSITIVE" if word in self.positive else "NEGATIVE", "score": 0.9} for word in inputs]
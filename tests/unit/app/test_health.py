@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+
+from service.app.factories import create_api
+from service.ml.pipelines.state import PipelineState
+
+
+class ControllerMock:
+    def __init__(self, state: PipelineState):
+        self.state = state
+
+
+class TestHealth(TestCase):
+    def setUp(self):
+        self.api = create_api()
+        # without the lifespan, so the controller is not created
+        self.client = TestClient(self.api)
+
+    def test_health_loading(self):
+        self.api.state.controller = ControllerMock(PipelineState.LOADING)
+
+        response = self.client.get("/health/")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "loading")
+
+    def test_health_ready(self):
+        self.api.state.controller = ControllerMock(PipelineState.READY)
+
+        response = self.client.get("/health/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ready")
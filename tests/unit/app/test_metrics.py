@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from service.app.factories import create_api
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.utils.metrics import track_pool, track_queue_depth
+from tests.ml.factories import SentimentPipelineMock, create_tiny_fill_in_model, create_tiny_tokenizer
+
+
+def stage_count(stage: str) -> float:
+    return REGISTRY.get_sample_value('nlp_pipeline_stage_seconds_count', {'stage': stage}) or 0.0
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        # without the lifespan, so the controller is not created
+        self.client = TestClient(create_api())
+
+    def test_metrics_exposition(self):
+        track_queue_depth('test', lambda: 7)
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('nlp_queue_depth{queue="test"} 7.0', response.text)
+        self.assertIn('nlp_model_load_seconds', response.text)
+        self.assertIn('process_resident_memory_bytes', response.text)
+
+    def test_track_pool_replaces_previous_pool(self):
+        stats = {key: 0 for key in ['size', 'active', 'idle', 'overflow', 'avg_checkout_ms', 'max_checkout_ms',
+                                    'checkouts', 'checkins', 'timeouts', 'connects', 'invalidations']}
+        track_pool('test', lambda: {**stats, 'active': 1})
+        track_pool('test', lambda: {**stats, 'active': 2})
+
+        self.assertEqual(REGISTRY.get_sample_value('nlp_db_pool_active', {'pool': 'test'}), 2)
+        self.assertEqual(REGISTRY.get_sample_value('nlp_db_pool_timeouts_total', {'pool': 'test'}), 0)
+
+    def test_pipeline_stage_timings(self):
+        ml_pipeline = MLPipeline(
+            fill_in=FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=create_tiny_tokenizer()),
+            sent_anal=SentimentAnalysisTorchPredictor(pipeline=SentimentPipelineMock()),
+            preprocess=Preprocessor()
+        )
+        before = {stage: stage_count(stage) for stage in ['preprocess', 'fill_in', 'sentiment']}
+
+        ml_pipeline.pipeline_batch(["have a <blank> day", "the application was <blank>"])
+
+        for stage, count in before.items():
+            self.assertEqual(stage_count(stage), count + 1)
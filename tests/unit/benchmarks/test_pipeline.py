@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from benchmarks.common import summarize
+from benchmarks.pipeline import main
+
+
+class TestSummarize(TestCase):
+    def test_summarize(self):
+        summary = summarize([0.01, 0.02, 0.03, 0.04], items=8)
+
+        self.assertEqual(summary["calls"], 4)
+        self.assertAlmostEqual(summary["mean_ms"], 25)
+        self.assertAlmostEqual(summary["p50_ms"], 25)
+        self.assertAlmostEqual(summary["max_ms"], 40)
+        self.assertAlmostEqual(summary["throughput_per_s"], 320)
+
+
+class TestPipelineBenchmark(TestCase):
+    def test_tiny_models_results(self):
+        output = os.path.join(tempfile.mkdtemp(), "pipeline.json")
+
+        result = CliRunner().invoke(
+            main, ["--tiny", "--batch-sizes", "1,4", "--repeats", "2", "--warmup", "0", "--output", output]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        with open(output) as fh:
+            results = json.load(fh)
+        self.assertTrue(results["parameters"]["models"]["tiny"])
+        self.assertEqual(results["results"]["pipeline"]["calls"], 2)
+        self.assertListEqual(list(results["results"]["batches"]), ["1", "4"])
+        self.assertListEqual(
+            list(results["results"]["batches"]["4"]), ["pipeline_batch", "fill_in", "sentiment"]
+        )
@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+from unittest import mock
+
+import aiounittest
+import testing.postgresql
+from fastapi.testclient import TestClient
+from jwt import encode
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from service.app.auth import APIConfig
+from service.app.factories import create_api
+from service.controller.async_controller import AsyncBaseController, AsyncQueueController
+from service.controller.controller import BaseController
+from service.controller.errors import RequestDoesNotExist
+from service.data_model.request import NLPRequest, SearchQuery
+from service.data_model.status import Status
+from service.db.factories import create_db_tables
+from service.ml.pipelines.state import PipelineState
+from service.queue.job_queue import InMemoryJobQueue
+from service.worker.worker import Worker
+from tests.unit.controller.test_base_controller import MLPipelineMock, FailingMLPipelineMock
+
+request = NLPRequest(sentence='hshs <blank>', client='test')
+
+
+def _async_url(postgresql) -> str:
+    return postgresql.url().replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+
+class TestAsyncBaseController(aiounittest.AsyncTestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        create_db_tables(create_engine(self.postgresql.url()))
+        # connections are not shared between the event loops of the tests
+        self.engine = create_async_engine(_async_url(self.postgresql), poolclass=NullPool)
+        self.controller = AsyncBaseController(db_engine=self.engine, ml_pipeline=MLPipelineMock())
+
+    def tearDown(self):
+        self.postgresql.stop()
+
+    async def test_create_request_ok(self):
+        response = await self.controller.create(request)
+
+        self.assertListEqual(response.results, [])
+        self.assertIsNotNone(response.id)
+        self.assertIsNotNone(response.requested_at)
+        self.assertEqual(response.status, Status.SUBMITTED.value)
+
+    async def test_retrieve_request_none_exception(self):
+        with self.assertRaises(RequestDoesNotExist):
+            await self.controller.retrieve('test_id')
+
+    async def test_predict_request_ok(self):
+        response = await self.controller.predict(request)
+
+        self.assertEqual(response.status, Status.COMPLETED.value)
+        self.assertListEqual(response.results, ["good, nice"])
+        self.assertEqual(await self.controller.retrieve(response.id), response)
+
+    async def test_predict_request_pipeline_failure(self):
+        controller = AsyncBaseController(db_engine=self.engine, ml_pipeline=FailingMLPipelineMock())
+
+        response = await controller.predict(request)
+
+        self.assertEqual(response.status, Status.FAILED.value)
+        self.assertEqual((await controller.retrieve(response.id)).status, Status.FAILED.value)
+
+    async def test_complete_request_raise_exception(self):
+        with self.assertRaises(RequestDoesNotExist):
+            await self.controller.complete_request(request_id="test", status="COMPLETED", results=[])
+
+    async def test_create_batch_keeps_request_order(self):
+        requests = [NLPRequest(sentence=f'sentence {i} <blank>', client='test') for i in range(5)]
+
+        responses = await self.controller.create_batch(requests)
+
+        self.assertListEqual([response.sentence for response in responses], [r.sentence for r in requests])
+        self.assertEqual(len({response.id for response in responses}), 5)
+        self.assertTrue(all(response.status == Status.SUBMITTED.value for response in responses))
+
+    async def test_predict_batch_runs_pipeline_in_batches(self):
+        pipeline = MLPipelineMock()
+        controller = AsyncBaseController(db_engine=self.engine, ml_pipeline=pipeline, batch_size=2)
+
+        responses = await controller.predict_batch([request] * 5)
+
+        self.assertListEqual([len(batch) for batch in pipeline.batches], [2, 2, 1])
+        for response in responses:
+            self.assertEqual(response.status, Status.COMPLETED.value)
+            stored = await controller.retrieve(response.id)
+            self.assertEqual(stored.status, Status.COMPLETED.value)
+            self.assertListEqual(stored.results, ["good, nice"])
+
+    async def test_predict_batch_pipeline_failure(self):
+        controller = AsyncBaseController(db_engine=self.engine, ml_pipeline=FailingMLPipelineMock())
+
+        responses = await controller.predict_batch([request] * 2)
+
+        for response in responses:
+            self.assertEqual(response.status, Status.FAILED.value)
+            self.assertEqual((await controller.retrieve(response.id)).status, Status.FAILED.value)
+
+    async def test_search_cursor_pages_through_all_results(self):
+        created = await self.controller.create_batch([request] * 5)
+        await self.controller.create(NLPRequest(sentence='other <blank>', client='other'))
+
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = await self.controller.search_cursor(SearchQuery(client='test'), cursor=cursor, size=2)
+            ids.extend(item.id for item in page.items)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        expected = sorted(created, key=lambda req: (req.requested_at, req.id))
+        self.assertListEqual(ids, [req.id for req in expected])
+        self.assertEqual(pages, 3)
+        self.assertIsNone(page.total)
+
+    async def test_search_cursor_include_total(self):
+        await self.controller.create_batch([request] * 3)
+
+        page = await self.controller.search_cursor(SearchQuery(), size=1, include_total=True)
+
+        self.assertEqual(len(page.items), 1)
+        self.assertEqual(page.total, 3)
+        self.assertIsNotNone(page.next_cursor)
+
+    async def test_search_cursor_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            await self.controller.search_cursor(SearchQuery(), cursor='not-a-cursor')
+
+    async def test_export_streams_all_results_in_order(self):
+        created = await self.controller.create_batch([request] * 5)
+        await self.controller.create(NLPRequest(sentence='other <blank>', client='other'))
+
+        exported = [req async for req in self.controller.export(SearchQuery(client='test'), chunk_size=2)]
+
+        expected = sorted(created, key=lambda req: (req.requested_at, req.id))
+        self.assertListEqual([req.id for req in exported], [req.id for req in expected])
+
+    async def test_queue_controller_enqueues(self):
+        queue = InMemoryJobQueue()
+        controller = AsyncQueueController(db_engine=self.engine, queue=queue)
+
+        response = await controller.predict(request)
+
+        self.assertEqual(response.status, Status.SUBMITTED.value)
+        self.assertListEqual(queue.get(timeout=0.1), [response.id])
+
+    async def test_queue_controller_state_is_the_in_process_worker_state(self):
+        queue = InMemoryJobQueue()
+        pipeline = mock.Mock(state=PipelineState.LOADING)
+        worker = Worker(controller=BaseController(db_engine=None, ml_pipeline=pipeline), queue=queue)
+        controller = AsyncQueueController(db_engine=self.engine, queue=queue, worker=worker)
+
+        self.assertEqual(controller.state, PipelineState.LOADING)
+        pipeline.state = PipelineState.READY
+        self.assertEqual(controller.state, PipelineState.READY)
+        self.assertEqual(AsyncQueueController(db_engine=self.engine, queue=queue).state, PipelineState.READY)
+
+
+class TestAsyncRoutes(aiounittest.AsyncTestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        create_db_tables(create_engine(self.postgresql.url()))
+        engine = create_async_engine(_async_url(self.postgresql), poolclass=NullPool)
+
+        api = create_api()
+        api.state.controller = AsyncBaseController(db_engine=engine, ml_pipeline=MLPipelineMock())
+        token = encode({'client': 'test'}, APIConfig.jwt_secret, algorithm=APIConfig.jwt_algorithm)
+        self.client = TestClient(api, headers={'Authorization': f'Bearer {token}'})
+
+    def tearDown(self):
+        self.postgresql.stop()
+
+    def test_create_retrieve_and_search(self):
+        created = self.client.post('/request/', json=request.dict())
+        self.assertEqual(created.status_code, 202)
+        self.assertEqual(created.json()['status'], Status.COMPLETED.value)
+
+        retrieved = self.client.get(f"/request/{created.json()['id']}/")
+        self.assertEqual(retrieved.status_code, 200)
+        self.assertDictEqual(retrieved.json(), created.json())
+
+        page = self.client.get('/request/', params={'client': 'test'})
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.json()['total'], 1)
+        self.assertEqual(page.json()['items'][0]['id'], created.json()['id'])
+
+    def test_create_batch(self):
+        sentences = ['have a <blank> day', 'no placeholder', 'it was <blank>']
+
+        response = self.client.post('/request/batch', json={'client': 'test', 'sentences': sentences})
+
+        self.assertEqual(response.status_code, 202)
+        items = response.json()['items']
+        self.assertListEqual([item['index'] for item in items], [0, 1, 2])
+        self.assertListEqual([item['status'] for item in items], [Status.COMPLETED.value, None, Status.COMPLETED.value])
+        self.assertIsNone(items[1]['id'])
+        self.assertIn('<blank>', items[1]['error'])
+        self.assertEqual(self.client.get(f"/request/{items[2]['id']}/").json()['sentence'], sentences[2])
+
+    def test_create_batch_empty(self):
+        self.assertEqual(self.client.post('/request/batch', json={'client': 'test', 'sentences': []}).status_code, 422)
+
+    def test_search_cursor(self):
+        ids = [self.client.post('/request/', json=request.dict()).json()['id'] for _ in range(3)]
+
+        first = self.client.get('/request/cursor/', params={'size': 2, 'include_total': True}).json()
+        second = self.client.get('/request/cursor', params={'size': 2, 'cursor': first['next_cursor']}).json()
+
+        self.assertEqual(first['total'], 3)
+        self.assertListEqual([item['id'] for item in first['items'] + second['items']], ids)
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(self.client.get('/request/cursor/', params={'cursor': 'invalid'}).status_code, 422)
+
+    def test_export_ndjson_and_csv(self):
+        ids = [self.client.post('/request/', json=request.dict()).json()['id'] for _ in range(3)]
+
+        ndjson = self.client.get('/request/export/')
+        csv_export = self.client.get('/request/export', params={'format': 'csv', 'client': 'test'})
+
+        self.assertEqual(ndjson.headers['content-type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in ndjson.text.splitlines()]
+        self.assertListEqual([row['id'] for row in rows], ids)
+        self.assertListEqual(rows[0]['results'], ["good, nice"])
+
+        self.assertTrue(csv_export.headers['content-type'].startswith('text/csv'))
+        records = list(csv.DictReader(io.StringIO(csv_export.text)))
+        self.assertListEqual([record['id'] for record in records], ids)
+        self.assertListEqual(json.loads(records[0]['results']), ["good, nice"])
+        self.assertEqual(self.client.get('/request/export/', params={'format': 'xml'}).status_code, 422)
+
+    def test_search_by_suggestion(self):
+        created = self.client.post('/request/', json=request.dict()).json()
+
+        found = self.client.get('/request/', params={'suggestion': 'good, nice'}).json()
+        missing = self.client.get('/request/cursor/', params={'suggestion': 'bad'}).json()
+
+        self.assertListEqual([item['id'] for item in found['items']], [created['id']])
+        self.assertListEqual(missing['items'], [])
+
+    def test_retrieve_not_found(self):
+        self.assertEqual(self.client.get('/request/missing/').status_code, 404)
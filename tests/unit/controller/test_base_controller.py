@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from service.controller.controller import BaseController
 from service.controller.errors import RequestDoesNotExist, CriticalDBError
-from service.data_model.request import NLPRequest
+from service.data_model.request import NLPRequest, SearchQuery
 from service.data_model.status import Status
 from service.db.errors import UnexpectedDBError
 from service.db.factories import create_db_tables
@@ -17,9 +17,24 @@ from service.db.schema import NLPModelDBModel
 
 
 class MLPipelineMock:
+    def __init__(self):
+        self.batches = []
+
     def pipeline(self, sentence):
         return ["good, nice"]
 
+    def pipeline_batch(self, sentences):
+        self.batches.append(sentences)
+        return [["good, nice"] for _ in sentences]
+
+
+class FailingMLPipelineMock:
+    def pipeline(self, sentence):
+        raise ValueError("inference failed")
+
+    def pipeline_batch(self, sentences):
+        raise ValueError("inference failed")
+
 
 request_model = NLPModelDBModel(
     id="hkwedkyuwge",
@@ -115,6 +130,53 @@ class TestBaseControllerPredict(TestCase):
         with self.assertRaises(Exception):
             self.base_controller.predict(None)
 
+    def test_predict_request_ok(self):
+        response = self.base_controller.predict(request)
+
+        self.assertEqual(response.status, Status.COMPLETED.value)
+        self.assertListEqual(response.results, ["good, nice"])
+        self.assertEqual(self.base_controller.retrieve(response.id), response)
+
+    def test_predict_request_pipeline_failure(self):
+        controller = BaseController(db_engine=self.engine, ml_pipeline=FailingMLPipelineMock())
+
+        response = controller.predict(request)
+
+        self.assertEqual(response.status, Status.FAILED.value)
+        self.assertListEqual(response.results, [])
+        self.assertEqual(controller.retrieve(response.id).status, Status.FAILED.value)
+
+
+class TestControllerSearchQuery(TestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        self.engine = create_engine(self.postgresql.url())
+        create_db_tables(self.engine)
+        with Session(self.engine) as session:
+            for request_id, results in [("1", ["good", "nice"]), ("2", ["nice"]), ("3", [])]:
+                session.add(NLPModelDBModel(id=request_id, sentence="a <blank>", client="client", results=results))
+            session.commit()
+
+    def tearDown(self):
+        self.postgresql.stop()
+
+    def _search_ids(self, search: SearchQuery):
+        with Session(self.engine) as session:
+            stmt = BaseController._build_query_search(search).order_by(NLPModelDBModel.id)
+            return [request.id for request in session.scalars(stmt)]
+
+    def test_search_by_suggestion(self):
+        self.assertListEqual(self._search_ids(SearchQuery(suggestion="nice")), ["1", "2"])
+        self.assertListEqual(self._search_ids(SearchQuery(suggestion="good")), ["1"])
+        self.assertListEqual(self._search_ids(SearchQuery(suggestion="bad")), [])
+
+    def test_search_by_suggestion_and_client(self):
+        self.assertListEqual(self._search_ids(SearchQuery(suggestion="nice", client="other")), [])
+        self.assertListEqual(self._search_ids(SearchQuery(suggestion="nice", client="client")), ["1", "2"])
+
+    def test_search_without_suggestion(self):
+        self.assertListEqual(self._search_ids(SearchQuery()), ["1", "2", "3"])
+
 
 class TestControllerUpdate(TestCase):
     def setUp(self):
@@ -133,6 +195,16 @@ class TestControllerUpdate(TestCase):
             self.base_controller.update_request_status(request_id="test",
                                                        status="RUNNING")
 
+    def test_complete_request_raise_exception(self):
+        with self.assertRaises(RequestDoesNotExist):
+            self.base_controller.complete_request(request_id="test", status="COMPLETED", results=[])
+
+    @mock.patch('service.controller.controller.Session.scalars')
+    def test_complete_request_raise_sql_exception(self, mock_session):
+        mock_session.side_effect = SQLAlchemyError
+        with self.assertRaises(CriticalDBError):
+            self.base_controller.complete_request(request_id="test", status="COMPLETED", results=[])
+
     @mock.patch('service.controller.controller.Session.query')
     def test_update_request_raise_sql_exception(self, mock_session):
         mock_session.side_effect = SQLAlchemyError
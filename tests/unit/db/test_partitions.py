@@ -0,0 +1,130 @@
+import datetime
+import gzip
+import tempfile
+from unittest import TestCase, mock
+
+import testing.postgresql
+from sqlalchemy import create_engine, select, text, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from service.controller.controller import Controller
+from service.data_model.request import SearchQuery
+from service.db.factories import create_db_tables
+from service.db.partitions import (
+    add_months, archive_partitions, create_partitions, has_default_partition, is_partitioned, list_partitions,
+    partition_table, unpartition_table
+)
+from service.db.schema import NLPModelDBModel
+
+today = datetime.date.today().replace(day=1)
+indexes = [
+    str(CreateIndex(index).compile(dialect=postgresql.dialect())) for index in NLPModelDBModel.__table__.indexes
+]
+
+
+def _request(request_id: str, requested_at: datetime.date) -> NLPModelDBModel:
+    return NLPModelDBModel(
+        id=request_id, sentence="have a <blank> day", client="client", status="COMPLETED", results=["good"],
+        requested_at=datetime.datetime.combine(requested_at, datetime.time(12)),
+        updated=datetime.datetime.combine(requested_at, datetime.time(12))
+    )
+
+
+class TestPartitions(TestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        self.engine = create_engine(self.postgresql.url())
+        create_db_tables(self.engine)
+        with Session(self.engine) as session:
+            session.add_all([_request(str(months), add_months(today, -months)) for months in range(4)])
+            session.commit()
+
+    def tearDown(self):
+        self.postgresql.stop()
+
+    def _ids(self):
+        with Session(self.engine) as session:
+            return sorted(session.scalars(select(NLPModelDBModel.id)))
+
+    def test_add_months(self):
+        self.assertEqual(add_months(datetime.date(2024, 11, 1), 3), datetime.date(2025, 2, 1))
+        self.assertEqual(add_months(datetime.date(2024, 1, 1), -1), datetime.date(2023, 12, 1))
+
+    def test_partition_table_keeps_rows_and_indexes(self):
+        with self.engine.begin() as conn:
+            partition_table(conn, indexes, months_ahead=2)
+
+        with self.engine.connect() as conn:
+            self.assertTrue(is_partitioned(conn))
+            self.assertListEqual(list_partitions(conn), [add_months(today, months) for months in range(-3, 3)])
+        self.assertListEqual(self._ids(), ["0", "1", "2", "3"])
+        self.assertSetEqual(
+            {index["name"] for index in inspect(self.engine).get_indexes('nlp_table')},
+            {index.name for index in NLPModelDBModel.__table__.indexes}
+        )
+
+        with self.engine.begin() as conn:
+            unpartition_table(conn, indexes)
+            self.assertFalse(is_partitioned(conn))
+        self.assertListEqual(self._ids(), ["0", "1", "2", "3"])
+
+    def test_date_bounded_search_scans_its_partitions_only(self):
+        with self.engine.begin() as conn:
+            partition_table(conn, indexes, months_ahead=2)
+
+        stmt = Controller._build_query_search(SearchQuery(date_from=today, date_to=today))
+        with self.engine.connect() as conn:
+            plan = "\n".join(conn.execute(text("EXPLAIN " + str(stmt.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )))).scalars())
+
+        self.assertIn(f"nlp_table_y{today.year:04d}m{today.month:02d}", plan)
+        self.assertNotIn("nlp_table_default", plan)
+
+    def test_create_and_archive_partitions(self):
+        with self.engine.begin() as conn:
+            partition_table(conn, indexes, months_ahead=0)
+            created = create_partitions(conn, today, months=3)
+            archive_dir = tempfile.mkdtemp()
+            archived = archive_partitions(conn, before=add_months(today, -1), archive_dir=archive_dir)
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(len(archived), 2)
+        self.assertListEqual(self._ids(), ["0", "1"])
+        with gzip.open(archived[0], 'rt') as archive:
+            lines = archive.read().splitlines()
+        self.assertTrue(lines[0].startswith("id,"))
+        self.assertTrue(lines[1].startswith("3,"))
+
+    def test_create_partitions_moves_rows_out_of_the_default_partition(self):
+        with self.engine.begin() as conn:
+            partition_table(conn, indexes, months_ahead=0)
+        with Session(self.engine) as session:
+            session.add(_request("future", add_months(today, 2)))
+            session.commit()
+
+        with self.engine.begin() as conn:
+            created = create_partitions(conn, today, months=3)
+
+        with self.engine.connect() as conn:
+            partition = conn.execute(text("SELECT tableoid::regclass::text FROM nlp_table WHERE id = 'future'")).scalar()
+            self.assertTrue(has_default_partition(conn))
+        future = add_months(today, 2)
+        self.assertEqual(len(created), 2)
+        self.assertEqual(partition, f"nlp_table_y{future.year:04d}m{future.month:02d}")
+        self.assertListEqual(self._ids(), ["0", "1", "2", "3", "future"])
+
+    @mock.patch('service.db.partitions._count_archived_rows', mock.Mock(return_value=0))
+    def test_archive_partitions_keeps_the_partition_of_an_incomplete_archive(self):
+        with self.engine.begin() as conn:
+            partition_table(conn, indexes, months_ahead=0)
+
+        with self.assertRaises(RuntimeError):
+            with self.engine.begin() as conn:
+                archive_partitions(conn, before=add_months(today, -1), archive_dir=tempfile.mkdtemp())
+
+        with self.engine.connect() as conn:
+            self.assertListEqual(list_partitions(conn), [add_months(today, months) for months in range(-3, 1)])
+        self.assertListEqual(self._ids(), ["0", "1", "2", "3"])
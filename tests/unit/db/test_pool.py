@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import testing.postgresql
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from service.db.config import PSQLConfig
+from service.db.factories import create_db_engine, pool_stats
+
+
+class TestPoolMetrics(TestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        config = PSQLConfig()
+        config.psql_conn_url = self.postgresql.url()
+        config.pool_size, config.pool_max_overflow, config.pool_timeout = 1, 0, 0.1
+        self.engine = create_db_engine(config)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.postgresql.stop()
+
+    def test_pool_options_from_config(self):
+        self.assertEqual(self.engine.pool.size(), 1)
+        self.assertEqual(self.engine.pool._timeout, 0.1)
+
+    def test_pool_stats_active_idle_and_timeouts(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = pool_stats(self.engine)
+            self.assertEqual((stats["active"], stats["idle"]), (1, 0))
+
+            with self.assertRaises(PoolTimeoutError):
+                self.engine.connect()
+
+        stats = pool_stats(self.engine)
+        self.assertEqual((stats["active"], stats["idle"]), (0, 1))
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["checkins"], 1)
+        self.assertEqual(stats["connects"], 1)
+        self.assertGreaterEqual(stats["max_checkout_ms"], 100)
+        self.assertGreater(stats["avg_checkout_ms"], 0)
@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from service.ml.pipelines.batcher import MicroBatcher
+
+
+class MLPipelineMock:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def pipeline_batch(self, sentences):
+        if self.fail:
+            raise ValueError("inference failed")
+        with self.lock:
+            self.batches.append(list(sentences))
+        return [[sentence.upper()] for sentence in sentences]
+
+
+class TestMicroBatcher(TestCase):
+    def test_concurrent_requests_are_coalesced(self):
+        pipeline = MLPipelineMock()
+        batcher = MicroBatcher(ml_pipeline=pipeline, max_batch_size=32, max_wait_ms=200)
+        sentences = [f"sentence {i}" for i in range(10)]
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(batcher.pipeline, sentences))
+        batcher.stop()
+
+        self.assertListEqual(results, [[sentence.upper()] for sentence in sentences])
+        self.assertLess(len(pipeline.batches), len(sentences))
+        self.assertEqual(batcher.stats()["items"], len(sentences))
+
+    def test_max_batch_size_is_respected(self):
+        pipeline = MLPipelineMock()
+        batcher = MicroBatcher(ml_pipeline=pipeline, max_batch_size=4, max_wait_ms=200)
+
+        results = batcher.pipeline_batch([f"sentence {i}" for i in range(10)])
+        batcher.stop()
+
+        self.assertEqual(len(results), 10)
+        self.assertListEqual([len(batch) for batch in pipeline.batches], [4, 4, 2])
+        stats = batcher.stats()
+        self.assertDictEqual(stats["batch_sizes"], {4: 2, 2: 1})
+        self.assertEqual(stats["batches"], 3)
+        self.assertGreaterEqual(stats["max_queue_wait_ms"], stats["avg_queue_wait_ms"])
+
+    def test_pipeline_failure_is_raised_to_every_caller(self):
+        batcher = MicroBatcher(ml_pipeline=MLPipelineMock(fail=True), max_batch_size=4, max_wait_ms=50)
+
+        futures = [batcher.submit("a <blank>"), batcher.submit("b <blank>")]
+        batcher.stop()
+
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result()
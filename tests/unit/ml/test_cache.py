@@ -0,0 +1,160 @@
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+
+import testing.postgresql
+from sqlalchemy import create_engine, text
+
+from service.db.cache_store import PostgresCacheStore
+from service.db.factories import create_db_tables
+from service.ml.config import MLConfig, config_fingerprint
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.cache import CachedMLPipeline, DiskCacheStore, SuggestionCache
+
+
+class MLPipelineMock:
+    def __init__(self):
+        self.sentences = []
+
+    def pipeline(self, sentence):
+        self.sentences.append(sentence)
+        return ["good", "nice"]
+
+    def pipeline_batch(self, sentences):
+        self.sentences.extend(sentences)
+        return [["good", sentence] for sentence in sentences]
+
+
+class TestSuggestionCache(TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = SuggestionCache(max_size=2)
+        cache.set("a", ["1"])
+        cache.set("b", ["2"])
+        cache.get("a")
+        cache.set("c", ["3"])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertListEqual(cache.get("a"), ["1"])
+        self.assertListEqual(cache.get("c"), ["3"])
+        self.assertDictEqual(cache.stats(), {"size": 2, "hits": 3, "store_hits": 0, "misses": 1})
+
+    def test_ttl_expires_entries(self):
+        cache = SuggestionCache(ttl_seconds=0.01)
+        cache.set("a", ["1"])
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_store_is_consulted_on_memory_miss(self):
+        store = DiskCacheStore(directory=tempfile.mkdtemp(), ttl_seconds=60)
+        SuggestionCache(store=store).set("a", ["1"])
+        cache = SuggestionCache(store=store)
+
+        self.assertListEqual(cache.get("a"), ["1"])
+        self.assertListEqual(cache.get("a"), ["1"])
+        self.assertDictEqual(cache.stats(), {"size": 1, "hits": 1, "store_hits": 1, "misses": 0})
+
+    def test_store_is_pruned_once_per_interval(self):
+        store = mock.Mock(prune=mock.Mock(return_value=0))
+        cache = SuggestionCache(store=store, prune_interval_seconds=60)
+
+        cache.set("a", ["1"])
+        cache._prune_thread.join()
+        cache.set("b", ["2"])
+
+        store.prune.assert_called_once_with()
+
+
+class TestDiskCacheStore(TestCase):
+    def test_prune_deletes_expired_and_oldest_entries(self):
+        store = DiskCacheStore(directory=tempfile.mkdtemp(), ttl_seconds=60, max_entries=2)
+        for age, key in enumerate(["d", "c", "b", "a"]):
+            store.set(key, [key])
+            modified = time.time() - 10 * age
+            os.utime(store._path(key), (modified, modified))
+        expired = time.time() - 120
+        os.utime(store._path("a"), (expired, expired))
+
+        self.assertEqual(store.prune(), 2)
+        self.assertListEqual([store.get(key) for key in ["a", "b", "c", "d"]], [None, None, ["c"], ["d"]])
+        self.assertEqual(len(os.listdir(store.directory)), 2)
+
+
+class TestCachedMLPipeline(TestCase):
+    def setUp(self):
+        self.ml_pipeline = MLPipelineMock()
+
+    def test_pipeline_hits_on_same_normalized_sentence(self):
+        cached = CachedMLPipeline(self.ml_pipeline, SuggestionCache(), Preprocessor())
+
+        cached.pipeline("have a <blank> day!")
+        results = cached.pipeline("have a <blank> day")
+
+        self.assertListEqual(results, ["good", "nice"])
+        self.assertEqual(len(self.ml_pipeline.sentences), 1)
+
+    def test_models_version_bump_invalidates(self):
+        cache = SuggestionCache()
+        CachedMLPipeline(self.ml_pipeline, cache, Preprocessor(), models_version="v1").pipeline("a <blank>")
+        CachedMLPipeline(self.ml_pipeline, cache, Preprocessor(), models_version="v2").pipeline("a <blank>")
+
+        self.assertEqual(len(self.ml_pipeline.sentences), 2)
+
+    def test_config_change_invalidates(self):
+        cache = SuggestionCache()
+        fingerprints = {config_fingerprint(MLConfig())}
+        for name, value in [('fill_in_top_k', 5), ('sentiment_mode', 'context'), ('fill_in_max_span', 3)]:
+            config = MLConfig()
+            setattr(config, name, value)
+            fingerprints.add(config_fingerprint(config))
+        for fingerprint in fingerprints:
+            CachedMLPipeline(self.ml_pipeline, cache, Preprocessor(), config_fingerprint=fingerprint).pipeline("a <blank>")
+
+        self.assertEqual(len(fingerprints), 4)
+        self.assertEqual(len(self.ml_pipeline.sentences), 4)
+        self.assertEqual(config_fingerprint(MLConfig()), config_fingerprint(MLConfig()))
+
+    def test_pipeline_batch_runs_only_distinct_misses(self):
+        cached = CachedMLPipeline(self.ml_pipeline, SuggestionCache(), Preprocessor())
+        cached.pipeline_batch(["a <blank>"])
+
+        results = cached.pipeline_batch(["a <blank>", "b <blank>", "b <blank>."])
+
+        self.assertListEqual(self.ml_pipeline.sentences, ["a <blank>", "b <blank>"])
+        self.assertListEqual(results, [["good", "a <blank>"], ["good", "b <blank>"], ["good", "b <blank>"]])
+
+
+class TestPostgresCacheStore(TestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        self.engine = create_engine(self.postgresql.url())
+        create_db_tables(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.postgresql.stop()
+
+    def test_set_get_and_overwrite(self):
+        store = PostgresCacheStore(self.engine, models_version="v1", ttl_seconds=60)
+
+        self.assertIsNone(store.get("a"))
+        store.set("a", ["1"])
+        store.set("a", ["2"])
+
+        self.assertListEqual(store.get("a"), ["2"])
+        self.assertIsNone(PostgresCacheStore(self.engine, models_version="v2", ttl_seconds=60).get("a"))
+        self.assertIsNone(PostgresCacheStore(self.engine, models_version="v1", ttl_seconds=0).get("a"))
+
+    def test_prune_deletes_expired_rows_and_other_models_versions(self):
+        store = PostgresCacheStore(self.engine, models_version="v1", ttl_seconds=60)
+        store.set("a", ["1"])
+        store.set("b", ["2"])
+        PostgresCacheStore(self.engine, models_version="v0", ttl_seconds=60).set("c", ["3"])
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE suggestion_cache SET created_at = now() - interval '2 minutes' WHERE key = 'b'"))
+
+        self.assertEqual(store.prune(), 2)
+        with self.engine.connect() as conn:
+            self.assertListEqual(conn.execute(text("SELECT key FROM suggestion_cache")).scalars().all(), ["a"])
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.vocabulary import build_allowed_token_mask
+from service.ml.sentiment_lexicon.builder import build_sentiment_lexicon
+from tests.ml.factories import SentimentPipelineMock, create_tiny_fill_in_model, create_tiny_tokenizer
+
+
+class TestPositiveConstrainedDecoding(TestCase):
+    def setUp(self):
+        self.tokenizer = create_tiny_tokenizer()
+        lexicon = build_sentiment_lexicon(SentimentPipelineMock(), self.tokenizer)
+        self.allowed_token_mask = build_allowed_token_mask(self.tokenizer, lexicon)
+
+    def test_allowed_token_mask_positive_whole_words_only(self):
+        allowed = self.tokenizer.convert_ids_to_tokens(self.allowed_token_mask.nonzero().flatten().tolist())
+
+        self.assertSetEqual(set(allowed), SentimentPipelineMock.positive)
+
+    def test_predict_always_returns_top_k_positive_suggestions(self):
+        predictor = FillInTorchPredictor(
+            model=create_tiny_fill_in_model(), tokenizer=self.tokenizer,
+            top_k=4, allowed_token_mask=self.allowed_token_mask
+        )
+
+        for suggestions in [predictor.predict("have a [MASK] day")] + predictor.predict_batch(
+                ["the application was [MASK]", "it is so [MASK] !"]):
+            self.assertEqual(len(suggestions), 4)
+            self.assertTrue(set(suggestions).issubset(SentimentPipelineMock.positive))
+
+    def test_predict_without_allowed_token_mask_is_unconstrained(self):
+        predictor = FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=self.tokenizer)
+
+        suggestions = predictor.predict("have a [MASK] day")
+
+        self.assertEqual(len(suggestions), 3)
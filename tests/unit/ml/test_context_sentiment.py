@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+import torch
+from transformers import DistilBertTokenizerFast
+
+from service.ml.config import MLConfig
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.factory import create_ml_pipeline
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisContextPredictor
+from service.ml.suggestions import fill_in_sentence
+from tests.ml.factories import (
+    create_tiny_fill_in_model, create_tiny_sent_anal_model, create_tiny_tokenizer, create_tiny_vocab_file
+)
+
+
+class TestFillInSentence(TestCase):
+    def test_fill_in_sentence(self):
+        self.assertEqual(fill_in_sentence("have a [MASK] day", "good"), "have a good day")
+        self.assertEqual(fill_in_sentence("a [MASK] and [MASK] day", ("good", "happy")), "a good and happy day")
+        self.assertEqual(fill_in_sentence("so [MASK] [MASK]", ("happy", "##ly")), "so happyly")
+        self.assertEqual(fill_in_sentence("it was [MASK]", "well designed"), "it was well designed")
+
+
+class TestContextSentiment(TestCase):
+    def setUp(self):
+        self.model = create_tiny_sent_anal_model()
+        self.tokenizer = DistilBertTokenizerFast(create_tiny_vocab_file())
+
+    def predictor(self, **kwargs) -> SentimentAnalysisContextPredictor:
+        return SentimentAnalysisContextPredictor(model=self.model, tokenizer=self.tokenizer, **kwargs)
+
+    def positive_probability(self, sentence: str) -> float:
+        with torch.no_grad():
+            logits = self.model(**self.tokenizer(sentence, return_tensors="pt"))[0][0]
+        return logits.softmax(-1)[1].item()
+
+    def test_scores_the_filled_sentences_in_one_batch(self):
+        suggestions = [["good", "sick"], [("nice", "happy")], []]
+        sentences = ["have a [MASK] day", "a [MASK] and [MASK] team", "it is [MASK]"]
+        calls = []
+        hook = self.model.register_forward_hook(lambda module, args, output: calls.append(output[0].shape[0]))
+        try:
+            scores = self.predictor().score_batch(suggestions, sentences)
+        finally:
+            hook.remove()
+
+        self.assertListEqual(calls, [3])
+        expected = [
+            [self.positive_probability("have a good day"), self.positive_probability("have a sick day")],
+            [self.positive_probability("a nice and happy team")],
+            [],
+        ]
+        for group, expected_group in zip(scores, expected):
+            self.assertEqual(len(group), len(expected_group))
+            for score, expected_score in zip(group, expected_group):
+                self.assertAlmostEqual(score, expected_score, places=5)
+
+    def test_threshold_and_temperature(self):
+        suggestions = ["good", "nice", "bad", "sick", "happy", "awful"]
+        sentence = "have a [MASK] day"
+        scores = self.predictor().score_batch([suggestions], [sentence])[0]
+        median = sorted(scores)[len(scores) // 2]
+
+        self.assertListEqual(self.predictor(threshold=0.0).predict(suggestions, sentence), suggestions)
+        self.assertListEqual(self.predictor(threshold=1.0).predict(suggestions, sentence), [])
+        self.assertListEqual(
+            self.predictor(threshold=median).predict(suggestions, sentence),
+            [suggestion for suggestion, score in zip(suggestions, scores) if score > median]
+        )
+        # a high temperature pulls every probability towards 0.5
+        for score in self.predictor(temperature=100).score_batch([suggestions], [sentence])[0]:
+            self.assertAlmostEqual(score, 0.5, places=2)
+
+    def test_requires_the_sentences(self):
+        with self.assertRaises(ValueError):
+            self.predictor().predict(["good"])
+
+    def test_pipeline_passes_the_preprocessed_sentences(self):
+        ml_pipeline = MLPipeline(
+            fill_in=FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=create_tiny_tokenizer()),
+            sent_anal=self.predictor(threshold=0.0),
+            preprocess=Preprocessor()
+        )
+
+        results = ml_pipeline.pipeline_batch(["have a <blank> day", "it is so <blank>!"])
+
+        self.assertListEqual(results, [ml_pipeline.pipeline("have a <blank> day"), ml_pipeline.pipeline("it is so <blank>!")])
+        self.assertTrue(all(len(group) == 3 for group in results))
+
+    def test_unsupported_sentiment_modes_are_refused(self):
+        for backend, mode in [('onnx', 'context'), ('onnx', 'token_ids'), ('pytorch', 'contxt')]:
+            config = MLConfig()
+            config.backend, config.sentiment_mode = backend, mode
+            with self.subTest(backend=backend, mode=mode), self.assertRaises(ValueError):
+                create_ml_pipeline(config)
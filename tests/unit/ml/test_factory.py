@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from service.ml.config import MLConfig
+from service.ml.pipelines.factory import create_ml_pipeline
+
+
+def _config(**settings) -> MLConfig:
+    config = MLConfig()
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return config
+
+
+class TestCreateMLPipeline(TestCase):
+    # the configuration is checked before any model is loaded
+
+    def test_onnx_backend_refuses_the_beam_multi_blank_mode(self):
+        with self.assertRaises(ValueError):
+            create_ml_pipeline(_config(backend='onnx', fill_in_multi_blank='beam'))
+
+    def test_onnx_backend_refuses_phrases(self):
+        with self.assertRaises(ValueError):
+            create_ml_pipeline(_config(backend='onnx', fill_in_max_span=3))
@@ -0,0 +1,56 @@
+import threading
+from unittest import TestCase
+
+from service.ml.pipelines.lazy import LazyMLPipeline, WARMUP_SENTENCE
+from service.ml.pipelines.state import PipelineState
+
+
+class MLPipelineMock:
+    def __init__(self):
+        self.batches = []
+
+    def pipeline(self, sentence):
+        return self.pipeline_batch([sentence])[0]
+
+    def pipeline_batch(self, sentences):
+        self.batches.append(sentences)
+        return [["good"] for _ in sentences]
+
+
+class TestLazyMLPipeline(TestCase):
+    def test_loads_on_first_use_after_warmup(self):
+        ml_pipeline = MLPipelineMock()
+        loads = []
+        lazy = LazyMLPipeline(loader=lambda: loads.append(1) or ml_pipeline)
+
+        self.assertEqual(lazy.state, PipelineState.LOADING)
+        self.assertListEqual(loads, [])
+
+        self.assertListEqual(lazy.pipeline("have a <blank> day"), ["good"])
+        self.assertListEqual(lazy.pipeline_batch(["a <blank>", "b <blank>"]), [["good"], ["good"]])
+
+        self.assertEqual(lazy.state, PipelineState.READY)
+        self.assertListEqual(loads, [1])
+        self.assertListEqual(ml_pipeline.batches[0], [WARMUP_SENTENCE])
+
+    def test_start_loads_in_background(self):
+        release = threading.Event()
+        lazy = LazyMLPipeline(loader=lambda: release.wait() and MLPipelineMock())
+
+        thread = lazy.start()
+        self.assertEqual(lazy.state, PipelineState.LOADING)
+
+        release.set()
+        thread.join(timeout=5)
+        self.assertEqual(lazy.state, PipelineState.READY)
+
+    def test_failed_loading(self):
+        def loader():
+            raise OSError("model not found")
+
+        lazy = LazyMLPipeline(loader=loader)
+        lazy.start().join(timeout=5)
+
+        self.assertEqual(lazy.state, PipelineState.FAILED)
+        with self.assertRaises(OSError):
+            lazy.pipeline("have a <blank> day")
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+import torch
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from tests.ml.factories import create_tiny_fill_in_model, create_tiny_tokenizer
+
+sentences = ["have a [MASK] day", "the [MASK] was so [MASK] !", "it is good"]
+
+
+class FullHeadModel(torch.nn.Module):
+    """
+    Hides the BERT masked LM class, so the predictor runs the whole model
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, **inputs):
+        return self.model(**inputs)
+
+
+class TestMaskLogits(TestCase):
+    def setUp(self):
+        self.model = create_tiny_fill_in_model()
+        self.tokenizer = create_tiny_tokenizer()
+
+    def test_mask_logits_match_the_full_model(self):
+        predictor = FillInTorchPredictor(model=self.model, tokenizer=self.tokenizer)
+        encoded = self.tokenizer(sentences, padding=True, return_tensors="pt")
+        rows, positions = torch.where(encoded["input_ids"] == self.tokenizer.mask_token_id)
+
+        with torch.no_grad():
+            expected = self.model(**encoded)[0][rows, positions]
+
+        torch.testing.assert_close(predictor._mask_logits(rows, positions, **encoded), expected)
+
+    def test_lm_head_only_runs_on_mask_positions(self):
+        head_inputs = []
+        hook = self.model.cls.register_forward_hook(lambda module, args, output: head_inputs.append(args[0].shape))
+        try:
+            FillInTorchPredictor(model=self.model, tokenizer=self.tokenizer).predict_batch(sentences)
+        finally:
+            hook.remove()
+
+        self.assertListEqual(head_inputs, [torch.Size([3, self.model.config.hidden_size])])
+
+    def test_predictions_match_the_full_model(self):
+        for multi_blank in ['parallel', 'beam']:
+            truncated = FillInTorchPredictor(model=self.model, tokenizer=self.tokenizer, multi_blank=multi_blank)
+            full = FillInTorchPredictor(
+                model=FullHeadModel(self.model), tokenizer=self.tokenizer, multi_blank=multi_blank
+            )
+
+            self.assertListEqual(truncated.predict_batch(sentences), full.predict_batch(sentences))
+            self.assertListEqual(truncated.predict(sentences[1]), full.predict(sentences[1]))
@@ -0,0 +1,108 @@
+import itertools
+from unittest import TestCase
+
+import torch
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.fill_in_pytorch.vocabulary import build_allowed_token_mask
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.sentiment_lexicon.builder import build_sentiment_lexicon
+from service.ml.sentiment_lexicon.predictor.predictor import SentimentLexiconPredictor
+from tests.ml.factories import SentimentPipelineMock, create_tiny_fill_in_model, create_tiny_tokenizer
+
+sentences = [
+    "have a [MASK] [MASK] day",
+    "the [MASK] was [MASK] !",
+    "it is so [MASK]",
+    "have a good day",
+]
+
+
+class TestMultiBlank(TestCase):
+    def setUp(self):
+        self.model = create_tiny_fill_in_model()
+        self.tokenizer = create_tiny_tokenizer()
+
+    def predictor(self, **kwargs) -> FillInTorchPredictor:
+        return FillInTorchPredictor(model=self.model, tokenizer=self.tokenizer, **kwargs)
+
+    def log_probs(self, input_ids: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(input_ids.unsqueeze(0))[0][0].log_softmax(-1)
+
+    def test_parallel_is_the_top_k_of_independent_blanks(self):
+        input_ids = self.tokenizer.encode(sentences[0], return_tensors="pt")[0]
+        first, second = torch.where(input_ids == self.tokenizer.mask_token_id)[0].tolist()
+        log_probs = self.log_probs(input_ids)
+        vocabulary = range(len(self.tokenizer))
+        expected = sorted(
+            itertools.product(vocabulary, vocabulary),
+            key=lambda ids: -(log_probs[first, ids[0]] + log_probs[second, ids[1]]).item()
+        )[:4]
+
+        suggestions = self.predictor(top_k=4).predict(sentences[0])
+
+        self.assertListEqual(suggestions, [tuple(self.tokenizer.convert_ids_to_tokens(list(ids))) for ids in expected])
+
+    def test_exhaustive_beam_is_exact(self):
+        input_ids = self.tokenizer.encode(sentences[0], return_tensors="pt")[0]
+        first, second = torch.where(input_ids == self.tokenizer.mask_token_id)[0].tolist()
+        first_log_probs = self.log_probs(input_ids)[first]
+        scores = {}
+        for first_id in range(len(self.tokenizer)):
+            filled = input_ids.clone()
+            filled[first] = first_id
+            second_log_probs = self.log_probs(filled)[second]
+            for second_id in range(len(self.tokenizer)):
+                scores[(first_id, second_id)] = (first_log_probs[first_id] + second_log_probs[second_id]).item()
+        expected = sorted(scores, key=lambda ids: -scores[ids])[:3]
+
+        suggestions = self.predictor(multi_blank='beam', beam_width=len(self.tokenizer)).predict(sentences[0])
+
+        self.assertListEqual(suggestions, [tuple(self.tokenizer.convert_ids_to_tokens(list(ids))) for ids in expected])
+
+    def test_beam_runs_one_bounded_batch_per_blank(self):
+        batch_sizes = []
+        hook = self.model.bert.register_forward_hook(lambda module, args, output: batch_sizes.append(len(output[0])))
+        try:
+            suggestions = self.predictor(multi_blank='beam', beam_width=5).predict(sentences[0])
+        finally:
+            hook.remove()
+
+        self.assertListEqual(batch_sizes, [1, 5])
+        self.assertEqual(len(suggestions), 3)
+        self.assertTrue(all(len(suggestion) == 2 for suggestion in suggestions))
+
+    def test_predict_batch_matches_predict(self):
+        for multi_blank in ['parallel', 'beam']:
+            predictor = self.predictor(multi_blank=multi_blank)
+
+            self.assertListEqual(
+                predictor.predict_batch(sentences), [predictor.predict(sentence) for sentence in sentences]
+            )
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.predictor(multi_blank='greedy')
+
+    def test_pipeline_joins_the_tokens_of_every_blank(self):
+        ml_pipeline = MLPipeline(
+            fill_in=self.predictor(top_k=5),
+            sent_anal=SentimentAnalysisTorchPredictor(pipeline=SentimentPipelineMock()),
+            preprocess=Preprocessor()
+        )
+        # the mock classifies whole strings, so suggestions made of many tokens are all negative
+        lexicon = build_sentiment_lexicon(SentimentPipelineMock(), self.tokenizer)
+        lexicon_pipeline = MLPipeline(
+            fill_in=self.predictor(allowed_token_mask=build_allowed_token_mask(self.tokenizer, lexicon)),
+            sent_anal=SentimentLexiconPredictor(lexicon=lexicon, tokenizer=self.tokenizer),
+            preprocess=Preprocessor()
+        )
+
+        self.assertListEqual(ml_pipeline.pipeline("have a <blank> <blank> day"), [])
+        results = lexicon_pipeline.pipeline("have a <blank> <blank> day")
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertTrue(set(result.split(", ")).issubset(SentimentPipelineMock.positive))
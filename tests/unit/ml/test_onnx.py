@@ -0,0 +1,47 @@
+import importlib.util
+import tempfile
+from unittest import TestCase, skipUnless
+
+from service.ml.fill_in_onnx.export import export_fill_in_model
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.sentiment_analysis_onnx.export import export_sentiment_model
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.pipelines.factory import create_fill_in_onnx_pipeline, create_sent_anal_onnx_pipeline
+from tests.ml.factories import (
+    VOCABULARY, create_tiny_fill_in_model, create_tiny_tokenizer, create_tiny_sent_anal_pipeline
+)
+
+sentences = ["have a [MASK] day", "the application was [MASK]", "it is so [MASK] !", "have a day"]
+
+
+@skipUnless(importlib.util.find_spec("onnxruntime"), "onnxruntime is not installed")
+class TestOnnxBackend(TestCase):
+
+    def test_fill_in_onnx_predictor_matches_torch(self):
+        model, tokenizer = create_tiny_fill_in_model(), create_tiny_tokenizer()
+        model_dir = tempfile.mkdtemp()
+        export_fill_in_model(model, tokenizer, model_dir)
+
+        onnx_predictor = create_fill_in_onnx_pipeline(model_dir)
+        torch_predictor = FillInTorchPredictor(model=model, tokenizer=tokenizer)
+
+        self.assertListEqual(onnx_predictor.predict(sentences[0]), torch_predictor.predict(sentences[0]))
+        self.assertListEqual(onnx_predictor.predict_batch(sentences), torch_predictor.predict_batch(sentences))
+
+    def test_fill_in_onnx_predictor_sentence_without_mask(self):
+        model_dir = tempfile.mkdtemp()
+        export_fill_in_model(create_tiny_fill_in_model(), create_tiny_tokenizer(), model_dir)
+
+        self.assertListEqual(create_fill_in_onnx_pipeline(model_dir).predict("have a day"), [])
+
+    def test_sent_anal_onnx_predictor_matches_torch(self):
+        pipeline = create_tiny_sent_anal_pipeline(seed=2)
+        model_dir = tempfile.mkdtemp()
+        export_sentiment_model(pipeline.model, pipeline.tokenizer, model_dir)
+        suggestions = [VOCABULARY[5:15], [], VOCABULARY[15:30]]
+
+        onnx_predictor = create_sent_anal_onnx_pipeline(model_dir)
+        torch_predictor = SentimentAnalysisTorchPredictor(pipeline=pipeline)
+
+        self.assertListEqual(onnx_predictor.predict(suggestions[0]), torch_predictor.predict(suggestions[0]))
+        self.assertListEqual(onnx_predictor.predict_batch(suggestions), torch_predictor.predict_batch(suggestions))
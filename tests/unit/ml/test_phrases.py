@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+import numpy as np
+import torch
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.vocabulary import build_phrase_token_masks
+from service.ml.sentiment_lexicon.predictor.predictor import SentimentLexiconPredictor
+from tests.ml.factories import VOCABULARY, create_tiny_fill_in_model, create_tiny_tokenizer
+
+sentences = [
+    "have a [MASK] day",
+    "the application was [MASK] !",
+    "it is so [MASK]",
+]
+
+
+class TestPhrases(TestCase):
+    def setUp(self):
+        self.model = create_tiny_fill_in_model()
+        self.tokenizer = create_tiny_tokenizer()
+
+    def predictor(self, **kwargs) -> FillInTorchPredictor:
+        return FillInTorchPredictor(model=self.model, tokenizer=self.tokenizer, **kwargs)
+
+    def test_phrase_token_masks(self):
+        first, following = build_phrase_token_masks(self.tokenizer, len(VOCABULARY))
+        first = set(self.tokenizer.convert_ids_to_tokens(first.nonzero().flatten().tolist()))
+        following = set(self.tokenizer.convert_ids_to_tokens(following.nonzero().flatten().tolist()))
+
+        self.assertSetEqual(following - first, {"##ing", "##ly", "##s"})
+        self.assertFalse(first & {"[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ",", ".", "!", "?"})
+
+    def test_phrases_are_merged_whole_words(self):
+        phrases = self.predictor(top_k=10, max_span=3, beam_width=10).predict(sentences[0])
+
+        self.assertEqual(len(phrases), 10)
+        self.assertEqual(len(set(phrases)), 10)
+        self.assertTrue(any(" " in phrase for phrase in phrases))
+        for phrase in phrases:
+            self.assertNotIn("#", phrase)
+            self.assertLessEqual(len(phrase.split()), 3)
+
+    def test_phrases_are_restricted_to_the_allowed_tokens(self):
+        allowed_tokens = {"good", "nice", "great", "happy"}
+        allowed_token_mask = torch.tensor([token in allowed_tokens for token in VOCABULARY], dtype=torch.bool)
+        predictor = self.predictor(top_k=5, max_span=2, beam_width=4, allowed_token_mask=allowed_token_mask)
+
+        for phrases in [predictor.predict(sentences[0])] + predictor.predict_batch(sentences):
+            self.assertEqual(len(phrases), 5)
+            for phrase in phrases:
+                self.assertLessEqual(set(phrase.split()), allowed_tokens)
+
+    def test_single_token_phrases_are_ranked_by_log_probability(self):
+        input_ids = self.tokenizer.encode(sentences[0], return_tensors="pt")
+        with torch.no_grad():
+            logits = self.model(input_ids)[0][0, 3]
+        first, _ = build_phrase_token_masks(self.tokenizer, len(VOCABULARY))
+        expected = self.tokenizer.convert_ids_to_tokens(logits.masked_fill(~first, float("-inf")).topk(3).indices)
+
+        phrases = self.predictor(max_span=2, beam_width=len(VOCABULARY), top_k=len(VOCABULARY) ** 2).predict(
+            sentences[0]
+        )
+
+        positions = [phrases.index(token) for token in expected]
+        self.assertListEqual(positions, sorted(positions))
+
+    def test_one_batch_per_span_position(self):
+        batch_sizes = []
+        hook = self.model.bert.register_forward_hook(lambda module, args, output: batch_sizes.append(len(output[0])))
+        try:
+            predictions = self.predictor(max_span=3, beam_width=4).predict_batch(sentences + ["have a good day"])
+        finally:
+            hook.remove()
+
+        # the spans of 1, 2 and 3 tokens of every sentence, then the beams of the spans still being filled,
+        # and no forward pass for the sentence without a blank
+        self.assertListEqual(batch_sizes, [3 * 3, 3 * 2 * 4, 3 * 4])
+        self.assertListEqual(predictions[-1], [])
+
+    def test_predict_batch_matches_predict(self):
+        predictor = self.predictor(max_span=3)
+
+        self.assertListEqual(predictor.predict_batch(sentences), [predictor.predict(sentence) for sentence in sentences])
+
+    def test_many_blanks_are_not_phrases(self):
+        suggestions = self.predictor(max_span=3).predict("have a [MASK] [MASK] day")
+
+        self.assertTrue(all(isinstance(suggestion, tuple) for suggestion in suggestions))
+
+    def test_lexicon_scores_phrases_by_their_mean_token_sentiment(self):
+        lexicon = np.zeros(len(VOCABULARY))
+        lexicon[self.tokenizer.convert_tokens_to_ids(["well", "designed", "amazing"])] = [0.9, 0.4, 0.9]
+        predictor = SentimentLexiconPredictor(lexicon=lexicon, tokenizer=self.tokenizer)
+
+        self.assertListEqual(
+            predictor.predict(["well designed", "designed", "amazing", "amazingly", ("amazing", "well designed")]),
+            ["well designed", "amazing", ("amazing", "well designed")]
+        )
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.preprocessor.preprocessor import Preprocessor
+from service.ml.pipelines.pipeline import MLPipeline
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from tests.ml.factories import (
+    SentimentPipelineMock, create_tiny_fill_in_model, create_tiny_tokenizer, create_tiny_sent_anal_pipeline
+)
+
+sentences = [
+    "have a <blank> day",
+    "the application was <blank>",
+    "it is so <blank>!",
+    "<blank>",
+]
+
+
+class TestFillInTorchPredictorBatch(TestCase):
+    def setUp(self):
+        self.predictor = FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=create_tiny_tokenizer())
+        self.prep = Preprocessor()
+
+    def test_predict_batch_matches_single_predictions(self):
+        pre_sents = [self.prep.transform(sentence) for sentence in sentences]
+
+        predictions = self.predictor.predict_batch(pre_sents)
+
+        self.assertListEqual(predictions, [self.predictor.predict(pre_sent) for pre_sent in pre_sents])
+
+    def test_predict_batch_sentence_without_mask(self):
+        predictions = self.predictor.predict_batch(["have a [MASK] day", "have a day"])
+
+        self.assertEqual(len(predictions[0]), 3)
+        self.assertListEqual(predictions[1], [])
+
+
+class TestSentimentAnalysisTorchPredictorBatch(TestCase):
+    def test_predict_batch_single_pipeline_call(self):
+        pipeline = SentimentPipelineMock()
+        predictor = SentimentAnalysisTorchPredictor(pipeline=pipeline)
+
+        predictions = predictor.predict_batch([["good", "sad", "nice"], [], ["awful", "great"]])
+
+        self.assertListEqual(predictions, [["good", "nice"], [], ["great"]])
+        self.assertEqual(pipeline.calls, 1)
+
+    def test_predict_batch_no_suggestions(self):
+        pipeline = SentimentPipelineMock()
+        predictor = SentimentAnalysisTorchPredictor(pipeline=pipeline)
+
+        self.assertListEqual(predictor.predict_batch([[], []]), [[], []])
+        self.assertEqual(pipeline.calls, 0)
+
+
+class TestMLPipelineBatch(TestCase):
+    def setUp(self):
+        self.fill_in = FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=create_tiny_tokenizer())
+
+    def test_pipeline_batch_matches_pipeline(self):
+        for sent_anal_pipeline in (SentimentPipelineMock(), create_tiny_sent_anal_pipeline()):
+            ml_pipeline = MLPipeline(
+                fill_in=self.fill_in,
+                sent_anal=SentimentAnalysisTorchPredictor(pipeline=sent_anal_pipeline),
+                preprocess=Preprocessor()
+            )
+
+            results = ml_pipeline.pipeline_batch(sentences)
+
+            self.assertListEqual(results, [ml_pipeline.pipeline(sentence) for sentence in sentences])
+
+    def test_pipeline_batch_empty(self):
+        ml_pipeline = MLPipeline(
+            fill_in=self.fill_in,
+            sent_anal=SentimentAnalysisTorchPredictor(pipeline=SentimentPipelineMock()),
+            preprocess=Preprocessor()
+        )
+
+        self.assertListEqual(ml_pipeline.pipeline_batch([]), [])
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import torch
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.quantization import quantize_model, fill_in_agreement, sentiment_agreement
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from tests.ml.factories import (
+    VOCABULARY, create_tiny_fill_in_model, create_tiny_tokenizer, create_tiny_sent_anal_pipeline
+)
+
+sentences = ["have a [MASK] day", "the application was [MASK]", "it is so [MASK] !"]
+
+
+class TestQuantization(TestCase):
+
+    def test_quantize_model_replaces_linear_layers_of_a_copy(self):
+        model = create_tiny_fill_in_model()
+
+        quantized = quantize_model(model)
+
+        self.assertFalse(any(type(module) is torch.nn.Linear for module in quantized.modules()))
+        self.assertTrue(any(type(module) is torch.nn.Linear for module in model.modules()))
+
+    def test_fill_in_agreement_of_identical_predictors(self):
+        predictor = FillInTorchPredictor(model=create_tiny_fill_in_model(), tokenizer=create_tiny_tokenizer())
+
+        self.assertDictEqual(
+            fill_in_agreement(predictor, predictor, sentences), {"top_k_agreement": 1.0, "top_1_agreement": 1.0}
+        )
+
+    def test_fill_in_agreement_of_quantized_predictor(self):
+        model, tokenizer = create_tiny_fill_in_model(), create_tiny_tokenizer()
+        predictor = FillInTorchPredictor(model=model, tokenizer=tokenizer)
+        quantized_predictor = FillInTorchPredictor(model=quantize_model(model), tokenizer=tokenizer)
+
+        agreement = fill_in_agreement(predictor, quantized_predictor, sentences)
+
+        self.assertEqual(len(quantized_predictor.predict(sentences[0])), 3)
+        for value in agreement.values():
+            self.assertGreaterEqual(value, 0.0)
+            self.assertLessEqual(value, 1.0)
+
+    def test_sentiment_agreement_of_quantized_pipeline(self):
+        pipeline = create_tiny_sent_anal_pipeline()
+        predictor = SentimentAnalysisTorchPredictor(pipeline=pipeline)
+        quantized_pipeline = create_tiny_sent_anal_pipeline()
+        quantized_pipeline.model = quantize_model(quantized_pipeline.model)
+
+        agreement = sentiment_agreement(
+            predictor, SentimentAnalysisTorchPredictor(pipeline=quantized_pipeline), VOCABULARY[5:30]
+        )
+
+        self.assertGreaterEqual(agreement["label_agreement"], 0.0)
+        self.assertLessEqual(agreement["label_agreement"], 1.0)
+        self.assertDictEqual(sentiment_agreement(predictor, predictor, VOCABULARY[5:30]), {"label_agreement": 1.0})
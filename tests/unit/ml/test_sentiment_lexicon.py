@@ -0,0 +1,44 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import SentimentAnalysisTorchPredictor
+from service.ml.sentiment_lexicon.builder import build_sentiment_lexicon, save_sentiment_lexicon
+from service.ml.sentiment_lexicon.loader import load_sentiment_lexicon
+from service.ml.sentiment_lexicon.predictor.predictor import SentimentLexiconPredictor
+from tests.ml.factories import VOCABULARY, SentimentPipelineMock, create_tiny_tokenizer
+
+
+class TestSentimentLexicon(TestCase):
+    def setUp(self):
+        self.tokenizer = create_tiny_tokenizer()
+        self.pipeline = SentimentPipelineMock()
+
+    def test_build_sentiment_lexicon_covers_vocabulary(self):
+        lexicon = build_sentiment_lexicon(self.pipeline, self.tokenizer, batch_size=10)
+
+        self.assertEqual(lexicon.shape, (len(VOCABULARY),))
+        self.assertEqual(self.pipeline.calls, 5)
+        self.assertAlmostEqual(float(lexicon[VOCABULARY.index("good")]), 0.9, places=5)
+        self.assertAlmostEqual(float(lexicon[VOCABULARY.index("sad")]), 0.1, places=5)
+
+    def test_save_and_load_sentiment_lexicon_memory_mapped(self):
+        lexicon = build_sentiment_lexicon(self.pipeline, self.tokenizer)
+        path = os.path.join(tempfile.mkdtemp(), "models", "lexicon.npy")
+
+        save_sentiment_lexicon(lexicon, path)
+        loaded = load_sentiment_lexicon(path)
+
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, lexicon)
+
+    def test_lexicon_predictor_matches_pipeline_predictor(self):
+        lexicon = build_sentiment_lexicon(self.pipeline, self.tokenizer)
+        predictor = SentimentLexiconPredictor(lexicon=lexicon, tokenizer=self.tokenizer)
+        reference = SentimentAnalysisTorchPredictor(pipeline=SentimentPipelineMock())
+        suggestions = [["good", "sad", "##ing"], [], ["great", "lovely", "awful"]]
+
+        self.assertListEqual(predictor.predict(suggestions[0]), reference.predict(suggestions[0]))
+        self.assertListEqual(predictor.predict_batch(suggestions), reference.predict_batch(suggestions))
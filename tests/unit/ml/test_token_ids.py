@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from transformers import BertTokenizer, BertTokenizerFast, DistilBertTokenizerFast
+
+from service.ml.fill_in_pytorch.predictor.predictor import FillInTorchPredictor
+from service.ml.fill_in_pytorch.vocabulary import shares_vocabulary
+from service.ml.sentiment_analysis_pytorch.predictor.predictor import (
+    SentimentAnalysisTokenIdsPredictor, SentimentAnalysisTorchPredictor
+)
+from tests.ml.factories import (
+    create_tiny_fill_in_model, create_tiny_sent_anal_model, create_tiny_sent_anal_pipeline, create_tiny_vocab_file
+)
+
+suggestions = [
+    ["good", "awful", "nice", "sick"],
+    [("good", "nice"), ("sad", "happy")],
+    ["well designed", "the best", "so boring"],
+    [],
+]
+
+
+class TestTokenIdsSentiment(TestCase):
+    def test_matches_the_sentiment_pipeline(self):
+        for seed in range(3):
+            pipeline = create_tiny_sent_anal_pipeline(seed)
+            expected = SentimentAnalysisTorchPredictor(pipeline=pipeline)
+            predictor = SentimentAnalysisTokenIdsPredictor(model=pipeline.model, tokenizer=pipeline.tokenizer)
+
+            self.assertListEqual(predictor.predict_batch(suggestions), expected.predict_batch(suggestions))
+            self.assertListEqual(predictor.predict(suggestions[0]), expected.predict(suggestions[0]))
+
+    def test_single_word_pieces_are_not_tokenized(self):
+        tokenizer = DistilBertTokenizerFast(create_tiny_vocab_file())
+        predictor = SentimentAnalysisTokenIdsPredictor(model=create_tiny_sent_anal_model(), tokenizer=tokenizer)
+
+        self.assertListEqual(
+            tokenizer.convert_ids_to_tokens(predictor._token_ids(("##ing", "well designed"))),
+            ["[CLS]", "##ing", ",", "well", "designed", "[SEP]"]
+        )
+
+    def test_shares_vocabulary(self):
+        vocab_file = create_tiny_vocab_file()
+        other_vocab_file = create_tiny_vocab_file()
+        with open(other_vocab_file, "a") as fh:
+            fh.write("\nextra")
+
+        self.assertTrue(shares_vocabulary(BertTokenizerFast(vocab_file), DistilBertTokenizerFast(vocab_file)))
+        self.assertFalse(shares_vocabulary(BertTokenizerFast(vocab_file), DistilBertTokenizerFast(other_vocab_file)))
+        self.assertFalse(shares_vocabulary(
+            BertTokenizerFast(vocab_file), DistilBertTokenizerFast(vocab_file, do_lower_case=False)
+        ))
+
+
+class TestFastTokenizer(TestCase):
+    def test_fill_in_predictions_match_the_slow_tokenizer(self):
+        sentences = ["have a [MASK] day", "the application was [MASK]!", "it is so [MASK] and [MASK]"]
+        vocab_file = create_tiny_vocab_file()
+        model = create_tiny_fill_in_model()
+        slow = FillInTorchPredictor(model=model, tokenizer=BertTokenizer(vocab_file))
+        fast = FillInTorchPredictor(model=model, tokenizer=BertTokenizerFast(vocab_file))
+
+        self.assertListEqual(fast.predict_batch(sentences), slow.predict_batch(sentences))
+        self.assertListEqual(fast.predict(sentences[0]), slow.predict(sentences[0]))
@@ -0,0 +1,142 @@
+from unittest import TestCase
+
+import testing.postgresql
+from sqlalchemy import create_engine, text
+
+from service.controller.controller import BaseController
+from service.data_model.request import NLPRequest
+from service.data_model.status import Status
+from service.db.factories import create_db_tables
+from service.queue.job_queue import InMemoryJobQueue, PostgresJobQueue
+from service.worker.worker import Worker
+
+
+class MLPipelineMock:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def pipeline_batch(self, sentences):
+        if self.fail:
+            raise ValueError("inference failed")
+        self.batches.append(sentences)
+        return [["good", "nice"] for _ in sentences]
+
+
+request = NLPRequest(sentence='hshs <blank>', client='test')
+
+
+class TestInMemoryJobQueue(TestCase):
+    def test_get_returns_up_to_max_items(self):
+        queue = InMemoryJobQueue()
+        for request_id in ["1", "2", "3"]:
+            queue.put(request_id)
+
+        self.assertListEqual(queue.get(max_items=2, timeout=0.1), ["1", "2"])
+        self.assertEqual(queue.qsize(), 1)
+        self.assertListEqual(queue.get(max_items=2, timeout=0.1), ["3"])
+
+    def test_get_timeout_empty(self):
+        self.assertListEqual(InMemoryJobQueue().get(timeout=0.01), [])
+
+
+class TestQueueWorker(TestCase):
+    def setUp(self):
+        self.postgresql = testing.postgresql.Postgresql()
+        self.engine = create_engine(self.postgresql.url())
+        create_db_tables(self.engine)
+        self.pipeline = MLPipelineMock()
+        self.worker_controller = BaseController(db_engine=self.engine, ml_pipeline=self.pipeline)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.postgresql.stop()
+
+    def submit(self, queue, count: int = 1):
+        ids = [self.worker_controller.create(request).id for _ in range(count)]
+        for request_id in ids:
+            queue.put(request_id)
+        return ids
+
+    def test_worker_in_memory_queue_completes_requests(self):
+        queue = InMemoryJobQueue()
+        ids = self.submit(queue, 3)
+        worker = Worker(controller=self.worker_controller, queue=queue, batch_size=8)
+
+        processed = worker.run_once(timeout=0.1)
+
+        self.assertListEqual(sorted(req.id for req in processed), sorted(ids))
+        self.assertEqual(len(self.pipeline.batches), 1)
+        for request_id in ids:
+            stored = self.worker_controller.retrieve(request_id)
+            self.assertEqual(stored.status, Status.COMPLETED.value)
+            self.assertListEqual(stored.results, ["good", "nice"])
+
+    def test_worker_postgres_queue_claims_each_request_once(self):
+        queue = PostgresJobQueue(db_engine=self.engine, poll_interval=0.01)
+        ids = self.submit(queue, 3)
+        worker = Worker(controller=self.worker_controller, queue=queue, batch_size=2)
+
+        self.assertEqual(queue.qsize(), 3)
+        first = worker.run_once(timeout=0.1)
+        second = worker.run_once(timeout=0.1)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertListEqual(sorted(req.id for req in first + second), sorted(ids))
+        self.assertEqual(queue.qsize(), 0)
+        self.assertListEqual(worker.run_once(timeout=0.05), [])
+
+    def test_postgres_queue_get_claims_the_requests(self):
+        queue = PostgresJobQueue(db_engine=self.engine, poll_interval=0.01)
+        ids = self.submit(queue, 3)
+
+        first = queue.get(max_items=2, timeout=0.1)
+        second = queue.get(max_items=2, timeout=0.1)
+
+        self.assertListEqual(first, ids[:2])
+        self.assertListEqual(second, ids[2:])
+        self.assertListEqual(queue.get(max_items=2, timeout=0.05), [])
+        for request_id in ids:
+            self.assertEqual(self.worker_controller.retrieve(request_id).status, Status.RUNNING.value)
+
+    def test_postgres_queue_skips_the_rows_locked_by_another_claim(self):
+        queue = PostgresJobQueue(db_engine=self.engine, poll_interval=0.01)
+        ids = self.submit(queue, 2)
+
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT id FROM nlp_table WHERE id = :id FOR UPDATE"), {"id": ids[0]})
+            self.assertListEqual(queue.get(max_items=2, timeout=0.1), ids[1:])
+
+    def test_postgres_queue_claims_again_the_requests_of_an_expired_lease(self):
+        queue = PostgresJobQueue(db_engine=self.engine, poll_interval=0.01, lease_seconds=60)
+        request_id = self.submit(queue)[0]
+        self.assertListEqual(queue.get(timeout=0.1), [request_id])
+        self.assertListEqual(queue.get(timeout=0.05), [])
+
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE nlp_table SET updated = now() - interval '2 minutes'"))
+        processed = Worker(controller=self.worker_controller, queue=queue).run_once(timeout=0.1)
+
+        self.assertListEqual([req.id for req in processed], [request_id])
+        self.assertEqual(self.worker_controller.retrieve(request_id).status, Status.COMPLETED.value)
+
+    def test_worker_skips_requests_already_started(self):
+        queue = InMemoryJobQueue()
+        request_id = self.submit(queue)[0]
+        self.worker_controller.update_request_status(request_id, Status.RUNNING.value)
+        worker = Worker(controller=self.worker_controller, queue=queue)
+
+        self.assertListEqual(worker.run_once(timeout=0.1), [])
+        self.assertListEqual(self.pipeline.batches, [])
+
+    def test_worker_pipeline_failure_marks_failed(self):
+        queue = InMemoryJobQueue()
+        request_id = self.submit(queue)[0]
+        worker_controller = BaseController(db_engine=self.engine, ml_pipeline=MLPipelineMock(fail=True))
+        worker = Worker(controller=worker_controller, queue=queue)
+
+        processed = worker.run_once(timeout=0.1)
+
+        self.assertEqual(processed[0].status, Status.FAILED.value)
+        self.assertEqual(self.worker_controller.retrieve(request_id).status, Status.FAILED.value)